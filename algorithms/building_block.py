@@ -1,6 +1,9 @@
 from collections.abc import Iterable
 
+import numpy as np
+
 from algorithms.building_block_id_manager import BuildingBlockIDManager
+from algorithms.util.result_cache import ResultCache
 from dataloader.syscall import Syscall
 
 
@@ -14,7 +17,10 @@ class BuildingBlock:
         self.name = self.__class__.__name__
         self.__instance_id = None
         self.__last_result = None
-        self.__last_syscall_id = None
+        self.__last_syscall = None
+        self.__last_line_id = None
+        self.__last_columns = None
+        self.__last_results_batch = None
 
     def train_on(self, syscall: Syscall):
         """
@@ -31,15 +37,27 @@ class BuildingBlock:
         finalizes training
         """
 
+    def merge(self, other):
+        """
+        merges the training state of other into this bb
+        other is a copy of this bb trained on a disjoint (later) part of the data
+        building blocks implementing this can be trained on several recordings in parallel
+        """
+        raise NotImplementedError(f"{self.name} does not support merging of training states")
+
     def get_result(self, syscall: Syscall):
         """        
         This function calculates this building block on the given syscall.
         It buffers its result until another system call is given.
         Returns its value (whatever it is) or None if it cant be calculated at the moment.
         """
-        if self.__last_syscall_id != id(syscall):
+        # keep a reference to the last syscall instead of its id,
+        # ids of freed syscalls get reused and would return outdated results
+        # the line id detects a syscall instance refilled with the next line (flyweight parsing)
+        if self.__last_syscall is not syscall or self.__last_line_id != syscall.line_id:
             self.__last_result = self._calculate(syscall)
-            self.__last_syscall_id = id(syscall)
+            self.__last_syscall = syscall
+            self.__last_line_id = syscall.line_id
         return self.__last_result
 
     def _calculate(self, syscall: Syscall):
@@ -48,11 +66,53 @@ class BuildingBlock:
         """
         raise NotImplementedError("each building block has to implement _calculate")
 
+    def get_results_batch(self, columns):
+        """
+        Calculates this building block on all syscalls of one recording given as SyscallColumns.
+        It buffers its results until other columns are given.
+        Returns an array with one result per syscall, rows without result are None (or nan in float arrays).
+        Building blocks without a batch implementation are calculated syscall by syscall.
+        """
+        if self.__last_columns is not columns:
+            self.__last_results_batch = self._calculate_batch(columns)
+            self.__last_columns = columns
+        return self.__last_results_batch
+
+    def _calculate_batch(self, columns):
+        """
+        calculates building block on all given columns
+        batch implementations must not change the buffers used by _calculate
+        default: fallback to get_result for each syscall
+        """
+        results = np.empty(len(columns), dtype=object)
+        for i, syscall in enumerate(columns.syscalls()):
+            results[i] = self.get_result(syscall)
+        return results
+
     def new_recording(self):
         """
         empties buffer and prepares for next recording
         """
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes all buffered data of the given threads
+        used in streaming detection where threads end but no new recording starts
+        """
+
+    def create_cache(self, max_entries: int = None, max_bytes: int = None) -> ResultCache:
+        """
+        creates a bounded LRU cache for results of this building block (e.g. per distinct input vector)
+        max_entries defaults to the default of the global CacheBudget
+        """
+        return ResultCache(self.name, max_entries, max_bytes)
+
+    def cache_statistics(self) -> list:
+        """
+        hit and miss statistics of all result caches of this building block
+        """
+        return [value.statistics() for value in vars(self).values() if isinstance(value, ResultCache)]
+
     def depends_on(self) -> list:
         """
         gives information about the dependencies of this building block
@@ -8,7 +8,8 @@ class BuildingBlockManager:
         self._dependency_graph = nx.DiGraph()
         self._final_bb = final_bb
 
-        #self._dependency_graph.add_node(final_bb)
+        # the final bb is added as node, so a graph of a single bb (without dependencies) is not empty
+        self._dependency_graph.add_node(final_bb)
         todo_bb = [final_bb]#.depends_on()
         todo_temp = []        
         
@@ -33,9 +34,16 @@ class BuildingBlockManager:
         """
         return self._final_bb
 
-    def to_dot(self):
+    def to_dot(self, annotations: dict = None):
         # print graph in dot format for graphviz visualization
-        dot = nx.drawing.nx_pydot.to_pydot(self._dependency_graph)
+        # annotations: optional label for building blocks (e.g. profiling results)
+        graph = self._dependency_graph
+        if annotations is not None:
+            graph = graph.copy()
+            for bb, label in annotations.items():
+                if bb in graph:
+                    graph.nodes[bb]['label'] = label
+        dot = nx.drawing.nx_pydot.to_pydot(graph)
         return dot
 
     def get_dependency_graph(self):
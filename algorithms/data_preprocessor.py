@@ -1,12 +1,34 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
 from typing import Union
 import urllib
 from tqdm import tqdm
 from algorithms.building_block import BuildingBlock
 
 from algorithms.building_block_manager import BuildingBlockManager
+from algorithms.model_persistence import data_set_hash, load_building_blocks, save_building_blocks
+from algorithms.profiler import Profiler
 from dataloader.base_data_loader import BaseDataLoader
+from dataloader.prefetch import prefetch
 from dataloader.syscall import Syscall
 
+def _data_pass_on_chunk(args: tuple) -> list:
+    """
+    worker of a parallel data pass
+    trains the (copied) bbs on the given recordings and returns them
+    """
+    all_bbs, ready_bbs, bbs, method_name, recordings = args
+    for recording in recordings:
+        for syscall in recording.syscalls():
+            for ready_bb in ready_bbs:
+                ready_bb.get_result(syscall)
+            for current_bb in bbs:
+                getattr(current_bb, method_name)(syscall)
+        for bb in all_bbs:
+            bb.new_recording()
+    return bbs
+
+
 def dot_to_str(dot):
     dot_str = dot.to_string()
     lines = dot_str.splitlines()
@@ -20,14 +42,31 @@ class DataPreprocessor:
     """
         Receives DataLoader object, and a list of BuildingBlocks
         Training data, validation data and test data can than be returned as feature lists.
+        With workers > 1 the recordings of each data pass are split over several processes,
+        this is only done if all bbs trained in that pass implement merge.
+        With a model_path the trained bbs are loaded from there if config and data match,
+        otherwise they are trained and saved to model_path.
+        With a profiler the calls of all bbs are profiled (training is done sequentially then).
+        With prefetch_depth > 0 sequential data passes load the next recordings in a background thread
+        (see dataloader.prefetch), prefetch_max_bytes limits the raw size of the recordings loaded ahead.
 
     """
 
     def __init__(self,
                  data_loader: BaseDataLoader,
-                 resulting_building_block: BuildingBlock
+                 resulting_building_block: BuildingBlock,
+                 workers: int = 1,
+                 model_path: str = None,
+                 profiler: Profiler = None,
+                 prefetch_depth: int = 0,
+                 prefetch_max_bytes: int = None
                  ):
         self._data_loader = data_loader
+        self._workers = workers
+        self._profiler = profiler
+        self._prefetch_depth = prefetch_depth
+        self._prefetch_max_bytes = prefetch_max_bytes
+        self._data_hash = None
         self._building_block_manager = BuildingBlockManager(resulting_building_block)
         self._baseBB = BuildingBlock()        
         self._graph_dot = dot_to_str(self._building_block_manager.to_dot())
@@ -39,7 +78,18 @@ class DataPreprocessor:
         #print(self._graph_dot)
         print("-------------------------------")
 
-        self._prepare_and_fit_building_blocks()
+        if self._profiler is not None:
+            self._profiler.attach(self._building_block_manager)
+            if self._workers > 1:
+                print("profiling: training sequentially to profile the bbs in this process")
+                self._workers = 1
+
+        if model_path is not None and self.load(model_path):
+            print(f"loaded trained bbs from {model_path}")
+        else:
+            self._prepare_and_fit_building_blocks()
+            if model_path is not None:
+                self.save(model_path)
 
     def get_building_block_manager(self):
         return self._building_block_manager
@@ -47,6 +97,28 @@ class DataPreprocessor:
     def get_graph_dot(self):
         return self._graph_dot
 
+    def _trainable_bbs(self) -> list:
+        return [bb for generation in self._building_block_manager.building_block_generations
+                for bb in generation if self._trainable(bb)]
+
+    def _get_data_hash(self) -> str:
+        if self._data_hash is None:
+            self._data_hash = data_set_hash(self._data_loader)
+        return self._data_hash
+
+    def save(self, path: str):
+        """
+        saves the states of all trainable bbs together with a hash of the training data
+        """
+        save_building_blocks(path, self._building_block_manager, self._trainable_bbs(), self._get_data_hash())
+
+    def load(self, path: str) -> bool:
+        """
+        loads the states of all trainable bbs if they were saved for the same graph and data
+        returns: True if the bbs were loaded
+        """
+        return load_building_blocks(path, self._building_block_manager, self._trainable_bbs(), self._get_data_hash())
+
     def _train_on_needed(self, bb_gen: list) -> bool:        
         for bb in bb_gen:
             if bb.train_on.__func__ != self._baseBB.train_on.__func__:
@@ -65,59 +137,156 @@ class DataPreprocessor:
                 return True
         return False
 
+    def _trainable(self, bb: BuildingBlock) -> bool:
+        """
+        a building block is trainable if it implements train_on, val_on or fit
+        its results are only final after it was fitted
+        """
+        return self._train_on_needed([bb]) or self._val_on_needed([bb]) or self._fit_needed([bb])
+
+    def _schedule_stages(self) -> list:
+        """
+        groups all trainable building blocks into stages
+        a building block can be trained as soon as all trainable building blocks it (transitively) depends on are fitted
+        so each stage needs at most one pass over training and one pass over validation data
+
+        returns: list of stages, each stage is a tuple of (ready bbs, bbs to train) in generation order
+            ready bbs: dependencies of the bbs to train, their results are final in this stage
+            bbs to train: trainable bbs trained in this stage
+        """
+        stage_of = {}
+        for generation in self._building_block_manager.building_block_generations:
+            for bb in generation:
+                stage = 0
+                for dependency in bb.depends_on():
+                    stage = max(stage, stage_of[dependency] + (1 if self._trainable(dependency) else 0))
+                stage_of[bb] = stage
+
+        stages = []
+        trainable_stages = sorted({stage_of[bb] for bb in stage_of if self._trainable(bb)})
+        for stage in trainable_stages:
+            bbs_to_train = []
+            for generation in self._building_block_manager.building_block_generations:
+                for bb in generation:
+                    if self._trainable(bb) and stage_of[bb] == stage:
+                        bbs_to_train.append(bb)
+            # only the dependencies of the bbs to train have to be calculated
+            needed_bbs = set()
+            todo = list(bbs_to_train)
+            while len(todo) > 0:
+                for dependency in todo.pop().depends_on():
+                    if dependency not in needed_bbs:
+                        needed_bbs.add(dependency)
+                        todo.append(dependency)
+            ready_bbs = []
+            for generation in self._building_block_manager.building_block_generations:
+                for bb in generation:
+                    if bb in needed_bbs:
+                        ready_bbs.append(bb)
+            stages.append((ready_bbs, bbs_to_train))
+        return stages
+
+    def _data_passes_per_generation(self) -> int:
+        """
+        number of data passes needed if each generation was trained on its own
+        """
+        passes = 0
+        for generation in self._building_block_manager.building_block_generations:
+            passes += int(self._train_on_needed(generation)) + int(self._val_on_needed(generation))
+        return passes
+
     def _prepare_and_fit_building_blocks(self):
         """
         preprocessing for building blocks
         - calls train on, val on and fit for each building block on the training data in the order given by the building block manager
+        - generations that do not depend on each others training are fused into stages that share one data pass
         """
-        num_generations = len(self._building_block_manager.building_block_generations)
-        for current_generation in range(0, num_generations):
+        stages = self._schedule_stages()
+        num_stages = len(stages)
+        num_passes = 0
+        for current_stage, (ready_bbs, bbs_to_train) in enumerate(stages):
             # infos
-            print(f"at generation: {current_generation + 1} of {num_generations}: {self._building_block_manager.building_block_generations[current_generation]}")
+            print(f"at stage: {current_stage + 1} of {num_stages}: {bbs_to_train}")
 
             # training
-            if not self._train_on_needed(self._building_block_manager.building_block_generations[current_generation]):
-                pass
-            else:
-                for recording in tqdm(self._data_loader.training_data(),
-                                    f"train bb {current_generation + 1}/{num_generations}".rjust(27),
-                                    unit=" recording"):
-                    for syscall in recording.syscalls():                        
-                        # calculate already fitted bbs
-                        for previous_generation in range(0, current_generation):
-                            for previous_bb in self._building_block_manager.building_block_generations[previous_generation]:                            
-                                previous_bb.get_result(syscall)
-                        # call train_on for current iteration bbs
-                        for current_bb in self._building_block_manager.building_block_generations[current_generation]:
-                            current_bb.train_on(syscall)
-                    self.new_recording()
+            train_bbs = [bb for bb in bbs_to_train if self._train_on_needed([bb])]
+            if len(train_bbs) > 0:
+                num_passes += 1
+                self._data_pass(self._data_loader.training_data(),
+                                f"train bb {current_stage + 1}/{num_stages}".rjust(27),
+                                ready_bbs,
+                                train_bbs,
+                                'train_on')
 
             # validation
-            if not self._val_on_needed(self._building_block_manager.building_block_generations[current_generation]):
-                pass
-            else:            
-                for recording in tqdm(self._data_loader.validation_data(),
-                                    f"val bb {current_generation + 1}/{num_generations}".rjust(27),
-                                    unit=" recording"):
-                    for syscall in recording.syscalls():                        
-                        # calculate already fitted bbs
-                        for previous_generation in range(0, current_generation):
-                            for previous_bb in self._building_block_manager.building_block_generations[previous_generation]:                            
-                                previous_bb.get_result(syscall)
-                        # call val_on for current iteration bbs
-                        for current_bb in self._building_block_manager.building_block_generations[current_generation]:
-                            current_bb.val_on(syscall)
-                    self.new_recording()            
-
-            # fit current generation bbs
-            if not self._fit_needed(self._building_block_manager.building_block_generations[current_generation]):
-                pass
-            else:            
-                for current_bb in tqdm(self._building_block_manager.building_block_generations[current_generation],
-                                            f"fitting bbs {current_generation + 1}/{num_generations}".rjust(27),
-                                            unit=" bbs"):
+            val_bbs = [bb for bb in bbs_to_train if self._val_on_needed([bb])]
+            if len(val_bbs) > 0:
+                num_passes += 1
+                self._data_pass(self._data_loader.validation_data(),
+                                f"val bb {current_stage + 1}/{num_stages}".rjust(27),
+                                ready_bbs,
+                                val_bbs,
+                                'val_on')
+
+            # fit current stage bbs
+            fit_bbs = [bb for bb in bbs_to_train if self._fit_needed([bb])]
+            if len(fit_bbs) > 0:
+                for current_bb in tqdm(fit_bbs,
+                                       f"fitting bbs {current_stage + 1}/{num_stages}".rjust(27),
+                                       unit=" bbs"):
                     current_bb.fit()
 
+        passes_per_generation = self._data_passes_per_generation()
+        print(f"trained in {num_passes} data passes instead of {passes_per_generation} "
+              f"({passes_per_generation - num_passes} passes saved)")
+
+    def _data_pass(self, recordings, description: str, ready_bbs: list, bbs: list, method_name: str):
+        """
+        one pass over the given recordings calling method_name (train_on or val_on) of each given bb
+        the pass is split over several processes if workers > 1 and all given bbs can be merged
+        """
+        if self._workers > 1 and self._merge_supported(bbs):
+            self._parallel_data_pass(recordings, description, ready_bbs, bbs, method_name)
+            return
+        if self._workers > 1:
+            print(f"{description.strip()}: not all bbs support merging, training sequentially")
+        recordings = list(recordings)
+        for recording in tqdm(prefetch(recordings, self._prefetch_depth, self._prefetch_max_bytes),
+                              description, total=len(recordings), unit=" recording"):
+            for syscall in recording.syscalls():
+                # calculate already fitted bbs
+                for ready_bb in ready_bbs:
+                    ready_bb.get_result(syscall)
+                # call train_on/val_on for current stage bbs
+                for current_bb in bbs:
+                    getattr(current_bb, method_name)(syscall)
+            self.new_recording()
+
+    def _parallel_data_pass(self, recordings, description: str, ready_bbs: list, bbs: list, method_name: str):
+        """
+        splits the recordings into contiguous chunks, one per worker
+        each worker trains its own copy of the building blocks on its chunk
+        afterwards the copies are merged into the original bbs in the order of the chunks
+        """
+        recordings = list(recordings)
+        chunk_size = max(1, math.ceil(len(recordings) / self._workers))
+        all_bbs = [bb for generation in self._building_block_manager.building_block_generations for bb in generation]
+        chunks = [(all_bbs, ready_bbs, bbs, method_name, recordings[i:i + chunk_size])
+                  for i in range(0, len(recordings), chunk_size)]
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            for trained_bbs in tqdm(executor.map(_data_pass_on_chunk, chunks),
+                                    description,
+                                    total=len(chunks),
+                                    unit=" chunk"):
+                for current_bb, trained_bb in zip(bbs, trained_bbs):
+                    current_bb.merge(trained_bb)
+
+    def _merge_supported(self, bbs: list) -> bool:
+        for bb in bbs:
+            if bb.merge.__func__ == self._baseBB.merge.__func__:
+                return False
+        return True
+
     def new_recording(self):
         """
         - this method should be called each time after a recording is done and a new recording starts
@@ -126,3 +295,12 @@ class DataPreprocessor:
         for generation in self._building_block_manager.building_block_generations:
             for bb in generation:
                 bb.new_recording()
+
+    def drop_threads(self, thread_ids: set):
+        """
+        - removes the buffered data of the given threads from all bbs
+        - used instead of new_recording if syscalls of one endless stream are processed
+        """
+        for generation in self._building_block_manager.building_block_generations:
+            for bb in generation:
+                bb.drop_threads(thread_ids)
@@ -1,14 +1,16 @@
 from enum import Enum
-from functools import lru_cache
 import time
 import torch
 import torch.utils.data.dataset as td
 import torch.nn as nn
 from tqdm import tqdm
 import math
+import numpy as np
 
 from dataloader.syscall import Syscall
 from algorithms.building_block import BuildingBlock
+from algorithms.util.growable_array import GrowableArray, peak_memory_mib, print_peak_memory
+from algorithms.util.one_hot import one_hot_tensor
 
 
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu') 
@@ -24,12 +26,9 @@ class AEDataset(td.Dataset):
     """
     helper class used to present the data to torch
     """
-    def __init__(self, data: set) -> None:
+    def __init__(self, data: np.ndarray) -> None:
         super().__init__()
-        data_array = []
-        for line in data:
-            data_array.append(line)
-        self.xy_data = torch.tensor(data_array, dtype=torch.float32, device=device)
+        self.xy_data = torch.from_numpy(np.asarray(data, dtype=np.float32)).to(device)
 
     def __len__(self):
         return len(self.xy_data)
@@ -112,20 +111,28 @@ class AENetwork(nn.Module):
 class AE(BuildingBlock):
     """
     the decision engine
+
+    if one_hot_encoding is given, the input vector consists of its indices (OneHotEncoding with index_only=True),
+    which are expanded to the One Hot input of the network batch wise on the device
     """
-    def __init__(self, input_vector: BuildingBlock, mode: AEMode = AEMode.LOSS, batch_size=256, max_training_time=600, early_stopping_epochs=50):
+    def __init__(self, input_vector: BuildingBlock, mode: AEMode = AEMode.LOSS, batch_size=256, max_training_time=600, early_stopping_epochs=50,
+                 one_hot_encoding: BuildingBlock = None):
         super().__init__()                
         self._input_vector = input_vector
+        self._one_hot_encoding = one_hot_encoding
+        self._num_classes = None
         self._dependency_list = [input_vector]
         self._mode = mode 
         self._input_size = 0
         self._autoencoder = None 
         self._loss_function = torch.nn.MSELoss()        
         self._batch_size = batch_size
-        self._training_set = set() 
-        self._validation_set = set()
+        # distinct input vectors, collected as rows of growable arrays
+        self._training_data = GrowableArray(np.float32, distinct=True)
+        self._validation_data = GrowableArray(np.float32, distinct=True)
         self._max_training_time = max_training_time # time in seconds
         self._early_stopping_num_epochs = early_stopping_epochs
+        self._cache = self.create_cache(max_entries=1000)
 
     def depends_on(self):
         return self._dependency_list
@@ -135,15 +142,20 @@ class AE(BuildingBlock):
         if input_vector is not None:
             if self._input_size == 0:
                 self._input_size = len(input_vector)
-            self._training_set.add(tuple(input_vector))
+            self._training_data.append(input_vector)
         
     def val_on(self, syscall: Syscall):
         input_vector = self._input_vector.get_result(syscall)
         if input_vector is not None:
-            self._validation_set.add(tuple(input_vector))
-        
+            self._validation_data.append(input_vector)
+
     def fit(self):
-        print(f"AE.train_set: {len(self._training_set)}".rjust(27))
+        peak_before = peak_memory_mib()
+        training_data = self._training_data.array()
+        print(f"AE.train_set: {len(training_data)}".rjust(27))
+        if self._one_hot_encoding is not None:
+            self._num_classes = self._one_hot_encoding.get_embedding_size()
+            self._input_size = self._input_size * self._num_classes
         self._autoencoder = AENetwork(self._input_size).to(device)         
         self._autoencoder.train()
         self._optimizer = torch.optim.Adam(            
@@ -159,8 +171,8 @@ class AE(BuildingBlock):
         best_weights = {}
         training_start_time = time.time()
 
-        ae_ds = AEDataset(self._training_set)
-        ae_ds_val = AEDataset(self._validation_set)
+        ae_ds = AEDataset(training_data)
+        ae_ds_val = AEDataset(self._validation_data.array())
         data_loader = torch.utils.data.DataLoader(ae_ds, batch_size=self._batch_size, shuffle=True)
         val_data_loader = torch.utils.data.DataLoader(ae_ds_val, batch_size=self._batch_size, shuffle=True)
         
@@ -171,8 +183,8 @@ class AE(BuildingBlock):
             while True:
                 epoch_counter += 1                
                 for (batch_index, batch) in enumerate(data_loader):                    
-                    X = batch  # inputs
-                    Y = batch  # targets (same as inputs)
+                    X = self._expand(batch)  # inputs
+                    Y = X  # targets (same as inputs)
                     # forward
                     oupt = self._autoencoder(X)                # compute output
                     loss_value = self._loss_function(oupt, Y)  # compute loss (a tensor)
@@ -185,7 +197,7 @@ class AE(BuildingBlock):
                 val_loss = 0.0
                 count = 0
                 for (batch_index, batch) in enumerate(val_data_loader):
-                    X = batch
+                    X = self._expand(batch)
                     outputs = self._autoencoder(X)
                     loss_value = self._loss_function(outputs, X)
                     val_loss += loss_value.item()
@@ -224,18 +236,26 @@ class AE(BuildingBlock):
         print(f"stop at {bar.n:2f} seconds and {epoch_counter} epochs".rjust(27))        
         self._autoencoder.load_state_dict(best_weights)
         self._autoencoder.eval()
-        self._training_set = set() 
-        self._validation_set = set()
+        print_peak_memory('AE', peak_before)
+        self._training_data = GrowableArray(np.float32, distinct=True)
+        self._validation_data = GrowableArray(np.float32, distinct=True)
+
 
+    def _expand(self, data: torch.Tensor) -> torch.Tensor:
+        """
+        expands one hot indices to the input of the network, other input vectors are used as they are
+        """
+        if self._num_classes is None:
+            return data
+        return one_hot_tensor(data, self._num_classes)
 
-    @lru_cache(maxsize=1000)
-    def _cached_results(self, input_vector):
+    def _result_of(self, input_vector):
         if input_vector is None:            
             return None            
         else:            
             # Output of Autoencoder        
             result = 0
-            in_t = torch.tensor(input_vector, dtype=torch.float32).to(device) 
+            in_t = self._expand(torch.tensor(input_vector, dtype=torch.float32).to(device))
             if self._mode == AEMode.LOSS:
                 # calculating the autoencoder:
                 with torch.no_grad():
@@ -267,7 +287,7 @@ class AE(BuildingBlock):
 
     def _calculate(self, syscall: Syscall):
         input_vector = self._input_vector.get_result(syscall)
-        return self._cached_results(input_vector)
+        return self._cache.get_or_calculate(input_vector, self._result_of)
 
     def new_recording(self):
         pass
\ No newline at end of file
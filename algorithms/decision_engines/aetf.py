@@ -1,5 +1,4 @@
 from enum import Enum
-from functools import lru_cache
 import time
 from tqdm import tqdm
 import math
@@ -27,6 +26,7 @@ class AE_TF(BuildingBlock):
         self._training_set = set() 
         self._validation_set = set()
         self._epochs = epochs
+        self._cache = self.create_cache(max_entries=1000)
 
         # model state
         self._model_state = "Training"
@@ -130,8 +130,7 @@ class AE_TF(BuildingBlock):
         self._validation_set = set()
         
         
-    @lru_cache(maxsize=1000)
-    def _cached_results(self, input_vector):
+    def _result_of(self, input_vector):
         if input_vector is None:            
             return None            
         else:            
@@ -143,7 +142,7 @@ class AE_TF(BuildingBlock):
 
     def _calculate(self, syscall: Syscall):
         input_vector = self._input_vector.get_result(syscall)
-        return self._cached_results(input_vector)
+        return self._cache.get_or_calculate(input_vector, self._result_of)
 
     def new_recording(self):
         pass
\ No newline at end of file
@@ -9,6 +9,10 @@ from tqdm import tqdm
 
 from dataloader.syscall import Syscall
 from algorithms.building_block import BuildingBlock
+from algorithms.util.growable_array import GrowableArray, peak_memory_mib, print_peak_memory
+
+# maximum number of steps fed into the net at once in batch inference
+INFERENCE_CHUNK_SIZE = 100000
 
 
 class LSTM(BuildingBlock):
@@ -64,12 +68,12 @@ class LSTM(BuildingBlock):
             os.makedirs(model_dir)
         self._model_path = model_path
         self._training_data = {
-            'x': [],
-            'y': []
+            'x': GrowableArray(np.float32),
+            'y': GrowableArray(np.int64)
         }
         self._validation_data = {
-            'x': [],
-            'y': []
+            'x': GrowableArray(np.float32),
+            'y': GrowableArray(np.int64)
         }
         self._state = 'build_training_data'
         self._lstm = None
@@ -121,10 +125,8 @@ class LSTM(BuildingBlock):
         """
         feature_list = self._input_vector.get_result(syscall)
         if self._lstm is None and feature_list is not None:
-            x = np.array(feature_list[1:])
-            y = feature_list[0]
-            self._training_data['x'].append(x)
-            self._training_data['y'].append(y)
+            self._training_data['x'].append(feature_list[1:])
+            self._training_data['y'].append(feature_list[0])
             self._current_batch.append(self._batch_counter)
             self._batch_counter += 1
             if len(self._current_batch) == self._batch_size:
@@ -145,10 +147,8 @@ class LSTM(BuildingBlock):
         """
         feature_list = self._input_vector.get_result(syscall)
         if self._lstm is None and feature_list is not None:
-            x = np.array(feature_list[1:])
-            y = feature_list[0]
-            self._validation_data['x'].append(x)
-            self._validation_data['y'].append(y)
+            self._validation_data['x'].append(feature_list[1:])
+            self._validation_data['y'].append(feature_list[0])
             self._current_batch_val.append(self._batch_counter_val)
             self._batch_counter_val += 1
             if len(self._current_batch_val) == self._batch_size:
@@ -158,20 +158,16 @@ class LSTM(BuildingBlock):
             pass
 
     def _create_train_data(self, val: bool):
-        if not val:
-            x_tensors = Variable(torch.Tensor(self._training_data['x'])).to(self._device)
-            y_tensors = Variable(torch.Tensor(self._training_data['y'])).to(self._device)
-            y_tensors = y_tensors.long()
-            x_tensors_final = torch.reshape(x_tensors, (x_tensors.shape[0], 1, x_tensors.shape[1]))
-            print(f"Training Shape x: {x_tensors_final.shape} y: {y_tensors.shape}")
-            return SyscallFeatureDataSet(x_tensors_final, y_tensors), y_tensors
-        else:
-            x_tensors = Variable(torch.Tensor(self._validation_data['x'])).to(self._device)
-            y_tensors = Variable(torch.Tensor(self._validation_data['y'])).to(self._device)
-            y_tensors = y_tensors.long()
-            x_tensors_final = torch.reshape(x_tensors, (x_tensors.shape[0], 1, x_tensors.shape[1]))
-            print(f"Validation Shape x: {x_tensors_final.shape} y: {y_tensors.shape}")
-            return SyscallFeatureDataSet(x_tensors_final, y_tensors), y_tensors
+        """
+        builds one contiguous tensor of the collected features and labels
+        """
+        data = self._validation_data if val else self._training_data
+        x = data['x'].array()
+        x_tensors = torch.from_numpy(x.reshape(len(x), 1, -1)).to(self._device)
+        y_tensors = torch.from_numpy(data['y'].array()).to(self._device)
+        name = 'Validation' if val else 'Training'
+        print(f"{name} Shape x: {x_tensors.shape} y: {y_tensors.shape}")
+        return SyscallFeatureDataSet(x_tensors, y_tensors), y_tensors
 
     def fit(self):
         """
@@ -184,6 +180,7 @@ class LSTM(BuildingBlock):
         define hyperparameters, iterate through DataSet and train Net
         keep hidden and cell state over batches, only reset with new recording
         """
+        peak_before = peak_memory_mib()
         if self._state == 'build_training_data':
             self._state = 'fitting'
         if self._lstm is None:
@@ -247,6 +244,7 @@ class LSTM(BuildingBlock):
                        val_loss,
                        val_accuracy))
             torch.save(self._lstm.state_dict(), self._model_path)
+            print_peak_memory('lstm', peak_before)
         else:
             print(f"Net already trained. Using model {self._model_path}")
             pass
@@ -282,6 +280,41 @@ class LSTM(BuildingBlock):
         else:
             return None
 
+    def _calculate_batch(self, columns):
+        """
+
+        feeds all feature vectors of the recording as one sequence into the model
+        (in chunks of at most INFERENCE_CHUNK_SIZE steps, without gradients)
+        the probability of each actual syscall is gathered from the log softmax of the logits at its step
+        same scores as _calculate, but one forward pass instead of one per syscall
+
+        Returns:
+            np.ndarray: anomaly scores, nan where no feature vector is given
+
+        """
+        if self._hidden_layers != 1:
+            # forward scores the hidden state of the first layer, only a single layer is computed as sequence
+            return super()._calculate_batch(columns)
+        feature_lists = self._input_vector.get_results_batch(columns)
+        anomaly_scores = np.full(len(feature_lists), np.nan)
+        rows = [i for i, feature_list in enumerate(feature_lists) if feature_list]
+        if len(rows) == 0:
+            return anomaly_scores
+        x = torch.tensor(np.array([feature_lists[i][1:] for i in rows], dtype=np.float32),
+                         device=self._device).reshape(1, len(rows), -1)
+        actual_syscalls = torch.tensor([int(feature_lists[i][0]) for i in rows],
+                                       dtype=torch.long,
+                                       device=self._device)
+        log_probs = []
+        hidden = None
+        with torch.no_grad():
+            for start in range(0, len(rows), INFERENCE_CHUNK_SIZE):
+                logits, hidden = self._lstm.sequence_logits(x[:, start:start + INFERENCE_CHUNK_SIZE], hidden)
+                log_probs.append(torch.log_softmax(logits[0], dim=1)
+                                 .gather(1, actual_syscalls[start:start + INFERENCE_CHUNK_SIZE, None])[:, 0])
+        anomaly_scores[rows] = 1 - torch.exp(torch.cat(log_probs)).cpu().numpy()
+        return anomaly_scores
+
     def _accuracy(self, outputs, labels):
         """
 
@@ -376,6 +409,17 @@ class Net(nn.Module):
         out = self.output(out)
         return out, hidden
 
+    def sequence_logits(self, x, hidden=None):
+        """
+        logits for every step of the sequence x (1, steps, input_size) in one pass
+        gives the same logits as calling forward step by step (only for a single lstm layer)
+
+        Returns:
+            logits (1, steps, num_classes) and the hidden state after the last step
+        """
+        output, hidden = self.lstm(x, hidden)
+        return self.output(self.tanh(output)), hidden
+
 
 class SyscallFeatureDataSet(Dataset):
 
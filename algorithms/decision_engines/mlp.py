@@ -1,4 +1,3 @@
-from functools import lru_cache
 from decimal import Decimal
 import math
 import torch
@@ -13,6 +12,9 @@ from torch import optim
 from torch.utils.data import Dataset
 from dataloader.syscall import Syscall
 from algorithms.building_block import BuildingBlock
+from algorithms.util.result_cache import MISSING
+from algorithms.util.growable_array import GrowableArray, peak_memory_mib, print_peak_memory
+from algorithms.util.one_hot import one_hot_tensor
 
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu') 
 
@@ -21,15 +23,12 @@ class MLPDataset(Dataset):
     torch dataloader that presents syscall data as tensors to neural network
     """
 
-    def __init__(self, data):
+    def __init__(self, x_data: np.ndarray, y_data: np.ndarray):
         """
-        adds all datapoints as tensors to dataset
+        moves the contiguous arrays of input vectors and labels to the device as one tensor each
         """
-        self.x_data = []
-        self.y_data = []
-        for datapoint in data:
-            self.x_data.append(torch.from_numpy(np.asarray(datapoint[0], dtype=np.float32)).to(device=device))
-            self.y_data.append(torch.from_numpy(np.asarray(datapoint[1], dtype=np.float32)).to(device=device))
+        self.x_data = torch.from_numpy(np.asarray(x_data, dtype=np.float32)).to(device=device)
+        self.y_data = torch.from_numpy(np.asarray(y_data, dtype=np.float32)).to(device=device)
 
     def __len__(self):
         """
@@ -60,6 +59,9 @@ class MLP(BuildingBlock):
             hidden_layers: the number of hidden layers
             batch_size: number of input datapoints that are showed to the neural network
                             before adjusting the weights
+            one_hot_encoding: if given the input vector consists of indices of this OneHotEncoding (index_only=True),
+                            which are expanded to One Hot vectors batch wise on the device
+                            an output label of a OneHotEncoding with index_only=True is expanded the same way
     """
 
     def __init__(self,
@@ -68,7 +70,8 @@ class MLP(BuildingBlock):
                  hidden_size: int,
                  hidden_layers: int,
                  batch_size: int,
-                 learning_rate: float = 0.003):
+                 learning_rate: float = 0.003,
+                 one_hot_encoding: BuildingBlock = None):
         super().__init__()
 
         self.input_vector = input_vector
@@ -80,18 +83,23 @@ class MLP(BuildingBlock):
 
         self._dependency_list = [input_vector, output_label]
 
+        self._one_hot_encoding = one_hot_encoding
+        self._num_classes = None
+        self._label_is_index = getattr(output_label, 'index_only', False)
+
         # estimated in train_on method
         self._input_size = 0
         self._output_size = 0
 
-        self._training_set = set()
-        self._validation_set = set()
+        # distinct datapoints as rows of growable arrays, each row is the input vector followed by the label
+        self._training_data = GrowableArray(np.float32, distinct=True)
+        self._validation_data = GrowableArray(np.float32, distinct=True)
         self._model = None  # to be initialized in fit()
 
         # number of epochs after which training is stopped if no improvement in loss has occurred
         self._early_stop_epochs = 1000
 
-        self._result_dict = {}
+        self._result_dict = self.create_cache(max_entries=1000)
 
     def train_on(self, syscall: Syscall):
         """
@@ -109,10 +117,10 @@ class MLP(BuildingBlock):
             if self._input_size == 0:
                 self._input_size = len(input_vector)
 
-            if self._output_size == 0:
+            if self._output_size == 0 and not self._label_is_index:
                 self._output_size = len(output_label)
 
-            self._training_set.add((input_vector, output_label))
+            self._add_datapoint(self._training_data, input_vector, output_label)
 
     def val_on(self, syscall: Syscall):
         """
@@ -125,7 +133,31 @@ class MLP(BuildingBlock):
         output_label = self.output_label.get_result(syscall)
 
         if input_vector is not None and output_label is not None:
-            self._validation_set.add((input_vector, output_label))
+            self._add_datapoint(self._validation_data, input_vector, output_label)
+
+    def _add_datapoint(self, data: GrowableArray, input_vector, output_label):
+        """
+            appends the datapoint as one row, duplicates are removed by the array
+        """
+        # a label index is kept as label of length one
+        data.append(tuple(input_vector) + ((output_label,) if self._label_is_index else tuple(output_label)))
+
+    def _split_datapoints(self, data: GrowableArray) -> tuple:
+        """
+            input vectors and labels of the distinct datapoints
+        """
+        rows = data.array()
+        return rows[:, :self._input_length], rows[:, self._input_length:]
+
+    def _expand(self, inputs: torch.Tensor, labels: torch.Tensor) -> tuple:
+        """
+            expands input and label indices to One Hot vectors, other inputs and labels are used as they are
+        """
+        if self._num_classes is not None:
+            inputs = one_hot_tensor(inputs, self._num_classes)
+        if self._label_is_index:
+            labels = one_hot_tensor(labels, self._output_size)
+        return inputs, labels
 
     def fit(self):
         """
@@ -135,7 +167,16 @@ class MLP(BuildingBlock):
 
             calculates loss on validation data and stops when no optimization occurs
         """
-        print(f"MLP.train_set: {len(self._training_set)}".rjust(27))
+        peak_before = peak_memory_mib()
+        # length of the input vectors before they are expanded to One Hot vectors
+        self._input_length = self._input_size
+        training_inputs, training_labels = self._split_datapoints(self._training_data)
+        print(f"MLP.train_set: {len(training_inputs)}".rjust(27))
+        if self._one_hot_encoding is not None:
+            self._num_classes = self._one_hot_encoding.get_embedding_size()
+            self._input_size = self._input_size * self._num_classes
+        if self._label_is_index:
+            self._output_size = self.output_label.get_embedding_size()
         
         self._model = Feedforward(
             input_size=self._input_size,
@@ -149,8 +190,8 @@ class MLP(BuildingBlock):
         optimizer = optim.Adam(self._model.parameters(), lr=self.learning_rate)  # using Adam optimizer
 
         # building the datasets
-        train_data_set = MLPDataset(self._training_set)
-        val_data_set = MLPDataset(self._validation_set)
+        train_data_set = MLPDataset(training_inputs, training_labels)
+        val_data_set = MLPDataset(*self._split_datapoints(self._validation_data))
 
         # loss preparation for early stop of training
         epochs_since_last_best = 0
@@ -171,7 +212,7 @@ class MLP(BuildingBlock):
         for e in bar:
             # training
             for i, data in enumerate(train_data_loader):
-                inputs, labels = data
+                inputs, labels = self._expand(*data)
 
                 optimizer.zero_grad()  # prepare gradients
 
@@ -186,7 +227,7 @@ class MLP(BuildingBlock):
             count = 0
             # calculate validation loss
             for i, data in enumerate(val_data_loader):
-                inputs, labels = data
+                inputs, labels = self._expand(*data)
                 outputs = self._model(inputs)
                 loss = criterion(outputs, labels)
                 val_loss += loss.item()
@@ -212,12 +253,12 @@ class MLP(BuildingBlock):
                 break
         
         print(f"stop at {bar.n} epochs".rjust(27))        
-        self._result_dict = {}
+        print_peak_memory('MLP', peak_before)
+        self._result_dict.clear()
         self._model.load_state_dict(best_weights)
         self._model.eval()
 
-    @lru_cache(maxsize=1000)
-    def _cached_results(self, input_vector, output_label):
+    def _anomaly_score(self, input_vector, output_label):
         """
             calculates the anomaly score for one syscall
             idea: output of the neural network is a softmax layer containing the
@@ -232,19 +273,24 @@ class MLP(BuildingBlock):
         if input_vector is None:
             return None
         
-        try:
-            label_index = output_label.index(1) # getting the index of the actual next datapoint
-        except ValueError:
-            sys.exit(f'Unexpected ValueError in Output-Label. Please use an OHE. The label: {output_label}.Exiting.')
+        if self._label_is_index:
+            label_index = output_label
+        else:
+            try:
+                label_index = output_label.index(1) # getting the index of the actual next datapoint
+            except ValueError:
+                sys.exit(f'Unexpected ValueError in Output-Label. Please use an OHE. The label: {output_label}.Exiting.')
         
         in_tensor = torch.tensor(input_vector, dtype=torch.float32, device=device)
+        if self._num_classes is not None:
+            in_tensor = one_hot_tensor(in_tensor, self._num_classes)
         with torch.no_grad():
             mlp_out = self._model(in_tensor)
         result = 1 - mlp_out[label_index].item()
         return Decimal(f'{result}')
 
     def _calculate(self, syscall: Syscall):
-        """ Forwards the anomaly calculation to the LRU-Cached implementation
+        """ Returns the cached anomaly score of input vector and label or calculates it
 
         Args:
             syscall (Syscall): Current Syscall
@@ -254,7 +300,12 @@ class MLP(BuildingBlock):
         """
         input_vector = self.input_vector.get_result(syscall)
         label = self.output_label.get_result(syscall)
-        return self._cached_results(input_vector, label)
+        key = (input_vector, label)
+        result = self._result_dict.get(key)
+        if result is MISSING:
+            result = self._anomaly_score(input_vector, label)
+            self._result_dict.put(key, result)
+        return result
         
     def depends_on(self):
         self.list = self._dependency_list
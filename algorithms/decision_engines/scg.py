@@ -1,6 +1,7 @@
 from collections import deque
 
 from algorithms.building_block import BuildingBlock
+from algorithms.util.result_cache import MISSING
 from dataloader.syscall import Syscall
 from algorithms.features.impl.ngram import Ngram
 import networkx as nx
@@ -18,7 +19,7 @@ class SystemCallGraph(BuildingBlock):
         # internal data
         self._graphs = {}
         self._last_added_nodes = {}
-        self._result_dict = {}
+        self._result_dict = self.create_cache()
 
         # dependency list
         self._dependency_list = []
@@ -99,9 +100,10 @@ class SystemCallGraph(BuildingBlock):
                 s = self._last_added_nodes[tid]
                 t = new_node
                 edge = tuple([s,t])                
-                if edge in self._result_dict:
+                anomaly_score = self._result_dict.get(edge)
+                if anomaly_score is not MISSING:
                     self._last_added_nodes[tid] = new_node
-                    return self._result_dict[edge]
+                    return anomaly_score
                 else:
                     # was not the first node for this tid
                     transition_probability = 0
@@ -110,7 +112,7 @@ class SystemCallGraph(BuildingBlock):
                             transition_probability += g[s][t]["p"]
                     transition_probability /= len(self._graphs)                                        
                     anomaly_score = 1.0 - transition_probability
-                    self._result_dict[edge] = anomaly_score
+                    self._result_dict.put(edge, anomaly_score)
                     self._last_added_nodes[tid] = new_node
                     return anomaly_score
             else:
@@ -120,5 +122,13 @@ class SystemCallGraph(BuildingBlock):
             return None
             
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the last added nodes of the given (ended) threads
+        """
+        if self._thread_aware:
+            for thread_id in thread_ids:
+                self._last_added_nodes.pop(thread_id, None)
+
     def new_recording(self):
         self._last_added_nodes = {}
\ No newline at end of file
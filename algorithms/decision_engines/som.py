@@ -4,6 +4,8 @@ import sys
 from matplotlib import pyplot as plt
 
 from algorithms.building_block import BuildingBlock
+from algorithms.util.one_hot import one_hot_array
+from algorithms.util.result_cache import MISSING
 from dataloader.syscall import Syscall
 from minisom import MiniSom
 from tqdm import tqdm
@@ -13,7 +15,7 @@ from numpy.linalg import norm
 
 class Som(BuildingBlock):
     def __init__(self, input_vector: BuildingBlock, epochs: int = 50, sigma: float = 1.0, learning_rate: float = 0.5,
-                 max_size: int = None, size=None):
+                 max_size: int = None, size=None, one_hot_encoding: BuildingBlock = None):
         """
             Anomaly Detection Engine based on Teuvo Kohonen's Self-Organizing-Map (SOM)
 
@@ -30,6 +32,8 @@ class Som(BuildingBlock):
                     (at iteration t: learning_rate(t) = learning_rate / (1 + t/T) where T is #num_iteration/2)
                 max_size: the maximum size for size estimation
                 size: set if size shall not be estimated dynamically (SOM is always initialized quadratic)
+                one_hot_encoding: if given the input vector consists of indices of this OneHotEncoding (index_only=True),
+                    which are expanded to One Hot vectors
         """
         super().__init__()
         self._input_vector = input_vector
@@ -39,10 +43,12 @@ class Som(BuildingBlock):
         self._buffer = set()
         self._epochs = epochs
         self._som = None
-        self._cache = {}
+        self._cache = self.create_cache()
         self._max_size = max_size
         self._size = size
         self.custom_fields = {}
+        self._one_hot_encoding = one_hot_encoding
+        self._num_classes = None
 
     def depends_on(self):
         return self._dependency_list
@@ -78,6 +84,14 @@ class Som(BuildingBlock):
             if input_vector not in self._buffer:
                 self._buffer.add(input_vector)
 
+    def _training_vectors(self):
+        """
+            the distinct training vectors, index vectors are expanded all at once
+        """
+        if self._num_classes is not None:
+            return one_hot_array(list(self._buffer), self._num_classes)
+        return list(self._buffer)
+
     def fit(self):
         """
             finalizes the training step for the som
@@ -85,8 +99,11 @@ class Som(BuildingBlock):
         print(f"som.train_set: {len(self._buffer)} ".rjust(27))
         # print(self._buffer)
         som_size = self._get_or_estimate_som_size()
+        if self._one_hot_encoding is not None:
+            self._num_classes = self._one_hot_encoding.get_embedding_size()
+        vectors = self._training_vectors()
         # vector_size = len(self._buffer[0])
-        vector_size = len(next(iter(self._buffer)))
+        vector_size = len(vectors[0])
 
         self._som = MiniSom(som_size, som_size, vector_size,
                             random_seed=1,
@@ -94,7 +111,7 @@ class Som(BuildingBlock):
                             learning_rate=self._learning_rate)
 
         for epoch in tqdm(range(self._epochs), desc='Training SOM'.rjust(27)):
-            for vector in self._buffer:
+            for vector in vectors:
                 self._som.update(vector, self._som.winner(vector), epoch, self._epochs)
 
     def _calculate(self, syscall: Syscall):
@@ -106,13 +123,15 @@ class Som(BuildingBlock):
         """
         input_vector = self._input_vector.get_result(syscall)
         if input_vector is not None:
-            if input_vector not in self._cache:
-                codebook_vector = np.array(self._som.quantization([input_vector])[0])
-                vector = np.array(input_vector)
+            distance = self._cache.get(input_vector)
+            if distance is MISSING:
+                if self._num_classes is not None:
+                    vector = one_hot_array(input_vector, self._num_classes)
+                else:
+                    vector = np.array(input_vector)
+                codebook_vector = np.array(self._som.quantization([vector])[0])
                 distance = norm(vector - codebook_vector)
-                self._cache[input_vector] = distance
-            else:
-                distance = self._cache[input_vector]
+                self._cache.put(input_vector, distance)
             return distance
         else:
             return None
@@ -148,5 +167,6 @@ class Som(BuildingBlock):
                 If the topographic error is 0, no error occurred.
                 If 1, the topology was not preserved for any of the samples.
         """
-        self.custom_fields['training_quantization_error'] = self._som.quantization_error(list(self._buffer))
-        self.custom_fields['training_topographicn_error'] = self._som.topographic_error(list(self._buffer))
+        vectors = self._training_vectors()
+        self.custom_fields['training_quantization_error'] = self._som.quantization_error(vectors)
+        self.custom_fields['training_topographicn_error'] = self._som.topographic_error(vectors)
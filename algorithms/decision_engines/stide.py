@@ -1,6 +1,10 @@
 """
 Building Block implementing the STIDE algorithm
 """
+import sys
+
+import numpy as np
+
 from dataloader.syscall import Syscall
 
 from algorithms.building_block import BuildingBlock
@@ -10,14 +14,23 @@ class Stide(BuildingBlock):
     """
     Training: save seen Building Blocks into normal "database"
     Inference: check if current input is in normalbase return 0 if that is the case
+
+    compact: after training the ngrams (of non negative integers, e.g. from IntEmbedding) are packed
+             into 64 bit keys stored in a sorted numpy array instead of a set of tuples
+             if the ngrams can not be packed the set is kept
     """
-    def __init__(self, input: BuildingBlock):
+    def __init__(self, input: BuildingBlock, compact: bool = False):
         super().__init__()
         # parameter
         self._input = input
+        self._compact = compact
 
         # internal data
         self._normal_database = set()
+        # compact database: sorted packed ngrams and bits per ngram element
+        self._keys = None
+        self._bits = None
+        self._ngram_length = None
 
         # dependency list
         self._dependency_list = []
@@ -35,8 +48,76 @@ class Stide(BuildingBlock):
             if ngram not in self._normal_database:
                 self._normal_database.add(ngram)
 
+    def merge(self, other):
+        """
+        the normal database of both stides is united
+        """
+        self._normal_database.update(other._normal_database)
+
     def fit(self):
         print(f"stide.train_set: {len(self._normal_database)}".rjust(27))
+        if self._compact:
+            self._pack_database()
+
+    def _pack_database(self):
+        """
+        packs all ngrams of the normal database into a sorted array of uint64 keys
+        each element of an ngram gets the number of bits needed for the largest element
+        """
+        if len(self._normal_database) == 0:
+            return
+        ngram_length = None
+        max_value = 0
+        for ngram in self._normal_database:
+            if not isinstance(ngram, tuple) or (ngram_length is not None and len(ngram) != ngram_length):
+                print("stide: ngrams can not be packed, keeping the set".rjust(27))
+                return
+            ngram_length = len(ngram)
+            for value in ngram:
+                if not isinstance(value, (int, np.integer)) or value < 0:
+                    print("stide: ngrams can not be packed, keeping the set".rjust(27))
+                    return
+                if value > max_value:
+                    max_value = value
+        bits = max(1, int(max_value).bit_length())
+        if bits * ngram_length > 64:
+            print(f"stide: ngrams need {bits * ngram_length} bits, keeping the set".rjust(27))
+            return
+
+        set_size = sys.getsizeof(self._normal_database) + sum(sys.getsizeof(ngram) for ngram in self._normal_database)
+        self._bits = bits
+        self._ngram_length = ngram_length
+        self._keys = np.sort(self._pack(np.array(list(self._normal_database), dtype=np.uint64)))
+        self._normal_database = set()
+        print(f"stide.memory: {self._keys.nbytes / 1024:.1f} KiB instead of {set_size / 1024:.1f} KiB".rjust(27))
+
+    def _pack(self, ngrams: np.ndarray) -> np.ndarray:
+        """
+        packs the rows of a 2d array of ngram elements into one uint64 key each
+        """
+        keys = np.zeros(len(ngrams), dtype=np.uint64)
+        bits = np.uint64(self._bits)
+        for i in range(self._ngram_length):
+            keys = (keys << bits) | ngrams[:, i]
+        return keys
+
+    def _is_known(self, ngram) -> bool:
+        """
+        looks the ngram up in the normal database (set or packed keys)
+        """
+        if self._keys is None:
+            return ngram in self._normal_database
+        if len(ngram) != self._ngram_length:
+            return False
+        key = 0
+        for value in ngram:
+            if not isinstance(value, (int, np.integer)) or value < 0 or value >> self._bits:
+                # values not seen in training can not be packed
+                return False
+            key = (key << self._bits) | int(value)
+        key = np.uint64(key)
+        index = np.searchsorted(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
 
     def _calculate(self, syscall: Syscall):
         """
@@ -44,7 +125,38 @@ class Stide(BuildingBlock):
         """
         ngram = self._input.get_result(syscall)
         if ngram is not None:
-            if ngram in self._normal_database:
+            if self._is_known(ngram):
                 return 0
             return 1
         return None
+
+    def _calculate_batch(self, columns):
+        """
+        0 for known, 1 for unknown ngrams and nan where no ngram is given
+        """
+        ngrams = self._input.get_results_batch(columns)
+        if self._keys is None:
+            normal_database = self._normal_database
+            return np.array([np.nan if ngram is None else (0 if ngram in normal_database else 1) for ngram in ngrams],
+                            dtype=np.float64)
+
+        results = np.full(len(ngrams), np.nan)
+        rows = np.array([ngram is not None for ngram in ngrams], dtype=bool)
+        valid_ngrams = [ngram for ngram in ngrams if ngram is not None]
+        if len(valid_ngrams) == 0:
+            return results
+        try:
+            elements = np.array(valid_ngrams, dtype=np.int64).reshape(len(valid_ngrams), -1)
+        except (TypeError, ValueError):
+            results[rows] = [0 if self._is_known(ngram) else 1 for ngram in valid_ngrams]
+            return results
+        if elements.shape[1] != self._ngram_length:
+            results[rows] = 1
+            return results
+        # elements outside of the packed range were not seen in training
+        packable = ((elements >= 0) & (elements < (1 << self._bits))).all(axis=1)
+        keys = self._pack(np.where(packable[:, None], elements, 0).astype(np.uint64))
+        indices = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        known = packable & (self._keys[indices] == keys)
+        results[rows] = np.where(known, 0, 1)
+        return results
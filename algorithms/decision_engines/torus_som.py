@@ -1,7 +1,6 @@
 import numpy
 
 from numpy import eye
-from functools import lru_cache
 
 from dataloader.syscall import Syscall
 from algorithms.building_block import BuildingBlock
@@ -32,6 +31,7 @@ class TorusSom(BuildingBlock):
         self._buffer = set()
 
         self._som = None
+        self._cache = self.create_cache(max_entries=1000)
 
     def depends_on(self) -> list:
         return self._dependency_list
@@ -58,10 +58,9 @@ class TorusSom(BuildingBlock):
 
         self._som.fit(x=x, tfac=self._tfac, tscale=self._tscale, alpha0=alpha0)
 
-    @lru_cache(maxsize=1000)
-    def _cached_results(self, input_vector: tuple):
+    def _result_of(self, input_vector: tuple):
         """
-            calculates and caches anomaly score
+            calculates the anomaly score
 
             the anomaly score is the distance on the torus between the test datapoint
             and the weight vector of the  winning neuron
@@ -82,4 +81,4 @@ class TorusSom(BuildingBlock):
             extracts test vector from current syscall and returns cached result
         """
         input_vector = self._input_vector.get_result(syscall)
-        return self._cached_results(input_vector)
+        return self._cache.get_or_calculate(input_vector, self._result_of)
@@ -1,6 +1,7 @@
 from dataloader.syscall import Syscall
 from typing import Optional
 from algorithms.building_block import BuildingBlock
+from algorithms.util.result_cache import MISSING
 
 MIN = 0
 MAX = 1
@@ -26,7 +27,7 @@ class AABB(BuildingBlock):
 
         self.min_max_values = []
 
-        self._cache = {}
+        self._cache = self.create_cache()
 
     def depends_on(self):
         return self._dependency_list
@@ -50,6 +51,17 @@ class AABB(BuildingBlock):
                 if value > self.min_max_values[dimension][MAX]:
                     self.min_max_values[dimension][MAX] = value
 
+    def merge(self, other):
+        """
+        extends the bounding box so it contains the bounding box of other
+        """
+        for dimension, (other_min, other_max) in enumerate(other.min_max_values):
+            if dimension < len(self.min_max_values):
+                self.min_max_values[dimension][MIN] = min(self.min_max_values[dimension][MIN], other_min)
+                self.min_max_values[dimension][MAX] = max(self.min_max_values[dimension][MAX], other_max)
+            else:
+                self.min_max_values.append([other_min, other_max])
+
     def _calculate(self, syscall: Syscall) -> Optional[bool]:
         """
         return True if all values of all dimensions are in min max range of their features
@@ -60,9 +72,8 @@ class AABB(BuildingBlock):
 
         if feature_input is not None:
             # caching the result
-            if feature_input in self._cache.keys():
-                return self._cache[feature_input]
-            else:
+            decider_state = self._cache.get(feature_input)
+            if decider_state is MISSING:
                 decider_state = False
                 for dimension, value in enumerate(feature_input):
                     if value < self.min_max_values[dimension][MIN]:
@@ -71,8 +82,8 @@ class AABB(BuildingBlock):
                     if value > self.min_max_values[dimension][MAX]:
                         decider_state = True
                         break
-                self._cache[tuple(feature_input)] = decider_state
-                return decider_state
+                self._cache.put(feature_input, decider_state)
+            return decider_state
         else:
             return None
 
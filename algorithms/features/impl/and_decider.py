@@ -1,6 +1,8 @@
 """
 Building Block for and combination of a list of threshold BBs
 """
+import numpy as np
+
 from dataloader.syscall import Syscall
 
 from algorithms.building_block import BuildingBlock
@@ -38,5 +40,18 @@ class AndDecider(BuildingBlock):
                 final_decision = False 
         return final_decision
 
+    def _calculate_batch(self, columns):
+        """
+        False where one of the deciders returns False
+        """
+        final_decisions = np.ones(len(columns), dtype=bool)
+        for decider in self._dependency_list:
+            decisions = decider.get_results_batch(columns)
+            if decisions.dtype == bool:
+                final_decisions &= decisions
+            else:
+                final_decisions &= np.array([decision is not False for decision in decisions], dtype=bool)
+        return final_decisions
+
     def is_decider(self):
         return True
@@ -69,6 +69,13 @@ class CollectSyscall(BuildingBlock):
         else:
             return None
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._buffer.pop(thread_id, None)
+
     def new_recording(self):
         """
         empty buffer so ngrams consist of same recording only
@@ -23,7 +23,7 @@ class DBScan(BuildingBlock):
         self._bb_id = self._bb_to_cluster.get_id()        
         self._training_data = set()
         self._dbscan = DBSCAN(eps=eps, min_samples=10)
-        self._result_buffer = {}
+        self._result_buffer = self.create_cache()
 
     def depends_on(self) -> list:
         """
@@ -53,12 +53,8 @@ class DBScan(BuildingBlock):
         """
         current_value = self._bb_to_cluster.get_result(syscall)
         if current_value is not None:
-            if current_value in self._result_buffer:
-                return self._result_buffer[current_value]
-            else:
-                result = self._predict(self._dbscan, current_value)
-                self._result_buffer[current_value] = result
-                return result
+            return self._result_buffer.get_or_calculate(current_value,
+                                                        lambda value: self._predict(self._dbscan, value))
         else:
             return None
                 
@@ -87,6 +87,14 @@ class Dgram(BuildingBlock):
                         array.append(feature_dict[feature_id])
         return array
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._dgram_buffer.pop(thread_id, None)
+            self._dgram_value_set.pop(thread_id, None)
+
     def new_recording(self):
         """
         empty buffer so ngrams consist of same recording only
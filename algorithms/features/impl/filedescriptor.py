@@ -2,8 +2,12 @@ import re
 
 from enum import IntEnum
 from dataloader.syscall import Syscall
+from dataloader.param_extractor import ParamExtractor
 from algorithms.building_block import BuildingBlock
 
+# all file descriptor params, extracted in one scan of the params
+FD_PARAMS = ParamExtractor(['fd', 'in_fd', 'out_fd'])
+
 
 class FDMode(IntEnum):
     """
@@ -39,20 +43,20 @@ class FileDescriptor(BuildingBlock):
         Params:
             syscall(Syscall)
         """
-        params = syscall.params()
+        params = FD_PARAMS.extract(syscall.params_string())
         # check which kind of file_descriptor exists
         if 'fd' in params:
-            return self._get_fd_part(syscall.param('fd'), self._mode)
+            return self._get_fd_part(params['fd'], self._mode)
         # in_fd can occur without out_fd
         elif 'in_fd' in params:
             if 'out_fd' in params:
-                return self._get_fd_part(syscall.param('in_fd'), self._mode) + self._get_fd_part(
-                    syscall.param('out_fd'), self._mode)
+                return self._get_fd_part(params['in_fd'], self._mode) + self._get_fd_part(
+                    params['out_fd'], self._mode)
             else:
-                return self._get_fd_part(syscall.param('in_fd'), self._mode)
+                return self._get_fd_part(params['in_fd'], self._mode)
         # catch only out_fd
         elif 'out_fd' in params:
-            return self._get_fd_part(syscall.param('out_fd'), self._mode)
+            return self._get_fd_part(params['out_fd'], self._mode)
         # no fd in syscall
         else:
             return None
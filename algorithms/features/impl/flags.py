@@ -13,9 +13,9 @@ class Flags(BuildingBlock):
         eg: flags=65(O_NONBLOCK|O_RDONLY)
             flags=0
         """
-        params = syscall.params()
-        if "flags" in params:
-            return params["flags"]
+        flags = syscall.param("flags")
+        if flags is not None:
+            return flags
         else:
             return "0"
 
@@ -1,3 +1,5 @@
+import numpy as np
+
 from dataloader.syscall import Syscall
 
 from algorithms.building_block import BuildingBlock
@@ -32,6 +34,15 @@ class IntEmbedding(BuildingBlock):
         if bb_value not in self._syscall_dict:
             self._syscall_dict[bb_value] = len(self._syscall_dict) + 1
 
+    def merge(self, other):
+        """
+            adds the unknown values of other in their order of appearance
+            so the integers are the same as in sequential training
+        """
+        for bb_value in other._syscall_dict:
+            if bb_value not in self._syscall_dict:
+                self._syscall_dict[bb_value] = len(self._syscall_dict) + 1
+
     def _calculate(self, syscall: Syscall):
         """
             transforms given building_block to integer
@@ -42,3 +53,17 @@ class IntEmbedding(BuildingBlock):
         except KeyError:
             sys_to_int = 0
         return sys_to_int
+
+    def _calculate_batch(self, columns):
+        """
+            transforms all values of the building_block to integers, each distinct value is looked up once
+        """
+        bb_values = self._dependency_list[0].get_results_batch(columns)
+        try:
+            distinct_values, inverse = np.unique(bb_values, return_inverse=True)
+        except TypeError:
+            # values can not be sorted
+            return np.array([self._syscall_dict.get(value, 0) for value in bb_values], dtype=np.int64)
+        distinct_ints = np.array([self._syscall_dict.get(value, 0) for value in distinct_values.tolist()],
+                                 dtype=np.int64)
+        return distinct_ints[inverse.reshape(-1)]
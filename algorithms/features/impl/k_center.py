@@ -1,9 +1,10 @@
-import math
 from typing import Optional
 
+import numpy as np
 from tqdm import tqdm
 
 from algorithms.building_block import BuildingBlock
+from algorithms.util.result_cache import MISSING
 from dataloader.syscall import Syscall
 
 
@@ -28,13 +29,13 @@ class KCenter(BuildingBlock):
         self._k = k
 
         self._datapoints = []
-        self._distance_matrix = []
+        self._datapoint_set = set()
 
         self._centers = []
         self._center_indices = []
         self._max_radius = 0.0
 
-        self._cache = {}
+        self._cache = self.create_cache()
 
     def depends_on(self):
         return self._dependency_list
@@ -54,24 +55,22 @@ class KCenter(BuildingBlock):
             feature_input = [feature_input]
 
         if feature_input is not None:
-            if list(feature_input) not in self._datapoints:
+            point = tuple(feature_input)
+            if point not in self._datapoint_set:
+                self._datapoint_set.add(point)
                 self._datapoints.append(list(feature_input))
 
     def fit(self):
         """
-        calculates the distance matrix for all datapoints
-        calls method to find centers in data
-        calls method to determine the maximum radius r
+        finds the centers in data with the greedy algorithm and determines the maximum radius r
+        no distance matrix is built, only the distances of each datapoint to its nearest center so far are kept
         """
-        for point_a in tqdm(self._datapoints, desc="Calculating distance matrix".rjust(27)):
-            distances = []
-            for point_b in self._datapoints:
-                # calculate euclidian distance
-                distance = math.dist(point_a, point_b)
-                distances.append(distance)
-            self._distance_matrix.append(distances)
-        self._find_k_centers()
-        self._find_max_radius()
+        self._datapoint_set = set()
+        if len(self._datapoints) == 0:
+            return
+        points = np.asarray(self._datapoints, dtype=np.float64)
+        nearest_center_distances = self._find_k_centers(points)
+        self._find_max_radius(nearest_center_distances)
 
     def _calculate(self, syscall: Syscall) -> Optional[bool]:
         """
@@ -88,75 +87,55 @@ class KCenter(BuildingBlock):
 
         if feature_input is not None:
             # caching the result
-            if tuple(feature_input) in self._cache.keys():
-                return self._cache[tuple(feature_input)]
-            else:
+            key = tuple(feature_input)
+            result = self._cache.get(key)
+            if result is MISSING:
                 # find the nearest center
                 min_distance = 10 ** 9
-                for center in self._centers:
-                    current_distance = math.dist(list(feature_input), center)
-                    if current_distance < min_distance:
-                        min_distance = current_distance
-
-                if min_distance > self._max_radius:
-                    self._cache[tuple(feature_input)] = True
-                    return True
-                else:
-                    self._cache[tuple(feature_input)] = False
-                    return False
+                if len(self._centers) > 0:
+                    min_distance = min(min_distance, euclidean_distances(self._centers, feature_input).min())
+                result = bool(min_distance > self._max_radius)
+                self._cache.put(key, result)
+            return result
         else:
             return None
 
-    def _find_k_centers(self):
+    def _find_k_centers(self, points: np.ndarray) -> np.ndarray:
         """
         greedy algorithm that finds the k centers in datapoints
+
+        returns: distance of each datapoint to its nearest center
         """
-        n = len(self._distance_matrix)
+        n = len(points)
         # filling the distance list with big values
-        dist = [10**9] * n
+        dist = np.full(n, 10.0 ** 9)
 
         max_index = 0
-        for _ in tqdm(range(self._k), desc="Calculating centers".rjust(27)):
+        for _ in tqdm(range(min(self._k, n)), desc="Calculating centers".rjust(27)):
             # add point to center indices list and center list
             self._center_indices.append(max_index)
             self._centers.append(self._datapoints[max_index])
-            for j in range(n):
-                # updating the distance
-                # of the center to their
-                # closest centers
-                dist[j] = min(dist[j], self._distance_matrix[max_index][j])
-
-            # updating the index of the
-            # center with the maximum
-            # distance to it's closest center
-            max_index = self._calc_max_index(dist, n)
-
-    @staticmethod
-    def _calc_max_index(dist, n):
-        """
-        helper method to find index of max far datapoint
-        @param dist: distance between datapoints
-        @param n: current counter
-        @return: the max index
-        """
-        max_index = 0
-        for i in range(n):
-            if dist[i] > dist[max_index]:
-                max_index = i
-        return max_index
+            # updating the distance of the points to their closest centers,
+            # only the distances to the new center are calculated
+            np.minimum(dist, euclidean_distances(points, points[max_index]), out=dist)
 
-    def _find_max_radius(self):
+            # updating the index of the point with the maximum distance to its closest center
+            # (the first one if there are several)
+            max_index = int(np.argmax(dist))
+        self._centers = np.asarray(self._centers, dtype=np.float64)
+        return dist
+
+    def _find_max_radius(self, nearest_center_distances: np.ndarray):
         """
         finds the maximum radius over all datapoints to their nearest centers
         """
-        for point_index, point in enumerate(tqdm(self._datapoints, desc="Calculating radius".rjust(27))):
-            nearest_center_distance = 10 ** 9
-            # finding the nearest center for datapoint by lookup in distance matrix
-            for center_index in self._center_indices:
-                current_distance = self._distance_matrix[point_index][center_index]
-                if current_distance < nearest_center_distance:
-                    nearest_center_distance = current_distance
-
-            # the maximum of the minimum distance for all centers over all points is the max radius r
-            if nearest_center_distance > self._max_radius:
-                self._max_radius = nearest_center_distance
+        # the maximum of the minimum distance for all centers over all points is the max radius r
+        self._max_radius = max(self._max_radius, float(nearest_center_distances.max()))
+
+
+def euclidean_distances(points, point) -> np.ndarray:
+    """
+    euclidean distance of point to each of the points (one row per point)
+    """
+    differences = np.asarray(points, dtype=np.float64) - np.asarray(point, dtype=np.float64)
+    return np.sqrt(np.einsum('ij,ij->i', differences, differences))
@@ -4,6 +4,7 @@ Building Block for max value of training threshold.
 from dataloader.syscall import Syscall
 
 from algorithms.building_block import BuildingBlock
+from algorithms.util.batch_results import to_float_array
 
 
 class MaxScoreThreshold(BuildingBlock):
@@ -32,6 +33,12 @@ class MaxScoreThreshold(BuildingBlock):
             if anomaly_score > self._threshold:
                 self._threshold = anomaly_score
 
+    def merge(self, other):
+        """
+        keep the highest threshold of both
+        """
+        self._threshold = max(self._threshold, other._threshold)
+
     def _calculate(self, syscall: Syscall) -> bool:
         """
         Return 0 if anomaly_score is below threshold.
@@ -43,5 +50,12 @@ class MaxScoreThreshold(BuildingBlock):
                 return True
         return False
 
+    def _calculate_batch(self, columns):
+        """
+        True for all anomaly scores above the threshold
+        """
+        anomaly_scores = to_float_array(self._feature.get_results_batch(columns))
+        return anomaly_scores > self._threshold
+
     def is_decider(self):
         return True
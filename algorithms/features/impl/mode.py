@@ -12,11 +12,11 @@ class Mode(BuildingBlock):
         calculate mode parameter from syscall
         eg: mode=0
         """
-        params = syscall.params()
-        if "mode" in params:
-            return params["mode"]
+        mode = syscall.param("mode")
+        if mode is not None:
+            return mode
         else:
-            return "0"        
+            return "0"
 
     def depends_on(self):
         return []
@@ -1,8 +1,8 @@
-import math
-
-from tqdm import tqdm
+import numpy as np
+from sklearn.neighbors import KDTree
 
 from algorithms.building_block import BuildingBlock
+from algorithms.util.result_cache import MISSING
 from dataloader.syscall import Syscall
 
 
@@ -24,11 +24,12 @@ class NearestNeighbour(BuildingBlock):
         self._dependency_list.append(self._feature)
 
         self._datapoints = []
-        self._distance_matrix = []
+        self._datapoint_set = set()
 
+        self._tree = None
         self._nearest_neighbour_distances = []
 
-        self._cache = {}
+        self._cache = self.create_cache()
 
     def is_decider(self):
         return True
@@ -48,33 +49,27 @@ class NearestNeighbour(BuildingBlock):
             feature_input = [feature_input]
 
         if feature_input is not None:
-            if list(feature_input) not in self._datapoints:
+            point = tuple(feature_input)
+            if point not in self._datapoint_set:
+                self._datapoint_set.add(point)
                 self._datapoints.append(list(feature_input))
 
     def fit(self):
         """
-        calculates the distance matrix for all datapoints in validation data
-        saves the nearest neighbours for all datapoints
+        builds a kd-tree of all datapoints in validation data
+        saves the distance to the nearest neighbour for all datapoints (queried from the tree, no distance matrix)
         """
-
-        # calculate distance matrix
-        for point_a in tqdm(self._datapoints, desc="Calc distance matrix".rjust(27)):
-            distances = []
-            for point_b in self._datapoints:
-                # calculate euclidian distance
-                distance = math.dist(point_a, point_b)
-                distances.append(distance)
-            self._distance_matrix.append(distances)
-
-        # find distance of nearest neighbour for every datapoint and save it in list
-        for distances in tqdm(self._distance_matrix, desc="Calc all nearest neighbours".rjust(27)):
-            min_distance = 10 ** 9
-            for distance in distances:
-                # the point has distance 0.0 to itself but is not its own neighbour -> filtering it
-                if 0.0 < distance < min_distance:
-                    min_distance = distance
-
-            self._nearest_neighbour_distances.append(min_distance)
+        self._datapoint_set = set()
+        if len(self._datapoints) == 0:
+            return
+        points = np.asarray(self._datapoints, dtype=np.float64)
+        self._tree = KDTree(points)
+        if len(points) > 1:
+            # the nearest point is the point itself (distance 0.0) but it is not its own neighbour
+            distances, _ = self._tree.query(points, k=2)
+            self._nearest_neighbour_distances = distances[:, 1]
+        else:
+            self._nearest_neighbour_distances = np.array([10.0 ** 9])
 
     def _calculate(self, syscall: Syscall) -> bool:
         """
@@ -95,26 +90,24 @@ class NearestNeighbour(BuildingBlock):
         if feature_input is not None:
             feature_input = list(feature_input)
             # caching the result
-            if tuple(feature_input) in self._cache.keys():
-                return self._cache[tuple(feature_input)]
-            else:
+            key = tuple(feature_input)
+            result = self._cache.get(key)
+            if result is MISSING:
                 # find the nearest neighbour of input datapoint
-                min_distance = 10 ** 9
-                min_index = 0
-                for point_index, datapoint in enumerate(self._datapoints):
-                    current_distance = math.dist(feature_input, datapoint)
-                    if current_distance < min_distance:
-                        min_distance = current_distance
-                        min_index = point_index
+                point = np.asarray([feature_input], dtype=np.float64)
+                distances, _ = self._tree.query(point, k=1)
+                min_distance = distances[0, 0]
+                # of equally near datapoints the first one is the nearest neighbour (like a linear scan),
+                # the tree query would return any of them
+                # (the tolerance only absorbs rounding of the distance, not a real difference)
+                radius = min_distance * (1 + 1e-12) + 1e-12
+                min_index = self._tree.query_radius(point, r=radius)[0].min()
 
                 # retrieve the distance of nearest neighbour to its nearest neighbour by looking up its index
                 nearest_neighbour_nn_distance = self._nearest_neighbour_distances[min_index]
 
                 # check if distance of datapoint to nearest neighbour is higher than
                 # the distance of the nearest neighbour to its nearest neighbour
-                if min_distance > nearest_neighbour_nn_distance:
-                    self._cache[tuple(feature_input)] = True
-                    return True
-                else:
-                    self._cache[tuple(feature_input)] = False
-                    return False
+                result = bool(min_distance > nearest_neighbour_nn_distance)
+                self._cache.put(key, result)
+            return result
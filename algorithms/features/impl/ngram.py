@@ -1,10 +1,14 @@
 import typing
 from collections import deque
 from collections.abc import Iterable
+
+import numpy as np
+
 from algorithms import features
 
 from algorithms.building_block import BuildingBlock
 from algorithms.features.impl.threadID import ThreadID
+from algorithms.util.batch_results import thread_groups
 from dataloader.syscall import Syscall
 
 
@@ -72,6 +76,33 @@ class Ngram(BuildingBlock):
                 return tuple(self._ngram_buffer[thread_id])
         return None
 
+    def _calculate_batch(self, columns):
+        """
+        builds the ngrams of all syscalls from the batch results of the features
+        only scalar feature values are handled here, otherwise the ngrams are calculated syscall by syscall
+        """
+        feature_values = []
+        for feature in self._dependency_list:
+            values = feature.get_results_batch(columns)
+            if values.dtype == object:
+                for value in values:
+                    if value is None or (isinstance(value, Iterable) and not isinstance(value, str)):
+                        return super()._calculate_batch(columns)
+            elif values.dtype.kind == 'f' and np.isnan(values).any():
+                return super()._calculate_batch(columns)
+            feature_values.append(values)
+
+        results = np.empty(len(columns), dtype=object)
+        rows = np.empty((len(columns), len(feature_values)), dtype=object)
+        for i, values in enumerate(feature_values):
+            rows[:, i] = values
+        width = len(feature_values)
+        for group in thread_groups(columns, self._thread_aware):
+            flat = rows[group].ravel().tolist()
+            for end in range(self._ngram_length, len(group) + 1):
+                results[group[end - 1]] = tuple(flat[(end - self._ngram_length) * width:end * width])
+        return results
+
     def _concat(source_value, target_vector):
         """
         the source_value (could be a Iterable, str or other) is concated to target_vector (array)
@@ -88,6 +119,13 @@ class Ngram(BuildingBlock):
             target_vector.append(source_value)
 
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._ngram_buffer.pop(thread_id, None)
+
     def new_recording(self):
         """
         empty buffer so ngrams consist of same recording only
@@ -5,13 +5,20 @@ from dataloader.syscall import Syscall
 class OneHotEncoding(BuildingBlock):
     """
         convert input to One Hot Encoding tuple
+
+        with index_only=True the result is the index of the 1 in the One Hot Encoding instead of the tuple,
+        ngrams of indices are much smaller than ngrams of tuples
+        the consumer expands the indices to One Hot vectors (see algorithms.util.one_hot), e.g. AE, MLP and Som
+        given this building block as one_hot_encoding
     """
 
-    def __init__(self, input: BuildingBlock):
+    def __init__(self, input: BuildingBlock, index_only: bool = False):
         super().__init__()
         self._input_to_int_dict = {}
         self._int_to_ohe_dict = {}
-        self._input_bb = input             
+        self._input_bb = input
+        self.index_only = index_only
+        self._embedding_size = 0
 
     def depends_on(self):
         return [self._input_bb]
@@ -27,15 +34,26 @@ class OneHotEncoding(BuildingBlock):
             if input not in self._input_to_int_dict:
                 self._input_to_int_dict[input] = len(self._input_to_int_dict)
 
+    def merge(self, other):
+        """
+            adds the unknown inputs of other in their order of appearance
+        """
+        for input in other._input_to_int_dict:
+            if input not in self._input_to_int_dict:
+                self._input_to_int_dict[input] = len(self._input_to_int_dict)
+
     def fit(self):
         """
         calculates the ohe for each seen input in training
         """
         length = len(self._input_to_int_dict) + 1
-        for i in range(0, length):
-            ohe_array = [0] * length
-            ohe_array[i] = 1
-            self._int_to_ohe_dict[i] = tuple(ohe_array)
+        self._embedding_size = length
+        # in index mode the tuples are never used
+        if not self.index_only:
+            for i in range(0, length):
+                ohe_array = [0] * length
+                ohe_array[i] = 1
+                self._int_to_ohe_dict[i] = tuple(ohe_array)
         print(f"OHE.size = {self.get_embedding_size()}".rjust(27))        
 
     def _calculate(self, syscall: Syscall):
@@ -49,9 +67,11 @@ class OneHotEncoding(BuildingBlock):
                 input_to_int = self._input_to_int_dict[input]
             except KeyError:
                 input_to_int = len(self._input_to_int_dict)
+            if self.index_only:
+                return input_to_int
             return self._int_to_ohe_dict[input_to_int]
         else:
             return None
     
     def get_embedding_size(self):
-        return len(self._int_to_ohe_dict)
+        return self._embedding_size
@@ -1,6 +1,8 @@
 """
 Building Block for or combination of a list of threshold BBs
 """
+import numpy as np
+
 from dataloader.syscall import Syscall
 
 from algorithms.building_block import BuildingBlock
@@ -37,5 +39,18 @@ class OrDecider(BuildingBlock):
                 final_decision = True
         return final_decision
 
+    def _calculate_batch(self, columns):
+        """
+        True where one of the deciders returns True
+        """
+        final_decisions = np.zeros(len(columns), dtype=bool)
+        for decider in self._dependency_list:
+            decisions = decider.get_results_batch(columns)
+            if decisions.dtype == bool:
+                final_decisions |= decisions
+            else:
+                final_decisions |= np.array([decision is True for decision in decisions], dtype=bool)
+        return final_decisions
+
     def is_decider(self):
         return True
@@ -6,6 +6,7 @@ from treelib import Tree
 from treelib.exceptions import DuplicatedNodeIdError
 
 from algorithms.building_block import BuildingBlock
+from algorithms.features.impl.filedescriptor import FD_PARAMS
 from dataloader.syscall import Syscall
 
 
@@ -43,7 +44,7 @@ class PathEvilness(BuildingBlock):
         takes one systemcall and builds the training buffer
         """
         if not self._tree_was_loaded:
-            fd = self._get_valid_fd_or_none(syscall.params())
+            fd = self._get_valid_fd_or_none(FD_PARAMS.extract(syscall.params_string()))
 
             if fd is not None:
                 path_list = self._fd_preprocessing(fd)
@@ -106,7 +107,7 @@ class PathEvilness(BuildingBlock):
         """
         evilness = 0
 
-        fd = self._get_valid_fd_or_none(syscall.params())
+        fd = self._get_valid_fd_or_none(FD_PARAMS.extract(syscall.params_string()))
         if fd is not None:
             path_list = self._fd_preprocessing(fd)
             if path_list not in self._cache and path_list is not None:
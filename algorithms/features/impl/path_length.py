@@ -2,6 +2,7 @@ import math
 import typing
 
 from algorithms.building_block import BuildingBlock
+from algorithms.features.impl.filedescriptor import FD_PARAMS
 from dataloader.syscall import Syscall
 
 
@@ -34,7 +35,7 @@ class PathLength(BuildingBlock):
         return None
 
     def train_on(self, syscall: Syscall):
-        fd = self._get_valid_fd_or_none(syscall.params())
+        fd = self._get_valid_fd_or_none(FD_PARAMS.extract(syscall.params_string()))
         if fd is not None:
             current_len = len(fd)
             if current_len < self._min:
@@ -45,7 +46,7 @@ class PathLength(BuildingBlock):
     def _calculate(self, syscall: Syscall):
         """
         """
-        fd = self._get_valid_fd_or_none(syscall.params())
+        fd = self._get_valid_fd_or_none(FD_PARAMS.extract(syscall.params_string()))
         if fd is not None:
             return (len(fd) - self._min) / (self._max - self._min)
         else:
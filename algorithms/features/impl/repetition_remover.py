@@ -63,6 +63,13 @@ class RepetitionRemover(BuildingBlock):
         else:
             return None
                 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._last_inputs.pop(thread_id, None)
+
     def new_recording(self):
         """
         emptys buffers
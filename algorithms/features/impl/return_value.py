@@ -1,3 +1,5 @@
+import numpy as np
+
 from algorithms.building_block import BuildingBlock
 from dataloader.syscall import Syscall
 
@@ -34,6 +36,14 @@ class ReturnValue(BuildingBlock):
                 except ValueError as e:
                     pass
 
+    def merge(self, other):
+        """
+        keep the max value of each syscall
+        """
+        for syscall_name, max_value in other._max.items():
+            if syscall_name not in self._max or max_value >= self._max[syscall_name]:
+                self._max[syscall_name] = max_value
+
     def _calculate(self, syscall: Syscall):
         """
         calculate return value type and normalize with max value of training phase
@@ -41,9 +51,26 @@ class ReturnValue(BuildingBlock):
             * syscall never had return value in training
             * return value was not an integer value
         """
+        return self._return_value(syscall.name(), syscall.param('res'))
+
+    def _calculate_batch(self, columns):
+        """
+        return values of all syscalls, each distinct pair of syscall name and return value is calculated once
+        """
+        return_values = {}
+        results = np.empty(len(columns), dtype=np.float64)
+        for i, key in enumerate(zip(columns.names.tolist(), columns.param('res').tolist())):
+            if key not in return_values:
+                return_values[key] = self._return_value(*key)
+            results[i] = return_values[key]
+        return results
+
+    def _return_value(self, syscall_name: str, return_value_string: str):
+        """
+        normalized return value of one syscall given by its name and its res parameter
+        """
         return_type = None
         return_value = 0
-        return_value_string = syscall.param('res')
         if return_value_string is not None:
             try:
                 current_bytes = int(return_value_string)
@@ -53,9 +80,9 @@ class ReturnValue(BuildingBlock):
             try:
                 if return_type != 'not_int':
                     if self._min_max_scaling:
-                        if syscall.name() in self._max:
-                            if self._max[syscall.name()] != 0:
-                                return_value = current_bytes/self._max[syscall.name()]
+                        if syscall_name in self._max:
+                            if self._max[syscall_name] != 0:
+                                return_value = current_bytes/self._max[syscall_name]
                             else:
                                 return_value = 0
                         else:
@@ -66,6 +66,14 @@ class StreamMinimum(BuildingBlock):
         else:
             return None
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._window_buffer.pop(thread_id, None)
+            self._minimum_values.pop(thread_id, None)
+
     def new_recording(self):
         """
         empty buffer so ngrams consist of same recording only
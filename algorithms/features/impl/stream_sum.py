@@ -3,8 +3,11 @@ Building Block for stream sum of specified window
 """
 from collections import deque
 
+import numpy as np
+
 from dataloader.syscall import Syscall
 from algorithms.building_block import BuildingBlock
+from algorithms.util.batch_results import thread_groups, to_float_array
 
 
 class StreamSum(BuildingBlock):
@@ -65,6 +68,31 @@ class StreamSum(BuildingBlock):
                 return self._sum_values[thread_id]
         return None
 
+    def _calculate_batch(self, columns):
+        """
+        sums over the windows of all (thread wise) feature values by cumulative sums
+        nan where the feature is None or the window is not full yet (if wait_until_full)
+        """
+        values = to_float_array(self._feature.get_results_batch(columns))
+        results = np.full(len(columns), np.nan)
+        for group in thread_groups(columns, self._thread_aware):
+            group = group[~np.isnan(values[group])]
+            cumulative_sums = np.cumsum(values[group])
+            window_sums = cumulative_sums.copy()
+            window_sums[self._window_length:] -= cumulative_sums[:-self._window_length]
+            if self._wait_until_window_full:
+                window_sums[:self._window_length - 1] = np.nan
+            results[group] = window_sums
+        return results
+
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._window_buffer.pop(thread_id, None)
+            self._sum_values.pop(thread_id, None)
+
     def new_recording(self):
         """
         empty buffer so ngrams consist of same recording only
@@ -15,5 +15,11 @@ class SyscallName(BuildingBlock):
         """
         return syscall.name()
 
+    def _calculate_batch(self, columns):
+        """
+        names of all syscalls
+        """
+        return columns.names
+
     def depends_on(self):
         return []
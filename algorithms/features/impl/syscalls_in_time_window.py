@@ -1,21 +1,28 @@
+from collections import deque
+
 from algorithms.building_block import BuildingBlock
 from dataloader.syscall import Syscall
 
 
 class SyscallsInTimeWindow(BuildingBlock):
 
-    def __init__(self, window_length_in_s: int):
+    def __init__(self, window_length_in_s: int, thread_aware: bool = True):
         """
             Featurecalculateor that calculates number of syscalls in time window
             before current syscall, acts thread aware
 
+            only the timestamps of the syscalls in the window are buffered (one deque per thread),
+            timestamps leaving the window are removed from the front
+
             args:
                 window_length_in_s = window length in seconds
+                thread_aware = one window per thread or one window over all syscalls
         """
         super().__init__()
         self.window_length = window_length_in_s * 1e9
+        self._thread_aware = thread_aware
         self._count_in_window = 0
-        self._syscall_buffer = {}
+        self._timestamp_buffer = {}
         self._training_max = 0
 
         self._dependency_list = []
@@ -23,42 +30,43 @@ class SyscallsInTimeWindow(BuildingBlock):
     def depends_on(self):
         return self._dependency_list
 
+    def _window(self, syscall: Syscall) -> deque:
+        """
+            the timestamp buffer of the thread of syscall (or the global one)
+        """
+        key = syscall.thread_id() if self._thread_aware else 0
+        buffer = self._timestamp_buffer.get(key)
+        if buffer is None:
+            buffer = self._timestamp_buffer[key] = deque()
+        return buffer
+
+    def _evict(self, buffer: deque, current_timestamp):
+        """
+            removes timestamps from the front where time difference > time window
+        """
+        while current_timestamp - buffer[0] > self.window_length:
+            buffer.popleft()
+
     def train_on(self, syscall: Syscall):
         """
             trains the calculateor by finding the biggest count of syscalls
             in time window needed for normalization of feature
         """
         current_timestamp = syscall.timestamp_unix_in_ns()
-        thread_id = syscall.thread_id()
-        if thread_id not in self._syscall_buffer.keys():
-            self._syscall_buffer[thread_id] = []
-        self._syscall_buffer[thread_id].append(syscall)
-
-        last_index = 0
-        i = 0
-        while i < len(self._syscall_buffer[thread_id]):
-            buffered_syscall = self._syscall_buffer[thread_id][i]
-            i += 1
-            difference = current_timestamp - buffered_syscall.timestamp_unix_in_ns()
-
-            # saving the index of the first element that is in time window
-            if difference <= self.window_length:
-                last_index = i
-                break
-
-        # clear first n elements from buffer where time difference > time window
-        self._syscall_buffer[thread_id] = self._syscall_buffer[thread_id][last_index - 1:]
+        buffer = self._window(syscall)
+        buffer.append(current_timestamp)
+        self._evict(buffer, current_timestamp)
 
         # window count is the length of the left buffer
-        syscalls_in_window = len(self._syscall_buffer[thread_id])
+        syscalls_in_window = len(buffer)
         if syscalls_in_window > self._training_max:
             self._training_max = syscalls_in_window
 
     def fit(self):
         """
-            clears the syscall buffer
+            clears the timestamp buffer
         """
-        self._syscall_buffer = {}
+        self._timestamp_buffer = {}
 
     def _calculate(self, syscall: Syscall):
         """
@@ -67,32 +75,14 @@ class SyscallsInTimeWindow(BuildingBlock):
             or None if the window is not "full"
         """
         current_timestamp = syscall.timestamp_unix_in_ns()
-        thread_id = syscall.thread_id()
+        buffer = self._window(syscall)
+        buffer.append(current_timestamp)
 
-        if thread_id not in self._syscall_buffer.keys():
-            self._syscall_buffer[thread_id] = []
-
-        self._syscall_buffer[thread_id].append(syscall)
-        last_index = 0
-
-        if current_timestamp - self._syscall_buffer[thread_id][0].timestamp_unix_in_ns() \
-                >= self.window_length:
-            i = 0
-            while i < len(self._syscall_buffer[thread_id]):
-                buffered_syscall = self._syscall_buffer[thread_id][i]
-                i += 1
-                difference = current_timestamp - buffered_syscall.timestamp_unix_in_ns()
-
-                # saving the index of the first element that is in time window
-                if difference <= self.window_length:
-                    last_index = i
-                    break
-
-            # clear first n elements from buffer where time difference > time window
-            self._syscall_buffer[thread_id] = self._syscall_buffer[thread_id][last_index - 1:]
+        if current_timestamp - buffer[0] >= self.window_length:
+            self._evict(buffer, current_timestamp)
 
             # window count is the length of the left buffer
-            syscalls_in_window = len(self._syscall_buffer[thread_id])
+            syscalls_in_window = len(buffer)
 
             # normalizing the return value with maximum count from training data
             normalized_count = syscalls_in_window / self._training_max
@@ -102,8 +92,16 @@ class SyscallsInTimeWindow(BuildingBlock):
             # return 0
             return None
 
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        if self._thread_aware:
+            for thread_id in thread_ids:
+                self._timestamp_buffer.pop(thread_id, None)
+
     def new_recording(self):
         """
-            clears syscall buffer
+            clears timestamp buffer
         """
-        self._syscall_buffer = {}
+        self._timestamp_buffer = {}
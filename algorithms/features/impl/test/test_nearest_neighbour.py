@@ -132,3 +132,41 @@ def test_nearest_neighbour():
     assert nn.get_result(syscall_20) is True    # 2         6.557438524302
     assert nn.get_result(syscall_21) is True    # 4         4.58257569495584
     assert nn.get_result(syscall_22) is True    # 4         3.741657386773941
+
+
+def test_nearest_neighbour_brute_force():
+    # the kd-tree gives the same decisions as comparing with all validation datapoints
+    import math
+    import random
+    from algorithms.test.helper import build_syscall_line
+
+    rng = random.Random(0)
+    names = ['open', 'read', 'write', 'close', 'poll', 'mmap', 'stat', 'fstat', 'lseek', 'munmap']
+    syscalls = [Syscall2021('path', build_syscall_line(1000 + i, rng.choice(names)), line_id=i) for i in range(3000)]
+    int_embedding = IntEmbedding(SyscallName())
+    ngram = Ngram([int_embedding], thread_aware=False, ngram_length=5)
+    nn = NearestNeighbour(ngram)
+    for syscall in syscalls[:1500]:
+        int_embedding.train_on(syscall)
+    # more datapoints than one leaf of the kd-tree, so tied datapoints are found in different leaves
+    for syscall in syscalls[:1500]:
+        nn.val_on(syscall)
+    nn.fit()
+
+    points = nn._datapoints
+    nn_distances = [min(math.dist(a, b) for b in points if a != b) for a in points]
+    for syscall in syscalls[1500:]:
+        vector = ngram.get_result(syscall)
+        result = nn.get_result(syscall)
+        if vector is None:
+            assert result is None
+            continue
+        # the previous linear scan: the first of equally near datapoints is the nearest neighbour
+        min_distance = 10 ** 9
+        min_index = 0
+        for point_index, point in enumerate(points):
+            distance = math.dist(vector, point)
+            if distance < min_distance:
+                min_distance = distance
+                min_index = point_index
+        assert result == (min_distance > nn_distances[min_index])
@@ -1,6 +1,8 @@
+from algorithms.features.impl.ngram import Ngram
 from algorithms.features.impl.one_hot_encoding import OneHotEncoding
 from algorithms.features.impl.syscall_name import SyscallName
 from algorithms.features.impl.test.helper import build_fake_syscall_2019
+from algorithms.util.one_hot import one_hot_array, one_hot_tensor
 from dataloader.syscall_2019 import Syscall2019
 
 
@@ -27,3 +29,27 @@ def test_OneHotEncoding():
     assert ohe.get_result(syscall) == (0,0,0,1,0)
     syscall = build_fake_syscall_2019(name="unknown")
     assert ohe.get_result(syscall) == (0,0,0,0,1)
+
+
+def test_OneHotEncoding_index_only():
+    training_input = ["a", "b", "c", "d"]
+    ohe = OneHotEncoding(SyscallName())
+    ohe_index = OneHotEncoding(SyscallName(), index_only=True)
+    for element in training_input:
+        syscall = build_fake_syscall_2019(name=element)
+        ohe.train_on(syscall)
+        ohe_index.train_on(syscall)
+    ohe.fit()
+    ohe_index.fit()
+    assert ohe_index.get_embedding_size() == ohe.get_embedding_size()
+
+    ngram = Ngram([ohe], False, 3)
+    ngram_index = Ngram([ohe_index], False, 3)
+    for element in ["b", "unknown", "a", "d"]:
+        syscall = build_fake_syscall_2019(name=element)
+        dense = ngram.get_result(syscall)
+        indices = ngram_index.get_result(syscall)
+    assert indices == (4, 0, 3)
+    # the expanded indices are the ngram of the dense tuples
+    assert one_hot_tensor(indices, ohe_index.get_embedding_size()).tolist() == list(dense)
+    assert one_hot_array([indices], ohe_index.get_embedding_size()).tolist() == [list(dense)]
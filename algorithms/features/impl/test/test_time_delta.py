@@ -1,4 +1,5 @@
 from algorithms.features.impl.time_delta import TimeDelta
+from algorithms.test.helper import InMemoryRecording, build_syscall_line
 
 from dataloader.syscall_2021 import Syscall2021
 from dataloader.syscall_2019 import Syscall2019
@@ -110,3 +111,26 @@ def test_time_delta():
     assert td._calculate(syscall_17) == 0
     assert td._calculate(syscall_18) == 2/td._max_time_delta
     assert td._calculate(syscall_19) == 3/td._max_time_delta
+
+
+def test_time_delta_recordings():
+    # thread 7 is in both recordings, the first syscall of the second recording has no delta
+    recordings = [InMemoryRecording('first', [build_syscall_line(100 + 2 * i, 'read', thread_id=7 + i % 2)
+                                              for i in range(5)]),
+                  InMemoryRecording('second', [build_syscall_line(500 + 3 * i, 'read', thread_id=7 + i // 2)
+                                               for i in range(5)])]
+    for thread_aware in [True, False]:
+        td = TimeDelta(thread_aware=thread_aware)
+        for recording in recordings:
+            for syscall in recording.syscalls():
+                td.train_on(syscall)
+            td.new_recording()
+        td.fit()
+        # no delta between the recordings
+        assert td._max_time_delta == (4 if thread_aware else 3)
+
+        for recording in recordings:
+            results = [td.get_result(syscall) for syscall in recording.syscalls()]
+            assert results == td.get_results_batch(recording.columns()).tolist()
+            assert results[0] == 0
+            td.new_recording()
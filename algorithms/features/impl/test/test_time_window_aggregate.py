@@ -0,0 +1,54 @@
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.features.impl.threadID import ThreadID
+from algorithms.features.impl.time_window_count import TimeWindowCount
+from algorithms.features.impl.time_window_distinct_count import TimeWindowDistinctCount
+from algorithms.features.impl.time_window_mean import TimeWindowMean
+from algorithms.features.impl.time_window_sum import TimeWindowSum
+from dataloader.syscall_2021 import Syscall2021
+
+SECOND = 10 ** 9
+
+
+def build_syscalls(events: list) -> list:
+    """
+    events: list of (time in s, thread id, syscall name)
+    """
+    return [Syscall2021('path', f"{int(time * SECOND)} 0 1 apache2 {thread_id} {name} < res=0", line_id=line_id)
+            for line_id, (time, thread_id, name) in enumerate(events, start=1)]
+
+
+EVENTS = [(0.0, 1, 'read'),
+          (0.5, 1, 'read'),
+          (1.0, 2, 'open'),
+          (1.5, 1, 'write'),
+          (2.0, 1, 'read'),
+          (2.4, 2, 'close'),
+          (5.0, 1, 'poll')]
+
+
+def test_time_window_aggregates():
+    syscalls = build_syscalls(EVENTS)
+
+    count = TimeWindowCount(window_length_in_s=1.5)
+    assert [count.get_result(syscall) for syscall in syscalls] == [1, 2, 1, 3, 3, 2, 1]
+
+    count = TimeWindowCount(window_length_in_s=1.5, thread_aware=False)
+    assert [count.get_result(syscall) for syscall in syscalls] == [1, 2, 3, 4, 4, 4, 1]
+
+    count = TimeWindowCount(window_length_in_s=1.5, thread_aware=False, max_size=2)
+    assert [count.get_result(syscall) for syscall in syscalls] == [1, 2, 2, 2, 2, 2, 1]
+
+    window_sum = TimeWindowSum(ThreadID(), 1.5, thread_aware=False)
+    assert [window_sum.get_result(syscall) for syscall in syscalls] == [1, 2, 4, 5, 5, 6, 1]
+
+    mean = TimeWindowMean(ThreadID(), 1.5, thread_aware=False)
+    assert [mean.get_result(syscall) for syscall in syscalls] == [1, 1, 4 / 3, 5 / 4, 5 / 4, 6 / 4, 1]
+
+    distinct = TimeWindowDistinctCount(SyscallName(), 1.5)
+    assert [distinct.get_result(syscall) for syscall in syscalls] == [1, 1, 1, 2, 2, 2, 1]
+
+    # windows of ended threads and recordings are dropped
+    distinct.drop_threads({1})
+    assert list(distinct._windows) == [2]
+    distinct.new_recording()
+    assert distinct._windows == {}
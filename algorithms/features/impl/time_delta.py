@@ -1,4 +1,7 @@
+import numpy as np
+
 from algorithms.building_block import BuildingBlock
+from algorithms.util.batch_results import thread_groups
 from dataloader.syscall import Syscall
 
 
@@ -45,6 +48,16 @@ class TimeDelta(BuildingBlock):
         normalized_delta = delta / self._max_time_delta
         return normalized_delta
 
+    def _calculate_batch(self, columns):
+        """
+        time deltas of all syscalls (thread wise), normalized with the max delta of training
+        the first syscall of each thread in the recording has a delta of 0
+        """
+        deltas = np.zeros(len(columns), dtype=np.int64)
+        for group in thread_groups(columns, self._thread_aware):
+            deltas[group[1:]] = np.diff(columns.timestamps[group])
+        return deltas / self._max_time_delta
+
     def _calc_delta(self, current_time: int, thread_id: int):
         if thread_id in self._last_time:
             delta = current_time - self._last_time[thread_id]
@@ -53,3 +66,16 @@ class TimeDelta(BuildingBlock):
             delta = 0
             self._last_time[thread_id] = current_time
         return delta
+
+    def new_recording(self):
+        """
+        empty buffer so the first syscall of each thread in a recording has a delta of 0 (as in the batches)
+        """
+        self._last_time = {}
+
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the buffers of the given (ended) threads
+        """
+        for thread_id in thread_ids:
+            self._last_time.pop(thread_id, None)
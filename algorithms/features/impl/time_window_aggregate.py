@@ -0,0 +1,113 @@
+"""
+Base class of the building blocks aggregating a feature over a time window
+"""
+from collections import deque
+
+from dataloader.syscall import Syscall
+from algorithms.building_block import BuildingBlock
+
+
+class TimeWindow:
+    """
+    timestamps and values of one (thread) window together with the running aggregate
+    """
+    __slots__ = ['timestamps', 'values', 'total', 'counts']
+
+    def __init__(self, keep_values: bool):
+        self.timestamps = deque()
+        self.values = deque() if keep_values else None
+        self.total = 0
+        self.counts = {}
+
+
+class TimeWindowAggregate(BuildingBlock):
+    """
+    aggregates the values of a feature over all syscalls within the last window_length_in_s seconds
+    (timestamp >= current timestamp - window length), syscalls with feature value None are skipped
+
+    each window keeps a deque of timestamps (and values), old entries are evicted from the front,
+    so each syscall is added and removed once (amortised O(1) per syscall)
+
+    Args:
+        feature: the aggregated feature
+        window_length_in_s: length of the time window in seconds
+        thread_aware: one window per thread or one window over all syscalls
+        max_size: bounds the memory of each window, the oldest entries are evicted if more syscalls are in the window
+    """
+
+    # subclasses that do not need the values in the window (e.g. count) only keep the timestamps
+    keep_values = True
+
+    def __init__(self, feature: BuildingBlock, window_length_in_s: float, thread_aware: bool = True,
+                 max_size: int = None):
+        super().__init__()
+        self._feature = feature
+        self._window_length = int(window_length_in_s * 10 ** 9)
+        self._thread_aware = thread_aware
+        self._max_size = max_size
+        self._windows = {}
+
+        self._dependency_list = []
+        if feature is not None:
+            self._dependency_list.append(feature)
+
+    def depends_on(self):
+        return self._dependency_list
+
+    def _calculate(self, syscall: Syscall):
+        """
+        adds the feature value of syscall to its window and returns the aggregate over the window
+        None if the feature value is None
+        """
+        value = self._feature.get_result(syscall) if self._feature is not None else 1
+        if value is None:
+            return None
+        key = syscall.thread_id() if self._thread_aware else 0
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = TimeWindow(self.keep_values)
+
+        timestamp = syscall.timestamp_unix_in_ns()
+        timestamps = window.timestamps
+        values = window.values
+        timestamps.append(timestamp)
+        if values is not None:
+            values.append(value)
+        self._add(window, value)
+
+        oldest_timestamp = timestamp - self._window_length
+        max_size = self._max_size
+        while timestamps[0] < oldest_timestamp or (max_size is not None and len(timestamps) > max_size):
+            timestamps.popleft()
+            self._remove(window, values.popleft() if values is not None else None)
+        return self._result(window)
+
+    def _add(self, window: TimeWindow, value):
+        """
+        updates the aggregate of the window with a new value
+        """
+
+    def _remove(self, window: TimeWindow, value):
+        """
+        updates the aggregate of the window with an evicted value (None if the values are not kept)
+        """
+
+    def _result(self, window: TimeWindow):
+        """
+        the aggregate of the window
+        """
+        raise NotImplementedError("each time window aggregate has to implement _result")
+
+    def drop_threads(self, thread_ids: set):
+        """
+        removes the windows of the given (ended) threads
+        """
+        if self._thread_aware:
+            for thread_id in thread_ids:
+                self._windows.pop(thread_id, None)
+
+    def new_recording(self):
+        """
+        empties the windows
+        """
+        self._windows = {}
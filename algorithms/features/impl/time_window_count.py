@@ -0,0 +1,21 @@
+"""
+Building Block counting the syscalls within a time window
+"""
+from algorithms.building_block import BuildingBlock
+from algorithms.features.impl.time_window_aggregate import TimeWindow, TimeWindowAggregate
+
+
+class TimeWindowCount(TimeWindowAggregate):
+    """
+    number of syscalls within the last window_length_in_s seconds (including the current one)
+    if feature is given only syscalls with a feature value (not None) are counted
+    see TimeWindowAggregate for the arguments
+    """
+    keep_values = False
+
+    def __init__(self, feature: BuildingBlock = None, window_length_in_s: float = 1, thread_aware: bool = True,
+                 max_size: int = None):
+        super().__init__(feature, window_length_in_s, thread_aware, max_size)
+
+    def _result(self, window: TimeWindow):
+        return len(window.timestamps)
@@ -0,0 +1,24 @@
+"""
+Building Block counting the distinct values of a feature within a time window
+"""
+from algorithms.features.impl.time_window_aggregate import TimeWindow, TimeWindowAggregate
+
+
+class TimeWindowDistinctCount(TimeWindowAggregate):
+    """
+    number of distinct (hashable) feature values of all syscalls within the last window_length_in_s seconds
+    see TimeWindowAggregate for the arguments
+    """
+
+    def _add(self, window: TimeWindow, value):
+        window.counts[value] = window.counts.get(value, 0) + 1
+
+    def _remove(self, window: TimeWindow, value):
+        count = window.counts[value] - 1
+        if count == 0:
+            del window.counts[value]
+        else:
+            window.counts[value] = count
+
+    def _result(self, window: TimeWindow):
+        return len(window.counts)
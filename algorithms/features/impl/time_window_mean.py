@@ -0,0 +1,15 @@
+"""
+Building Block for the mean of a feature within a time window
+"""
+from algorithms.features.impl.time_window_sum import TimeWindowSum
+from algorithms.features.impl.time_window_aggregate import TimeWindow
+
+
+class TimeWindowMean(TimeWindowSum):
+    """
+    mean of the (numeric) feature values of all syscalls within the last window_length_in_s seconds
+    see TimeWindowAggregate for the arguments
+    """
+
+    def _result(self, window: TimeWindow):
+        return window.total / len(window.timestamps)
@@ -0,0 +1,20 @@
+"""
+Building Block for the sum of a feature within a time window
+"""
+from algorithms.features.impl.time_window_aggregate import TimeWindow, TimeWindowAggregate
+
+
+class TimeWindowSum(TimeWindowAggregate):
+    """
+    sum of the (numeric) feature values of all syscalls within the last window_length_in_s seconds
+    see TimeWindowAggregate for the arguments
+    """
+
+    def _add(self, window: TimeWindow, value):
+        window.total += value
+
+    def _remove(self, window: TimeWindow, value):
+        window.total -= value
+
+    def _result(self, window: TimeWindow):
+        return window.total
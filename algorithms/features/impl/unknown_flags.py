@@ -13,21 +13,33 @@ class UnknownFlags(BuildingBlock):
         """
             builds dictionary with all known flags seen in training for each syscall
         """
-        if 'flags' in syscall.params().keys():
+        flags = syscall.param('flags')
+        if flags is not None:
             if syscall.name() in self._flag_dict:
-                self._flag_dict[syscall.name()].append(syscall.param('flags'))
+                self._flag_dict[syscall.name()].append(flags)
             else:
                 self._flag_dict[syscall.name()] = []
-                self._flag_dict[syscall.name()].append(syscall.param('flags'))
+                self._flag_dict[syscall.name()].append(flags)
+
+    def merge(self, other):
+        """
+            appends the flags seen by other
+        """
+        for syscall_name, flags in other._flag_dict.items():
+            if syscall_name in self._flag_dict:
+                self._flag_dict[syscall_name].extend(flags)
+            else:
+                self._flag_dict[syscall_name] = list(flags)
 
     def _calculate(self, syscall: Syscall):
         """
             lookup of syscall flag in know flags
             if unknown -> returns 1 else 0
         """
-        if 'flags' in syscall.params().keys():
+        flags = syscall.param('flags')
+        if flags is not None:
             try:
-                if syscall.param('flags') in self._flag_dict[syscall.name()]:
+                if flags in self._flag_dict[syscall.name()]:
                     return 0
                 else:
                     return 1
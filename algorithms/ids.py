@@ -1,21 +1,53 @@
 """
     IDS class definition
 """
-from copy import deepcopy
-from functools import reduce
-from typing import Type
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+from typing import Generator, Iterable, Type
 
+import numpy as np
 from matplotlib import pyplot as plt
 from tqdm import tqdm
-from tqdm.contrib.concurrent import process_map
 
+from algorithms.alarm import Alarm
+from algorithms.alarms import Alarms
 from algorithms.building_block import BuildingBlock
 from algorithms.data_preprocessor import DataPreprocessor
 from algorithms.performance_measurement import Performance
+from algorithms.profiler import Profiler
+from algorithms.score_archive import ScoreArchive
 from algorithms.score_plot import ScorePlot
+from algorithms.util.batch_results import to_float_array
+from algorithms.util.growable_array import GrowableArray
 from algorithms.util.dependency_graph_encoding import dependency_graph_to_config_tree
 from dataloader.base_data_loader import BaseDataLoader
 from dataloader.base_recording import BaseRecording
+from dataloader.compact_syscall import CompactSyscall2021
+from dataloader.direction import Direction
+from dataloader.prefetch import prefetch
+
+# ids of a detection worker process, set once by _init_detection_worker
+_worker_ids = None
+
+
+def _init_detection_worker(ids):
+    """
+        initializer of the detection worker processes
+        stores the trained ids so it is not sent with every recording
+    """
+    global _worker_ids
+    _worker_ids = ids
+
+
+def _detect_in_worker(recording: BaseRecording, batch: bool = False) -> Performance:
+    """
+        calculates the performance of the worker ids on a single recording
+    """
+    performance = _worker_ids.detect_on_single_recording(recording, batch)
+    performance.drop_cfp_indices()
+    return performance
 
 
 class IDS:
@@ -23,17 +55,37 @@ class IDS:
         Intrusion Detection System Class
         Combines data loading, data processing and performance analysis
         Final BuildingBlock needs to be a decider which returns 0 if no anomaly has been detected.
+        If model_path is given, the trained building blocks are loaded from this file
+        (if config and data are the same) instead of training them, otherwise they are saved there.
+        If profile is set, all calls of the building blocks are profiled (see print_profile).
+        With prefetch_depth > 0 the next recordings are decompressed and parsed in a background thread
+        while the building blocks run on the current one (see dataloader.prefetch),
+        prefetch_max_bytes limits the raw size of the recordings loaded ahead.
     """
     def __init__(self,
                  data_loader: BaseDataLoader,
                  resulting_building_block: BuildingBlock,
                  plot_switch: bool,
-                 create_alarms: bool = False):
+                 create_alarms: bool = False,
+                 training_workers: int = 1,
+                 model_path: str = None,
+                 profile: bool = False,
+                 prefetch_depth: int = 0,
+                 prefetch_max_bytes: int = None):
         self._data_loader = data_loader
+        self._prefetch_depth = prefetch_depth
+        self._prefetch_max_bytes = prefetch_max_bytes
         self._final_bb = resulting_building_block
         if not self._final_bb.is_decider():
             raise ValueError('Resulting BuildingBlock is not a decider!')
-        self._data_preprocessor = DataPreprocessor(self._data_loader, resulting_building_block)
+        self.profiler = Profiler() if profile else None
+        self._data_preprocessor = DataPreprocessor(self._data_loader,
+                                                   resulting_building_block,
+                                                   workers=training_workers,
+                                                   model_path=model_path,
+                                                   profiler=self.profiler,
+                                                   prefetch_depth=prefetch_depth,
+                                                   prefetch_max_bytes=prefetch_max_bytes)
         self.threshold = 0.0
         self._alarm = False
         self._anomaly_scores_exploits = []
@@ -62,6 +114,39 @@ class IDS:
             self._data_preprocessor.get_building_block_manager().get_dependency_graph()
         )
 
+    def save(self, path: str):
+        """
+            saves the trained building blocks to path
+        """
+        self._data_preprocessor.save(path)
+
+    def load(self, path: str) -> bool:
+        """
+            loads trained building blocks from path
+            only works if the stored model was trained with the same config on the same data
+
+            Returns:
+                bool: True if the model was loaded
+        """
+        return self._data_preprocessor.load(path)
+
+    def print_profile(self, path: str = None):
+        """
+            prints the profiling results of all building blocks (training and detection so far)
+            if path is given, a json report with the annotated dependency graph is written there
+        """
+        if self.profiler is None:
+            raise ValueError('profiling is not enabled, create the IDS with profile=True')
+        self.profiler.print_table()
+        if path is not None:
+            self.profiler.save_report(path, self._data_preprocessor.get_building_block_manager())
+
+    def _recordings(self, recordings: list):
+        """
+        the given recordings, loaded ahead if prefetching is enabled
+        """
+        return prefetch(recordings, self._prefetch_depth, self._prefetch_max_bytes)
+
     def determine_threshold(self):
         """
         decision engine calculates anomaly scores using validation data,
@@ -71,7 +156,7 @@ class IDS:
         max_score = 0.0
         data = self._data_loader.validation_data()
         description = 'Threshold calculation'.rjust(27)
-        for recording in tqdm(data, description, unit=" recording"):
+        for recording in tqdm(self._recordings(data), description, total=len(data), unit=" recording"):
             for syscall in recording.syscalls():
                 anomaly_score = self._final_bb.get_result(syscall)
                 if anomaly_score is not None:
@@ -94,7 +179,7 @@ class IDS:
         data = self._data_loader.validation_data()
         description = 'Threshold calculation'.rjust(27)
         scores = []
-        for recording in tqdm(data, description, unit=" recording"):
+        for recording in tqdm(self._recordings(data), description, total=len(data), unit=" recording"):
             for syscall in recording.syscalls():
                 anomaly_score = self._final_bb.get_result(syscall)
                 if anomaly_score is not None:
@@ -111,22 +196,36 @@ class IDS:
         plt.plot(scores)
         plt.show()
 
-    def detect(self) -> Performance:
+    def _decisions(self, recording: Type[BaseRecording], batch: bool):
+        """
+        yields each syscall of the recording together with the result of the final building block
+        with batch=True the whole recording is calculated at once by get_results_batch
+        """
+        if batch:
+            columns = recording.columns()
+            yield from zip(columns.syscalls(), self._final_bb.get_results_batch(columns))
+        else:
+            for syscall in recording.syscalls():
+                yield syscall, self._final_bb.get_result(syscall)
+
+    def detect(self, batch: bool = False) -> Performance:
         """
         detecting performance values using the test data,
         calling performance object for measurement and
         plot object if plot_switch is True
+
+        Args:
+            batch: calculate each recording at once with the batch implementations of the building blocks
         """
         data = self._data_loader.test_data()
         description = 'anomaly detection'.rjust(27)
 
-        for recording in tqdm(data, description, unit=" recording"):
+        for recording in tqdm(self._recordings(data), description, total=len(data), unit=" recording"):
             self.performance.new_recording(recording)
             if self.plot is not None:
                 self.plot.new_recording(recording)
 
-            for syscall in recording.syscalls():
-                is_anomaly = self._final_bb.get_result(syscall)
+            for syscall, is_anomaly in self._decisions(recording, batch):
                 self.performance.analyze_syscall(syscall, is_anomaly)
                 if self.plot is not None:
                     self.plot.add_to_plot_data(anomaly_score,
@@ -140,13 +239,63 @@ class IDS:
                 self.performance.alarms.end_alarm()
         return self.performance
 
-    def detect_on_single_recording(self, recording: Type[BaseRecording]) -> Performance:
+    def score_test_data(self, path: str = None, score_building_block: BuildingBlock = None,
+                        batch: bool = False) -> ScoreArchive:
+        """
+        calculates the anomaly score of each syscall of the test data once
+        the returned ScoreArchive evaluates the performance of any list of thresholds without detecting again
+
+        Args:
+            path: if given the scores are saved to this .npz file
+            score_building_block: bb giving the anomaly scores, defaults to the input of the final decider
+            batch: calculate each recording at once with the batch implementations of the building blocks
+        """
+        if score_building_block is None:
+            if len(self._final_bb.depends_on()) != 1:
+                raise ValueError('final decider has more than one input, the score building block has to be given')
+            score_building_block = self._final_bb.depends_on()[0]
+
+        scores = GrowableArray(np.float64, width=0)
+        recording_offsets = [0]
+        exploit_offsets = []
+        data = self._data_loader.test_data()
+        description = 'anomaly scores'.rjust(27)
+        for recording in tqdm(self._recordings(data), description, total=len(data), unit=" recording"):
+            if batch:
+                columns = recording.columns()
+                recording_scores = to_float_array(score_building_block.get_results_batch(columns))
+                syscall_times = columns.timestamps * (10 ** (-9))
+            else:
+                recording_scores = []
+                syscall_times = []
+                for syscall in recording.syscalls():
+                    anomaly_score = score_building_block.get_result(syscall)
+                    recording_scores.append(np.nan if anomaly_score is None else anomaly_score)
+                    syscall_times.append(syscall.timestamp_unix_in_ns() * (10 ** (-9)))
+            scores.extend(recording_scores)
+
+            if recording.metadata()["exploit"]:
+                exploit_time = recording.metadata()["time"]["exploit"][0]["absolute"]
+                after_exploit = np.asarray(syscall_times, dtype=np.float64) >= exploit_time
+                exploit_offsets.append(int(np.argmax(after_exploit)) if after_exploit.any() else len(after_exploit))
+            else:
+                exploit_offsets.append(-1)
+            recording_offsets.append(len(scores))
+            self._data_preprocessor.new_recording()
+
+        score_archive = ScoreArchive(scores.array(), recording_offsets, exploit_offsets)
+        if path is not None:
+            score_archive.save(path)
+        return score_archive
+
+    def detect_on_single_recording(self, recording: Type[BaseRecording], batch: bool = False) -> Performance:
         """
         detecting performance values using single recording
         create Performance object and return it
 
         Args:
             recording: single recording to calculate performance on
+            batch: calculate the recording at once with the batch implementations of the building blocks
         Returns:
             Performance: performance object
         """
@@ -158,8 +307,7 @@ class IDS:
             performance.set_exploit_time(recording.metadata()["time"]["exploit"][0]["absolute"])
             performance._exploit_count += 1
 
-        for syscall in recording.syscalls():
-            is_anomaly = self._final_bb.get_result(syscall)
+        for syscall, is_anomaly in self._decisions(recording, batch):
             performance.analyze_syscall(syscall, is_anomaly)
 
         self._data_preprocessor.new_recording()
@@ -174,47 +322,133 @@ class IDS:
 
         return performance
 
+    def detect_stream(self,
+                      lines: Iterable[str],
+                      source: str = 'stream',
+                      direction: Direction = None,
+                      thread_timeout: float = 60.0,
+                      max_threads: int = 10000,
+                      eviction_interval: int = 10000,
+                      flyweight: bool = False,
+                      max_alarm_lines: int = 1000,
+                      max_alarm_duration: float = 10.0) -> Generator[Alarm, None, None]:
+        """
+        live detection on a stream of sysdig lines in the LID-DS 2021 format (e.g. a pipe or a followed file)
+        yields each alarm as soon as it is finished (first syscall classified as normal after the alarm)
+        an alarm that stays open is yielded once it spans max_alarm_lines lines or max_alarm_duration seconds,
+        the following anomalous syscalls start a new alarm, so an ongoing attack is reported while it runs
+
+        the stream never starts a new recording, so the buffers of ended threads are dropped instead:
+            - directly after their procexit
+            - if they were not seen for thread_timeout seconds (checked every eviction_interval lines)
+            - oldest threads first if more than max_threads threads are buffered
+
+        Args:
+            lines: iterable of syscall lines
+            source: name of the stream, used as recording path of the alarms
+            direction: only syscalls of this direction are used, defaults to the direction of the data loader
+            flyweight: parse all lines into one reused syscall object,
+                       only usable if no building block keeps syscall objects (e.g. SyscallsInTimeWindow)
+            max_alarm_lines: lines after which an open alarm is yielded, None for no bound
+            max_alarm_duration: seconds after which an open alarm is yielded, None for no bound
+        """
+        if direction is None:
+            direction = getattr(self._data_loader, '_direction', Direction.BOTH)
+        alarms = Alarms()
+        timeout_ns = int(thread_timeout * 10 ** 9)
+        max_alarm_ns = int(max_alarm_duration * 10 ** 9) if max_alarm_duration is not None else None
+        # thread id -> timestamp of its last syscall, ordered from least to most recently seen
+        last_seen = OrderedDict()
+        ended_threads = set()
+        syscall = None
+        for line_id, line in enumerate(lines, start=1):
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            try:
+                if flyweight and syscall is not None:
+                    syscall.refill(line, line_id)
+                else:
+                    syscall = CompactSyscall2021(source, line, line_id=line_id)
+                if direction != Direction.BOTH and syscall.direction() != direction:
+                    continue
+                thread_id = syscall.thread_id()
+                timestamp = syscall.timestamp_unix_in_ns()
+            except (IndexError, ValueError):
+                # incomplete or malformed line
+                continue
+
+            last_seen[thread_id] = timestamp
+            last_seen.move_to_end(thread_id)
+
+            if self._final_bb.get_result(syscall):
+                alarms.add_or_update_alarm(syscall, None)
+                alarm = alarms.current_alarm
+                if (max_alarm_lines is not None and alarm.last_line_id - alarm.first_line_id + 1 >= max_alarm_lines) \
+                        or (max_alarm_ns is not None and alarm.last_timestamp - alarm.first_timestamp >= max_alarm_ns):
+                    alarms.end_alarm()
+            else:
+                alarms.end_alarm()
+            if len(alarms.alarm_list) > 0:
+                yield from alarms.alarm_list
+                alarms.alarm_list = []
+
+            # evict ended threads
+            if syscall.name() == 'procexit':
+                ended_threads.add(thread_id)
+            if line_id % eviction_interval == 0 or len(last_seen) > max_threads:
+                for seen_thread_id, last_timestamp in last_seen.items():
+                    if timestamp - last_timestamp <= timeout_ns and len(last_seen) - len(ended_threads) <= max_threads:
+                        break
+                    ended_threads.add(seen_thread_id)
+            if len(ended_threads) > 0:
+                self._data_preprocessor.drop_threads(ended_threads)
+                for ended_thread_id in ended_threads:
+                    last_seen.pop(ended_thread_id, None)
+                ended_threads = set()
+
+        alarms.end_alarm()
+        yield from alarms.alarm_list
+
     def draw_plot(self, filename=None):
         # plot data if wanted
         if self.plot is not None:
             self.plot.feed_figure()
             self.plot.show_plot(filename)
 
-    def _calculate(recording_ids_tuple: tuple) -> Performance:
-        """
-            create deepcopy of IDS and get performance object for recording of container
-
-            Args:
-            recroding_ids_tuple:
-                ids: IDS with which perfomance is calculated
-                recording: Recording on which performance is calculated
-        """
-        # get ids (as deep copy) and recording
-        ids = deepcopy(recording_ids_tuple[0])
-        recording = recording_ids_tuple[1]
-        # Calculate performance on current recording and return it
-        return ids.detect_on_single_recording(recording)
-
-    def detect_parallel(self) -> Performance:
+    def detect_parallel(self, workers: int = None, batch: bool = False) -> Performance:
         """
             map reduce for every recording
             map:    first calculate performances on each single recording with ids
             reduce: than sum up performances
 
+            the trained ids is given to each worker process only once (inherited by fork if possible),
+            afterwards only the recordings are sent to the workers
+            calls in the worker processes are not profiled
+
+            Args:
+                workers: number of worker processes, defaults to the number of cpus
+                batch: calculate each recording at once with the batch implementations of the building blocks
+
             Returns:
                 Performance: complete performance of all recordings
 
         """
-        # creating list of Tuples with deepcopys of this ids object and recordings
-        ids_and_recordings = [(self, recording) for recording in self._data_loader.test_data()]
+        recordings = list(self._data_loader.test_data())
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = None
 
         # parallel calculation for every recording
-        performance_list = process_map(
-            IDS._calculate,
-            ids_and_recordings,
-            chunksize=20,
-            desc="anomaly detection".rjust(27),
-            unit=" recordings")
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=context,
+                                 initializer=_init_detection_worker,
+                                 initargs=(self,)) as executor:
+            performance_list = list(tqdm(executor.map(partial(_detect_in_worker, batch=batch), recordings),
+                                         "anomaly detection".rjust(27),
+                                         total=len(recordings),
+                                         unit=" recordings"))
 
         # Sum up performances
         if self._create_alarms:
@@ -0,0 +1,95 @@
+"""
+Live detection on sysdig output
+
+trains a STIDE based IDS on a LID-DS scenario and then classifies syscalls read from stdin or a followed file
+
+example:
+    sysdig -p "%evt.rawtime %user.uid %proc.pid %proc.name %thread.tid %syscall.type %evt.dir %evt.args" \\
+        | python -m algorithms.ids_stream_main -d /path/to/LID-DS-2021/CVE-2017-7529
+"""
+import os
+import sys
+import time
+import argparse
+from pprint import pprint
+
+from dataloader.dataloader_factory import dataloader_factory
+from dataloader.direction import Direction
+
+from algorithms.ids import IDS
+
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.ngram import Ngram
+
+from algorithms.decision_engines.stide import Stide
+
+
+def follow(path: str, poll_interval: float = 0.1):
+    """
+    yields the lines of a file and waits for new lines like tail -f
+    incomplete lines are held back until they are finished
+    """
+    with open(path, 'r') as stream:
+        pending = ''
+        while True:
+            line = stream.readline()
+            if not line:
+                time.sleep(poll_interval)
+                continue
+            pending += line
+            if pending.endswith('\n'):
+                yield pending
+                pending = ''
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Live detection on sysdig output')
+
+    parser.add_argument('-d', dest='scenario_path', action='store', type=str, required=True,
+                        help='path of the LID-DS scenario used for training')
+    parser.add_argument('-f', dest='follow_file', action='store', type=str, default=None,
+                        help='follow this file instead of reading stdin')
+    parser.add_argument('-n', dest='ngram_length', action='store', type=int, default=7,
+                        help='ngram length')
+    parser.add_argument('-w', dest='window_length', action='store', type=int, default=1000,
+                        help='window length')
+    parser.add_argument('-t', dest='thread_timeout', action='store', type=float, default=60.0,
+                        help='seconds after which the buffers of an inactive thread are dropped')
+    parser.add_argument('--max-alarm-lines', dest='max_alarm_lines', action='store', type=int, default=1000,
+                        help='lines after which an alarm that is still open is reported')
+    parser.add_argument('--max-alarm-duration', dest='max_alarm_duration', action='store', type=float, default=10.0,
+                        help='seconds after which an alarm that is still open is reported')
+
+    args = parser.parse_args()
+
+    dataloader = dataloader_factory(args.scenario_path, direction=Direction.CLOSE)
+
+    syscall_name = SyscallName()
+    int_embedding = IntEmbedding(syscall_name)
+    ngram = Ngram([int_embedding], True, args.ngram_length)
+    stide = Stide(ngram)
+    stream_sum = StreamSum(stide, False, args.window_length, False)
+    decider = MaxScoreThreshold(stream_sum)
+    ids = IDS(data_loader=dataloader,
+              resulting_building_block=decider,
+              create_alarms=True,
+              plot_switch=False)
+
+    if args.follow_file is not None:
+        lines = follow(args.follow_file)
+        source = os.path.abspath(args.follow_file)
+    else:
+        lines = sys.stdin
+        source = 'stdin'
+
+    print("at detection:", file=sys.stderr)
+    for alarm in ids.detect_stream(lines,
+                                   source=source,
+                                   thread_timeout=args.thread_timeout,
+                                   max_alarm_lines=args.max_alarm_lines,
+                                   max_alarm_duration=args.max_alarm_duration):
+        pprint(vars(alarm))
+        sys.stdout.flush()
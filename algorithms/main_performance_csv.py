@@ -1,12 +1,13 @@
 import csv
-from algorithms.features.stream_ngram_extractor import StreamNgramExtractor
-from algorithms.features.threadID_extractor import ThreadIDExtractor
-from algorithms.features.syscall_to_int import SyscallToInt
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
 from algorithms.decision_engines.stide import Stide
-from algorithms.ids import IDS
-from dataloader.data_loader import DataLoader
-from algorithms.data_preprocessor import DataPreprocessor
-from pprint import pprint
+from algorithms.sweep import Sweep
+from dataloader.dataloader_factory import dataloader_factory
+from dataloader.direction import Direction
 import os
 import argparse
 
@@ -44,88 +45,56 @@ if __name__ == '__main__':
                       "PHP_CWE-434",
                       "ZipSlip"]
 
-    syscall_feature_list = [SyscallToInt(),
-                            ThreadIDExtractor()]
-
     header_exists = False
 
     # data loader for scenario
     for name in SCENARIO_NAMES:
-        dataloader = DataLoader(os.path.join(args.base_path, name))
+        dataloader = dataloader_factory(os.path.join(args.base_path, name), direction=Direction.CLOSE)
 
+        # all configs of the scenario share one graph: building blocks with the same config
+        # (e.g. the stide of one ngram length for all window lengths) are trained and calculated once
+        configs = {}
         for flag in THREAD_AWARE:
             for ngram_config in N_GRAM_PARAMS:
                 for window_config in WINDOW_LENGTH_PARAMS:
-
-                    print('Running STIDE algorithm with config:')
-                    print(f'   Scenario: {name}')
-                    print(f'   Thread Aware: {flag}')
-                    print(f'   n_gram Size: {ngram_config}')
-                    print(f'   Window Size: {window_config}')
-
-                    stream_feature_list = [StreamNgramExtractor(feature_list=[SyscallToInt],
-                                                                thread_aware=flag,
-                                                                ngram_length=ngram_config)]
-
-                    dataprocessor = DataPreprocessor(dataloader,
-                                                     syscall_feature_list,
-                                                     stream_feature_list)
-                    # decision engine (DE)
-                    stide = Stide(window_length=window_config)
-
-                    # define the used features
-                    ids = IDS(data_loader=dataloader,
-                              data_preprocessor=dataprocessor,
-                              decision_engine=stide,
-                              plot_switch=False)
-
-                    ids.train_decision_engine()
-                    ids.determine_threshold()
-                    ids.detect()
-                    performance_dict = ids.performance.get_performance()
-                    performance_dict["scenario"] = f"{name}"
-                    performance_dict["thread_aware"] = f"{flag}"
-                    performance_dict["n_gram"] = f"{ngram_config}"
-                    performance_dict["window_length"] = f"{window_config}"
-                    # pprint(perf_dict)
-
-                    with open(os.path.join(args.output_path, "performance.csv"), "a") as performance_csv:
-                        fieldnames = ["scenario",
-                                      "thread_aware",
-                                      "n_gram",
-                                      "window_length",
-                                      "false_positives",
-                                      "true_positives",
-                                      "true_negatives",
-                                      "alarm_count",
-                                      "exploit_count",
-                                      "detection_rate",
-                                      "consecutive_false_positives_normal",
-                                      "consecutive_false_positives_exploits",
-                                      "recall",
-                                      "precision_with_cfa",
-                                      "precision_with_syscalls"]
-
-                        writer = csv.DictWriter(performance_csv, fieldnames=fieldnames)
-                        if header_exists is False:
-                            writer.writeheader()
-                            header_exists = True
-
-                        writer.writerow({"scenario": performance_dict["scenario"],
-                                         "thread_aware": performance_dict["thread_aware"],
-                                         "n_gram": performance_dict["n_gram"],
-                                         "window_length": performance_dict["window_length"],
-                                         "false_positives": performance_dict["false_positives"],
-                                         "true_positives": performance_dict["true_positives"],
-                                         "true_negatives": performance_dict["true_negatives"],
-                                         "alarm_count": performance_dict["alarm_count"],
-                                         "exploit_count": performance_dict["exploit_count"],
-                                         "detection_rate": performance_dict["detection_rate"],
-                                         "consecutive_false_positives_normal": performance_dict["consecutive_false_positives_normal"],
-                                         "consecutive_false_positives_exploits": performance_dict["consecutive_false_positives_exploits"],
-                                         "recall": performance_dict["recall"],
-                                         "precision_with_cfa": performance_dict["precision_with_cfa"],
-                                         "precision_with_syscalls":performance_dict["precision_with_syscalls"]})
-
-
-
+                    ngram = Ngram([IntEmbedding(SyscallName())], flag, ngram_config)
+                    stide = Stide(ngram)
+                    stream_sum = StreamSum(stide, False, window_config, False)
+                    configs[(flag, ngram_config, window_config)] = MaxScoreThreshold(stream_sum)
+
+        print('Running STIDE algorithm sweep:')
+        print(f'   Scenario: {name}')
+        print(f'   Configs: {len(configs)}')
+        sweep = Sweep(dataloader, configs)
+        performances = sweep.detect()
+
+        with open(os.path.join(args.output_path, "performance.csv"), "a") as performance_csv:
+            for (flag, ngram_config, window_config), performance in performances.items():
+                performance_dict = performance.get_results()
+                performance_dict["scenario"] = f"{name}"
+                performance_dict["thread_aware"] = f"{flag}"
+                performance_dict["n_gram"] = f"{ngram_config}"
+                performance_dict["window_length"] = f"{window_config}"
+
+                fieldnames = ["scenario",
+                              "thread_aware",
+                              "n_gram",
+                              "window_length",
+                              "false_positives",
+                              "true_positives",
+                              "true_negatives",
+                              "correct_alarm_count",
+                              "exploit_count",
+                              "detection_rate",
+                              "consecutive_false_positives_normal",
+                              "consecutive_false_positives_exploits",
+                              "recall",
+                              "precision_with_cfa",
+                              "precision_with_syscalls"]
+
+                writer = csv.DictWriter(performance_csv, fieldnames=fieldnames, extrasaction='ignore')
+                if header_exists is False:
+                    writer.writeheader()
+                    header_exists = True
+
+                writer.writerow(performance_dict)
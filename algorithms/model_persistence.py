@@ -0,0 +1,162 @@
+"""
+saving and loading the trained state of a building block graph
+
+each trainable building block is stored with a signature built from its class, its config and the signatures
+of its dependencies, so the state is only restored into a graph with the same topology and configuration
+the stored model also contains a hash of the training and validation data it was trained on
+"""
+import os
+import json
+import pickle
+import hashlib
+import zipfile
+
+from algorithms.building_block import BuildingBlock
+from algorithms.building_block_manager import BuildingBlockManager
+from algorithms.profiler import ProfiledMethod
+from dataloader.base_data_loader import BaseDataLoader
+
+MODEL_VERSION = 1
+
+
+def _is_building_block_reference(value) -> bool:
+    if isinstance(value, BuildingBlock):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(item, BuildingBlock) for item in value)
+    return False
+
+
+def building_block_state(bb: BuildingBlock) -> dict:
+    """
+    all attributes of the building block except references to other building blocks,
+    the internal buffers of the BuildingBlock base class and methods wrapped by a profiler
+    """
+    state = {}
+    for key, value in vars(bb).items():
+        if key.startswith('_BuildingBlock__') or key == 'name':
+            continue
+        if _is_building_block_reference(value) or isinstance(value, ProfiledMethod):
+            continue
+        state[key] = value
+    return state
+
+
+def building_block_signatures(manager: BuildingBlockManager) -> dict:
+    """
+    calculates the signature of each building block in the graph
+    the signature covers class, config and (recursively) the dependencies
+
+    returns: dict building block -> signature
+    """
+    signatures = {}
+    for generation in manager.building_block_generations:
+        for bb in generation:
+            description = {
+                'name': bb.__class__.__name__,
+                'config': bb.to_dict_repr().get('config', {}),
+                'dependencies': [signatures[dependency] for dependency in bb.depends_on()],
+            }
+            encoded = json.dumps(description, sort_keys=True, default=str).encode('utf-8')
+            signatures[bb] = hashlib.sha1(encoded).hexdigest()
+    return signatures
+
+
+def _state_keys(manager: BuildingBlockManager, trainable_bbs: list) -> dict:
+    """
+    key for each trainable bb: its signature and a counter for identical building blocks
+    """
+    signatures = building_block_signatures(manager)
+    keys = {}
+    seen = {}
+    for bb in trainable_bbs:
+        signature = signatures[bb]
+        keys[bb] = f"{signature}_{seen.get(signature, 0)}"
+        seen[signature] = seen.get(signature, 0) + 1
+    return keys
+
+
+def _hash_recording_file(path: str, data_hash):
+    """
+    zip files are hashed by crc and size of their members, other files by their content
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, 'r') as zipped:
+            for info in zipped.infolist():
+                data_hash.update(f"{info.filename}:{info.CRC}:{info.file_size};".encode('utf-8'))
+    else:
+        with open(path, 'rb') as recording_file:
+            for block in iter(lambda: recording_file.read(1 << 20), b''):
+                data_hash.update(block)
+
+
+def data_set_hash(data_loader: BaseDataLoader) -> str:
+    """
+    hash over all training and validation recordings (and the direction and syscall filter) of the data loader
+    """
+    data_hash = hashlib.sha1()
+    data_hash.update(str(getattr(data_loader, '_direction', None)).encode('utf-8'))
+    syscall_filter = getattr(data_loader, '_syscall_filter', None)
+    if syscall_filter is not None:
+        data_hash.update(repr(syscall_filter).encode('utf-8'))
+    for data_set, recordings in [('training', data_loader.training_data()),
+                                 ('validation', data_loader.validation_data())]:
+        data_hash.update(data_set.encode('utf-8'))
+        for recording in recordings:
+            path = getattr(recording, 'path', None)
+            data_hash.update(str(getattr(recording, 'name', path)).encode('utf-8'))
+            if path is not None and os.path.isfile(path):
+                _hash_recording_file(path, data_hash)
+    return data_hash.hexdigest()
+
+
+def save_building_blocks(path: str, manager: BuildingBlockManager, trainable_bbs: list, data_hash: str):
+    """
+    pickles the states of the given trainable building blocks to path
+    """
+    keys = _state_keys(manager, trainable_bbs)
+    states = {}
+    for bb in trainable_bbs:
+        try:
+            states[keys[bb]] = pickle.dumps(building_block_state(bb))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"could not save state of {bb.name}: {e}")
+    model = {
+        'version': MODEL_VERSION,
+        'data_hash': data_hash,
+        'states': states,
+    }
+    directory = os.path.dirname(path)
+    if len(directory) > 0:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as model_file:
+        pickle.dump(model, model_file)
+
+
+def load_building_blocks(path: str, manager: BuildingBlockManager, trainable_bbs: list, data_hash: str) -> bool:
+    """
+    restores the states of the given trainable building blocks from path
+    nothing is restored if the stored model does not fit the graph or the data
+
+    returns: True if all states were restored
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as model_file:
+        model = pickle.load(model_file)
+    if model.get('version') != MODEL_VERSION:
+        print(f"stored model at {path} has an old version")
+        return False
+    if model['data_hash'] != data_hash:
+        print(f"stored model at {path} was trained on other data")
+        return False
+    keys = _state_keys(manager, trainable_bbs)
+    states = model['states']
+    for bb in trainable_bbs:
+        if keys[bb] not in states:
+            print(f"stored model at {path} has no state for {bb.name}")
+            return False
+    for bb in trainable_bbs:
+        for key, value in pickle.loads(states[keys[bb]]).items():
+            setattr(bb, key, value)
+    return True
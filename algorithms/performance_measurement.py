@@ -206,6 +206,16 @@ class Performance:
         """
         return self._first_syscall_of_cfp_list_exploits, self._last_syscall_of_cfp_list_exploits, self._first_syscall_of_cfp_list_normal, self._last_syscall_of_cfp_list_normal
 
+    def drop_cfp_indices(self):
+        """
+        removes the cfp syscall indices which are only needed for plotting
+        keeps performance objects small when they are sent between processes
+        """
+        self._first_syscall_of_cfp_list_exploits = []
+        self._last_syscall_of_cfp_list_exploits = []
+        self._first_syscall_of_cfp_list_normal = []
+        self._last_syscall_of_cfp_list_normal = []
+
     def get_results(self):
         try:
             detection_rate = self._alarm_count / self._exploit_count
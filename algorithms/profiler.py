@@ -0,0 +1,209 @@
+"""
+Profiler class definition
+"""
+import json
+import time
+import tracemalloc
+
+from algorithms.building_block import BuildingBlock
+from algorithms.building_block_manager import BuildingBlockManager
+
+PROFILED_METHODS = ['get_result', 'get_results_batch', 'train_on', 'val_on', 'fit']
+
+
+class ProfiledMethod:
+    """
+        replaces a method of one building block instance and forwards each call to the profiler
+        keeps __func__ of the original method, so checks like bb.train_on.__func__ still work
+    """
+
+    def __init__(self, profiler, bb: BuildingBlock, method_name: str):
+        self._profiler = profiler
+        self._bb = bb
+        self._method_name = method_name
+        self._method = getattr(bb, method_name)
+        self.__func__ = self._method.__func__
+        self.__self__ = bb
+
+    def __call__(self, *args):
+        return self._profiler.call(self._bb, self._method_name, self._method, args)
+
+
+class MethodStats:
+    """
+        profiling results of one method of one building block
+        times are in seconds, self time excludes the time spent in other profiled calls
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'cache_hits': self.cache_hits,
+            'cache_hit_rate': self.cache_hits / self.calls if self.calls > 0 else 0.0,
+            'cumulative_time': self.cumulative_time,
+            'self_time': self.self_time,
+        }
+
+
+class _Frame:
+    """
+        one running profiled call
+    """
+    __slots__ = ['start_time', 'child_time', 'start_memory', 'peak_memory']
+
+    def __init__(self, start_time: float, start_memory: int):
+        self.start_time = start_time
+        self.child_time = 0.0
+        self.start_memory = start_memory
+        self.peak_memory = start_memory
+
+
+class Profiler:
+    """
+        opt-in profiling of the building blocks of a dependency graph
+        attach wraps get_result, get_results_batch, train_on, val_on and fit of each building block and records:
+            - number of calls and cache hits (get_result of the same syscall again)
+            - cumulative time and self time (without the time of the dependencies)
+            - peak memory allocated during one call of the building block (if trace_memory is set, uses tracemalloc)
+
+        only calls in this process are recorded (not in worker processes of parallel training or detection)
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self._trace_memory = trace_memory
+        self._stats = {}
+        self._peak_memory = {}
+        self._stack = []
+        self._attached = []
+
+    def attach(self, manager: BuildingBlockManager):
+        """
+        wraps the methods of all building blocks of the graph
+        """
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for generation in manager.building_block_generations:
+            for bb in generation:
+                if bb in self._stats:
+                    continue
+                self._stats[bb] = {}
+                self._peak_memory[bb] = 0
+                for method_name in PROFILED_METHODS:
+                    setattr(bb, method_name, ProfiledMethod(self, bb, method_name))
+                self._attached.append(bb)
+
+    def detach(self):
+        """
+        restores the original methods of all building blocks, the results are kept
+        """
+        for bb in self._attached:
+            for method_name in PROFILED_METHODS:
+                if isinstance(vars(bb).get(method_name), ProfiledMethod):
+                    delattr(bb, method_name)
+        self._attached = []
+        if self._trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def call(self, bb: BuildingBlock, method_name: str, method, args: tuple):
+        """
+        calls the original method and records its time and memory
+        """
+        method_stats = self._stats[bb].get(method_name)
+        if method_stats is None:
+            method_stats = self._stats[bb][method_name] = MethodStats()
+        method_stats.calls += 1
+        # results buffered by BuildingBlock for the same syscall or columns
+        if (method_name == 'get_result' and bb._BuildingBlock__last_syscall is args[0]
+                and bb._BuildingBlock__last_line_id == args[0].line_id) or \
+                (method_name == 'get_results_batch' and bb._BuildingBlock__last_columns is args[0]):
+            method_stats.cache_hits += 1
+            return method(*args)
+
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        start_memory = 0
+        if tracing:
+            start_memory, peak_memory = tracemalloc.get_traced_memory()
+            if len(self._stack) > 0:
+                # the peak is reset for this call, keep the peak so far for the calling building block
+                self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, peak_memory)
+            tracemalloc.reset_peak()
+        frame = _Frame(time.perf_counter(), start_memory)
+        self._stack.append(frame)
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - frame.start_time
+            self._stack.pop()
+            method_stats.cumulative_time += elapsed
+            method_stats.self_time += elapsed - frame.child_time
+            if len(self._stack) > 0:
+                self._stack[-1].child_time += elapsed
+            if tracing:
+                frame.peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+                self._peak_memory[bb] = max(self._peak_memory[bb], frame.peak_memory - frame.start_memory)
+                if len(self._stack) > 0:
+                    self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, frame.peak_memory)
+
+    def results(self) -> list:
+        """
+        profiling results of each building block
+
+        returns: list of dicts with name, id, config, peak memory and the stats of each called method
+        """
+        results = []
+        for bb, method_stats in self._stats.items():
+            bb_repr = bb.to_dict_repr()
+            results.append({
+                'name': bb_repr['name'],
+                'id': bb_repr['id'],
+                'config': bb_repr.get('config', {}),
+                'peak_memory': self._peak_memory[bb],
+                'methods': {method_name: stats.to_dict() for method_name, stats in method_stats.items()},
+            })
+        return results
+
+    def print_table(self):
+        """
+        prints one line per called method of each building block, sorted by self time
+        """
+        rows = []
+        for result in self.results():
+            for method_name, stats in result['methods'].items():
+                rows.append((result['name'], result['id'], method_name, stats, result['peak_memory']))
+        rows.sort(key=lambda row: row[3]['self_time'], reverse=True)
+        print(f"{'building block':<35} {'method':<17} {'calls':>10} {'cum s':>9} {'self s':>9} "
+              f"{'hit rate':>8} {'peak KiB':>10}")
+        for name, bb_id, method_name, stats, peak_memory in rows:
+            print(f"{name + ' ' + bb_id:<35} {method_name:<17} {stats['calls']:>10} "
+                  f"{stats['cumulative_time']:>9.3f} {stats['self_time']:>9.3f} "
+                  f"{stats['cache_hit_rate']:>8.1%} {peak_memory / 1024:>10.1f}")
+
+    def _annotations(self) -> dict:
+        """
+        short profiling summary of each building block used as label in the dot graph
+        """
+        annotations = {}
+        for bb, method_stats in self._stats.items():
+            lines = [f"{bb.name} {hex(id(bb))}"]
+            for method_name, stats in method_stats.items():
+                lines.append(f"{method_name}: {stats.calls} calls, {stats.self_time:.3f}s self")
+            lines.append(f"peak: {self._peak_memory[bb] / 1024:.1f} KiB")
+            annotations[bb] = "\n".join(lines)
+        return annotations
+
+    def save_report(self, path: str, manager: BuildingBlockManager):
+        """
+        writes the results and the dependency graph annotated with them (dot format) as json
+        """
+        report = {
+            'building_blocks': self.results(),
+            'dot': manager.to_dot(self._annotations()).to_string(),
+        }
+        with open(path, 'w') as report_file:
+            json.dump(report, report_file, indent=2, default=str)
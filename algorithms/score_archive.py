@@ -0,0 +1,127 @@
+"""
+anomaly scores of the test data stored once and evaluated for many thresholds
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from algorithms.performance_measurement import Performance
+
+
+class ScoreArchive:
+    """
+        Anomaly score of each syscall of the test data (nan if there is none) together with the recording boundaries
+        and the position of the exploit in each recording. Created by IDS.score_test_data.
+
+        The performance for any threshold (a syscall is an anomaly if its score is above the threshold) is calculated
+        from these arrays without calculating the building blocks again.
+        Assumes the syscalls of each recording are ordered by time (as in the LID-DS recordings).
+
+        Args:
+            scores: anomaly score of each syscall of all test recordings
+            recording_offsets: index of the first syscall of each recording and the total number of syscalls at the end
+            exploit_offsets: index of the first syscall at or after the exploit time within each recording,
+                             -1 for recordings without exploit
+    """
+
+    def __init__(self, scores: np.ndarray, recording_offsets: np.ndarray, exploit_offsets: np.ndarray):
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.recording_offsets = np.asarray(recording_offsets, dtype=np.int64)
+        self.exploit_offsets = np.asarray(exploit_offsets, dtype=np.int64)
+        if len(self.recording_offsets) != len(self.exploit_offsets) + 1 or self.recording_offsets[-1] != len(self.scores):
+            raise ValueError("recording offsets do not match scores and exploit offsets")
+
+    def save(self, path: str):
+        """
+        saves the arrays to one uncompressed .npz file
+        """
+        with open(path, 'wb') as archive_file:
+            np.savez(archive_file,
+                     scores=self.scores,
+                     recording_offsets=self.recording_offsets,
+                     exploit_offsets=self.exploit_offsets)
+
+    @staticmethod
+    def load(path: str) -> ScoreArchive:
+        with np.load(path) as archive:
+            return ScoreArchive(archive['scores'], archive['recording_offsets'], archive['exploit_offsets'])
+
+    def thresholds(self) -> np.ndarray:
+        """
+        all thresholds giving different results (each distinct score and -inf) for a full ROC-like curve
+        """
+        distinct_scores = np.unique(self.scores[~np.isnan(self.scores)])
+        return np.concatenate(([-np.inf], distinct_scores))
+
+    def evaluate(self, thresholds=None) -> list:
+        """
+        calculates the performance for each given threshold (defaults to all thresholds of the score archive)
+        gives the same results as detecting recording by recording with a MaxScoreThreshold set to this threshold
+
+        Returns:
+            list of Performance objects, one per threshold
+        """
+        if thresholds is None:
+            thresholds = self.thresholds()
+        thresholds = np.asarray(thresholds, dtype=np.float64).reshape(-1)
+        # nan scores never are anomalies
+        scores = np.where(np.isnan(self.scores), -np.inf, self.scores)
+        starts = self.recording_offsets[:-1]
+        ends = self.recording_offsets[1:]
+        is_exploit = self.exploit_offsets >= 0
+        exploit_starts = np.where(is_exploit, starts + self.exploit_offsets, ends)
+
+        # syscalls before the exploit (and all syscalls of normal recordings) and syscalls after the exploit
+        after_exploit = np.zeros(len(scores) + 1, dtype=np.int64)
+        np.add.at(after_exploit, exploit_starts, 1)
+        np.add.at(after_exploit, ends, -1)
+        after_exploit = np.cumsum(after_exploit[:-1]) > 0
+        in_normal_recording = np.repeat(~is_exploit, ends - starts)
+
+        # false positives and true negatives
+        before_exploit_scores = np.sort(scores[~after_exploit])
+        fp = len(before_exploit_scores) - np.searchsorted(before_exploit_scores, thresholds, side='right')
+        tn = len(before_exploit_scores) - fp
+        # true positives and false negatives
+        after_exploit_scores = np.sort(scores[after_exploit])
+        tp = len(after_exploit_scores) - np.searchsorted(after_exploit_scores, thresholds, side='right')
+        fn = len(after_exploit_scores) - tp
+
+        # one alarm per exploit recording if any syscall after the exploit is an anomaly
+        lengths = (ends - exploit_starts)[is_exploit]
+        max_scores = np.full(len(lengths), -np.inf)
+        non_empty = lengths > 0
+        if non_empty.any():
+            segment_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+            max_scores[non_empty] = np.maximum.reduceat(scores[after_exploit], segment_starts)
+        max_scores = np.sort(max_scores)
+        alarm_count = len(max_scores) - np.searchsorted(max_scores, thresholds, side='right')
+
+        # consecutive false positives: a stream starts at an anomaly before the exploit
+        # if its predecessor is no anomaly or the recording starts there
+        previous_scores = np.concatenate(([-np.inf], scores[:-1]))
+        previous_scores[starts[starts < len(scores)]] = -np.inf
+        stream_start = ~after_exploit & (previous_scores < scores)
+        cfp = {}
+        for name, mask in [('normal', stream_start & in_normal_recording),
+                           ('exploits', stream_start & ~in_normal_recording)]:
+            # a stream starts at index i for all thresholds t with previous_score <= t < score
+            starting_below = np.sort(previous_scores[mask])
+            ending_below = np.sort(scores[mask])
+            cfp[name] = (np.searchsorted(starting_below, thresholds, side='right')
+                         - np.searchsorted(ending_below, thresholds, side='right'))
+
+        performances = []
+        for i, threshold in enumerate(thresholds):
+            performance = Performance()
+            performance.set_threshold(float(threshold))
+            performance._exploit_count = int(is_exploit.sum())
+            performance._alarm_count = int(alarm_count[i])
+            performance._fp = int(fp[i])
+            performance._tn = int(tn[i])
+            performance._tp = int(tp[i])
+            performance._fn = int(fn[i])
+            performance._cfp_count_normal = int(cfp['normal'][i])
+            performance._cfp_count_exploits = int(cfp['exploits'][i])
+            performances.append(performance)
+        return performances
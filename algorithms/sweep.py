@@ -0,0 +1,159 @@
+"""
+Sweep class definition
+"""
+from tqdm import tqdm
+
+from algorithms.building_block import BuildingBlock
+from algorithms.building_block_manager import BuildingBlockManager
+from algorithms.data_preprocessor import DataPreprocessor
+from algorithms.model_persistence import building_block_signatures
+from algorithms.performance_measurement import Performance
+from dataloader.base_data_loader import BaseDataLoader
+
+
+class SweepRoot(BuildingBlock):
+    """
+        virtual building block depending on the deciders of all configs of a sweep
+        it is never calculated, it only joins the graphs of all configs into one graph
+    """
+
+    def __init__(self, deciders: list):
+        super().__init__()
+        self._dependency_list = list(deciders)
+
+    def depends_on(self):
+        return self._dependency_list
+
+    def _calculate(self, syscall):
+        return None
+
+
+def _replace_building_blocks(bb: BuildingBlock, replacements: dict):
+    """
+        replaces all references of bb to building blocks (also within lists and tuples) by their replacements
+        ids of the replaced building blocks that bb cached in __init__ (attributes ending with _id or _ids,
+        e.g. Dgram, StreamSum or MinMaxScaling) are replaced by the ids of the replacements
+    """
+    replaced_ids = {}
+
+    def replace(item: BuildingBlock) -> BuildingBlock:
+        replacement = replacements.get(item, item)
+        if replacement is not item:
+            replaced_ids[item.get_id()] = replacement.get_id()
+        return replacement
+
+    for key, value in vars(bb).items():
+        if key.startswith('_BuildingBlock__'):
+            continue
+        if isinstance(value, BuildingBlock):
+            setattr(bb, key, replace(value))
+        elif isinstance(value, (list, tuple)) and any(isinstance(item, BuildingBlock) for item in value):
+            replaced = [replace(item) if isinstance(item, BuildingBlock) else item for item in value]
+            setattr(bb, key, type(value)(replaced))
+
+    for key, value in vars(bb).items():
+        if key.endswith('_id') and isinstance(value, int) and value in replaced_ids:
+            setattr(bb, key, replaced_ids[value])
+        elif key.endswith('_ids') and isinstance(value, (list, tuple)):
+            setattr(bb, key, type(value)(replaced_ids.get(item, item) for item in value))
+
+
+class Sweep:
+    """
+        Evaluates many configs (each given by its resulting decider) on the same data loader at once.
+        Building blocks with the same class, config and dependencies are merged into one shared building block,
+        so each of them is only trained and calculated once for all configs.
+        All configs are trained together (one data pass per training stage) and tested in one pass over the test data.
+
+        Args:
+            data_loader: data loader used for all configs
+            configs: dict of config name -> resulting building block (needs to be a decider)
+            create_alarms: create alarms in the performance of each config
+            training_workers: number of processes used for training (see DataPreprocessor)
+    """
+
+    def __init__(self,
+                 data_loader: BaseDataLoader,
+                 configs: dict,
+                 create_alarms: bool = False,
+                 training_workers: int = 1):
+        self._data_loader = data_loader
+        self._create_alarms = create_alarms
+        for name, decider in configs.items():
+            if not decider.is_decider():
+                raise ValueError(f'Resulting BuildingBlock of config {name} is not a decider!')
+        self._configs = self._merge_configs(configs)
+        self._root = SweepRoot(list(dict.fromkeys(self._configs.values())))
+        self._data_preprocessor = DataPreprocessor(self._data_loader, self._root, workers=training_workers)
+        self.performances = {}
+
+    @staticmethod
+    def _merge_configs(configs: dict) -> dict:
+        """
+            merges identical sub-graphs of all configs
+
+            returns: dict of config name -> resulting building block within the merged graph
+        """
+        shared = {}
+        replacements = {}
+        num_bbs = 0
+        for decider in configs.values():
+            manager = BuildingBlockManager(decider)
+            signatures = building_block_signatures(manager)
+            for generation in manager.building_block_generations:
+                for bb in generation:
+                    if bb in replacements:
+                        # same instance used in several configs
+                        continue
+                    num_bbs += 1
+                    _replace_building_blocks(bb, replacements)
+                    replacements[bb] = shared.setdefault(signatures[bb], bb)
+        print(f"sweep: {len(configs)} configs with {len(shared)} distinct bbs instead of {num_bbs}")
+        return {name: replacements[decider] for name, decider in configs.items()}
+
+    def get_config(self) -> str:
+        return self._data_preprocessor.get_graph_dot()
+
+    def _decisions(self, recording, deciders: list, batch: bool):
+        """
+            yields each syscall of the recording together with the results of all given deciders
+        """
+        if batch:
+            columns = recording.columns()
+            yield from zip(columns.syscalls(), zip(*[decider.get_results_batch(columns) for decider in deciders]))
+        else:
+            for syscall in recording.syscalls():
+                yield syscall, [decider.get_result(syscall) for decider in deciders]
+
+    def detect(self, batch: bool = False) -> dict:
+        """
+            detects on the test data with all configs in one pass
+
+            Args:
+                batch: calculate each recording at once with the batch implementations of the building blocks
+
+            Returns:
+                dict of config name -> Performance
+        """
+        names = list(self._configs)
+        deciders = [self._configs[name] for name in names]
+        performances = [Performance(self._create_alarms) for _ in names]
+        data = self._data_loader.test_data()
+        description = 'anomaly detection'.rjust(27)
+        for recording in tqdm(data, description, unit=" recording"):
+            for performance in performances:
+                performance.new_recording(recording)
+
+            for syscall, decisions in self._decisions(recording, deciders, batch):
+                for performance, is_anomaly in zip(performances, decisions):
+                    performance.analyze_syscall(syscall, is_anomaly)
+
+            self._data_preprocessor.new_recording()
+
+            # run end alarm once to ensure that last alarm gets saved
+            for performance in performances:
+                if performance.alarms is not None:
+                    performance.alarms.end_alarm()
+
+        self.performances = dict(zip(names, performances))
+        return self.performances
@@ -0,0 +1,113 @@
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
+from dataloader.base_data_loader import BaseDataLoader
+from dataloader.base_recording import BaseRecording
+from dataloader.syscall_2021 import Syscall2021
+
+# syscall names of the recordings of the in memory data sets, one list per recording
+TRAINING = [['open', 'read', 'close', 'open', 'read', 'close', 'mmap'],
+            ['open', 'read', 'write', 'close', 'poll', 'open']]
+VALIDATION = [['open', 'read', 'close', 'poll', 'read', 'write', 'open']]
+TEST = [['open', 'read', 'close', 'open', 'read', 'close'],
+        ['open', 'execve', 'clone', 'read', 'close', 'open', 'read', 'mmap', 'socket', 'poll'],
+        ['poll', 'mmap', 'open', 'write', 'read', 'poll', 'close']]
+# exploit recording, the exploit starts at the 4th syscall
+EXPLOIT = ['open', 'read', 'close', 'execve', 'clone', 'socket', 'open']
+
+
+def build_syscall_line(timestamp: int, name: str, thread_id: int = 1, direction: str = '<',
+                       params: str = 'res=0') -> str:
+    return f"{timestamp} 0 {thread_id} apache2 {thread_id} {name} {direction} {params}"
+
+
+class InMemoryRecording(BaseRecording):
+    """
+    recording given as list of LID-DS 2021 syscall lines
+    """
+
+    def __init__(self, name: str, lines: list, exploit_time: float = None):
+        super().__init__()
+        self.name = name
+        self.path = f'/tmp/in_memory/test/normal/{name}.zip'
+        self._lines = lines
+        self._exploit_time = exploit_time
+
+    def syscalls(self):
+        for line_id, line in enumerate(self._lines, start=1):
+            yield Syscall2021(self.path, line, line_id=line_id)
+
+    def metadata(self) -> dict:
+        if self._exploit_time is None:
+            return {'exploit': False, 'time': {'exploit': []}}
+        return {'exploit': True, 'time': {'exploit': [{'absolute': self._exploit_time}]}}
+
+
+class InMemoryDataLoader(BaseDataLoader):
+    """
+    data loader on in memory recordings, counts the passes over each data set
+    """
+
+    def __init__(self, training: list, validation: list, test: list):
+        self.scenario_path = '/tmp/in_memory'
+        self._training = training
+        self._validation = validation
+        self._test = test
+        self.passes = {'training': 0, 'validation': 0, 'test': 0}
+
+    def training_data(self) -> list:
+        self.passes['training'] += 1
+        return self._training
+
+    def validation_data(self) -> list:
+        self.passes['validation'] += 1
+        return self._validation
+
+    def test_data(self) -> list:
+        self.passes['test'] += 1
+        return self._test
+
+
+def recordings_from_names(prefix: str, name_lists: list) -> list:
+    """
+    creates one in memory recording for each list of syscall names
+    """
+    recordings = []
+    for index, names in enumerate(name_lists):
+        lines = [build_syscall_line(1000 + i, name, thread_id=1 + i % 2) for i, name in enumerate(names)]
+        recordings.append(InMemoryRecording(f'{prefix}_{index}', lines))
+    return recordings
+
+
+def exploit_recording(names: list = None, exploit_index: int = 3) -> InMemoryRecording:
+    """
+    single thread recording of the given syscall names (default EXPLOIT), the exploit starts at exploit_index
+    """
+    if names is None:
+        names = EXPLOIT
+    return InMemoryRecording('test_exploit',
+                             [build_syscall_line(1000 + i, name) for i, name in enumerate(names)],
+                             exploit_time=(1000 + exploit_index) * 10 ** -9)
+
+
+def in_memory_data_loader(test: list = None, training: list = None) -> InMemoryDataLoader:
+    """
+    data loader on the recordings of TRAINING and VALIDATION
+    the test recordings default to the recordings of TEST
+    """
+    if test is None:
+        test = recordings_from_names('test', TEST)
+    if training is None:
+        training = recordings_from_names('training', TRAINING)
+    return InMemoryDataLoader(training, recordings_from_names('validation', VALIDATION), test)
+
+
+def stide_decider(ngram_length: int = 2, window_length: int = 2) -> MaxScoreThreshold:
+    """
+    threshold on the stream sum of a stide on syscall name ngrams
+    """
+    stide = Stide(Ngram([IntEmbedding(SyscallName())], True, ngram_length))
+    return MaxScoreThreshold(StreamSum(stide, False, window_length, False))
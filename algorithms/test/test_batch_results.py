@@ -0,0 +1,61 @@
+import math
+
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.one_hot_encoding import OneHotEncoding
+from algorithms.features.impl.or_decider import OrDecider
+from algorithms.features.impl.return_value import ReturnValue
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.features.impl.time_delta import TimeDelta
+from algorithms.ids import IDS
+from algorithms.test.helper import TEST, exploit_recording, in_memory_data_loader, recordings_from_names
+
+
+def same_result(left, right) -> bool:
+    if left is None or right is None:
+        return (left is None or (isinstance(left, float) and math.isnan(left))) and \
+               (right is None or (isinstance(right, float) and math.isnan(right)))
+    return left == right
+
+
+def build_ids():
+    data_loader = in_memory_data_loader()
+    syscall_name = SyscallName()
+    int_embedding = IntEmbedding(syscall_name)
+    ngram = Ngram([int_embedding, ReturnValue()], True, 3)
+    stide = Stide(ngram)
+    stream_sum = StreamSum(stide, True, 2)
+    # ngrams over one hot encodings have no batch implementation and are calculated syscall by syscall
+    stide_ohe = Stide(Ngram([OneHotEncoding(syscall_name)], False, 2))
+    time_delta = TimeDelta(True)
+    decider = OrDecider([MaxScoreThreshold(stream_sum),
+                         MaxScoreThreshold(StreamSum(stide_ohe, False, 3, False)),
+                         MaxScoreThreshold(time_delta)])
+    ids = IDS(data_loader, decider, False)
+    return ids, [syscall_name, int_embedding, ngram, stide, stream_sum, stide_ohe, decider], time_delta
+
+
+def test_batch_results():
+    for recording in recordings_from_names('test', TEST):
+        ids, bbs, time_delta = build_ids()
+        columns = recording.columns()
+        batch_results = [bb.get_results_batch(columns) for bb in bbs]
+        # the fallback of the ohe ngram used the syscall wise buffers
+        ids._data_preprocessor.new_recording()
+        for i, syscall in enumerate(recording.syscalls()):
+            for bb, results in zip(bbs, batch_results):
+                assert same_result(bb.get_result(syscall), results[i]), f"{bb.name} at row {i}"
+
+        # each thread starts with a delta of 0 in every recording
+        deltas = time_delta.get_results_batch(columns) * time_delta._max_time_delta
+        assert deltas.tolist() == [0, 0] + [2] * (len(columns) - 2)
+
+    # whole detection
+    ids, _, _ = build_ids()
+    ids._data_loader._test.append(exploit_recording())
+    results = ids.detect().get_results()
+    ids.performance = type(ids.performance)()
+    assert ids.detect(batch=True).get_results() == results
@@ -0,0 +1,63 @@
+from algorithms.data_preprocessor import DataPreprocessor
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.min_max_scaling import MinMaxScaling
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.one_hot_encoding import OneHotEncoding
+from algorithms.features.impl.or_decider import OrDecider
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.test.helper import TRAINING, VALIDATION, InMemoryDataLoader, in_memory_data_loader, \
+    recordings_from_names
+
+
+def build_graph():
+    syscall_name = SyscallName()
+    int_embedding = IntEmbedding(syscall_name)
+    one_hot_encoding = OneHotEncoding(syscall_name)
+    stide_int = Stide(Ngram([int_embedding], True, 2))
+    stide_ohe = Stide(Ngram([one_hot_encoding], True, 2))
+    decider_int = MaxScoreThreshold(stide_int)
+    decider_ohe = MaxScoreThreshold(StreamSum(stide_ohe, False, 3, False))
+    return OrDecider([decider_int, decider_ohe]), stide_int, stide_ohe, decider_ohe
+
+
+def test_fused_training():
+    data_loader = in_memory_data_loader([])
+    final_bb, stide_int, stide_ohe, decider_ohe = build_graph()
+    preprocessor = DataPreprocessor(data_loader, final_bb)
+
+    # IntEmbedding and OneHotEncoding lie in different generations but share one training pass,
+    # both Stides share the next one and both thresholds share the validation pass
+    stages = preprocessor._schedule_stages()
+    assert [len(bbs_to_train) for _, bbs_to_train in stages] == [2, 2, 2]
+    assert preprocessor._data_passes_per_generation() == 5
+    assert data_loader.passes == {'training': 2, 'validation': 1, 'test': 0}
+
+    assert len(stide_int._normal_database) == len(stide_ohe._normal_database)
+    assert decider_ohe._threshold > 0
+
+
+def test_parallel_training():
+    training = recordings_from_names('training', TRAINING + [['mmap', 'poll', 'open', 'read'], ['write', 'close']])
+    validation = recordings_from_names('validation', VALIDATION + [['close', 'mmap', 'poll']])
+
+    sequential_bb, sequential_stide_int, sequential_stide_ohe, sequential_decider = build_graph()
+    DataPreprocessor(InMemoryDataLoader(training, validation, []), sequential_bb)
+    parallel_bb, parallel_stide_int, parallel_stide_ohe, parallel_decider = build_graph()
+    DataPreprocessor(InMemoryDataLoader(training, validation, []), parallel_bb, workers=3)
+
+    # merged states equal the sequentially trained ones
+    assert parallel_stide_int._normal_database == sequential_stide_int._normal_database
+    assert parallel_stide_ohe._normal_database == sequential_stide_ohe._normal_database
+    assert parallel_decider._threshold == sequential_decider._threshold
+
+    # MinMaxScaling can not be merged, its passes fall back to sequential training
+    results = []
+    for workers in [1, 2]:
+        stide = Stide(Ngram([IntEmbedding(SyscallName())], True, 2))
+        scaling = MinMaxScaling(stide)
+        DataPreprocessor(InMemoryDataLoader(training, validation, []), MaxScoreThreshold(scaling), workers=workers)
+        results.append((stide._normal_database, scaling._min, scaling._max))
+    assert results[0] == results[1]
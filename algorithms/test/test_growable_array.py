@@ -0,0 +1,42 @@
+import numpy as np
+
+from algorithms.util.growable_array import GrowableArray
+
+
+def test_growable_array():
+    rows = GrowableArray(np.float32, initial_capacity=2)
+    assert len(rows) == 0
+    assert rows.array().shape == (0,)
+
+    for i in range(5):
+        rows.append((i, i + 1, i + 2))
+    assert len(rows) == 5
+    # capacity doubled twice
+    assert rows.nbytes == 8 * 3 * 4
+    assert rows.array().dtype == np.float32
+    assert rows.array().tolist() == [[i, i + 1, i + 2] for i in range(5)]
+
+    labels = GrowableArray(np.int64, initial_capacity=1)
+    for label in [3, 1, 4, 1, 5]:
+        labels.append(label)
+    assert labels.array().tolist() == [3, 1, 4, 1, 5]
+
+    try:
+        rows.append((1, 2))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_growable_array_distinct():
+    rows = GrowableArray(np.float32, initial_capacity=8, distinct=True)
+    for row in [(3, 1), (1, 2), (3, 1), (1, 2), (1, 2), (0, 0), (3, 1), (1, 2), (0, 0)]:
+        rows.append(row)
+    # the duplicates were removed when the array was full, the capacity was kept
+    assert rows.nbytes == 8 * 2 * 4
+    # the first appearance of each row is kept in the order of appending
+    assert rows.array().tolist() == [[3, 1], [1, 2], [0, 0]]
+    assert len(rows) == 3
+
+    rows.extend([(i, i) for i in range(1, 6)])
+    assert rows.array().tolist() == [[3, 1], [1, 2], [0, 0]] + [[i, i] for i in range(1, 6)]
@@ -0,0 +1,35 @@
+from functools import reduce
+
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.ids import IDS
+from algorithms.performance_measurement import Performance
+from algorithms.test.helper import TEST, exploit_recording, in_memory_data_loader, recordings_from_names, stide_decider
+
+
+def test_detect_parallel():
+    test = recordings_from_names('test', TEST) + [exploit_recording()]
+    ids = IDS(in_memory_data_loader(test), stide_decider(), False, create_alarms=True)
+
+    sequential = reduce(Performance.add_with_alarms,
+                        [ids.detect_on_single_recording(recording) for recording in test])
+    parallel = ids.detect_parallel(workers=2)
+
+    assert parallel.get_results() == sequential.get_results()
+    assert parallel.get_results()['true_positives'] > 0
+    assert [vars(alarm) for alarm in parallel.alarms.alarm_list] == \
+           [vars(alarm) for alarm in sequential.alarms.alarm_list]
+
+
+def test_detect_prefetch():
+    data_loader = in_memory_data_loader()
+    results = []
+    for prefetch_depth in [0, 2]:
+        stide = Stide(Ngram([IntEmbedding(SyscallName())], True, 2))
+        ids = IDS(data_loader, MaxScoreThreshold(stide), False, prefetch_depth=prefetch_depth)
+        ids.determine_threshold()
+        results.append((ids.threshold, ids.detect().get_results()))
+    assert results[0] == results[1]
@@ -0,0 +1,102 @@
+import itertools
+
+from algorithms.decision_engines.scg import SystemCallGraph
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.ids import IDS
+from algorithms.test.helper import TRAINING, VALIDATION, InMemoryDataLoader, InMemoryRecording, build_syscall_line
+
+
+def single_thread_recordings(prefix: str, name_lists: list) -> list:
+    return [InMemoryRecording(f'{prefix}_{index}', [build_syscall_line(1000 + i, name) for i, name in enumerate(names)])
+            for index, names in enumerate(name_lists)]
+
+
+def build_ids():
+    data_loader = InMemoryDataLoader(single_thread_recordings('training', TRAINING),
+                                     single_thread_recordings('validation', VALIDATION),
+                                     [])
+    ngram = Ngram([IntEmbedding(SyscallName())], True, 2)
+    stream_sum = StreamSum(Stide(ngram), True, 2, False)
+    ids = IDS(data_loader, MaxScoreThreshold(stream_sum), False)
+    return ids, ngram, stream_sum
+
+
+def test_detect_stream():
+    ids, ngram, stream_sum = build_ids()
+    names = ['open', 'read', 'close', 'execve', 'clone', 'socket', 'execve', 'open', 'read', 'close', 'open', 'read']
+    lines = [build_syscall_line(1000 + i, name, thread_id=7) for i, name in enumerate(names)]
+    lines.insert(5, 'incomplete line')
+    lines.insert(6, '')
+
+    alarms = list(ids.detect_stream(lines, source='stdin'))
+    assert len(alarms) == 1
+    assert alarms[0].first_line_id == 5
+    assert alarms[0].last_line_id == 10
+    assert alarms[0].correct is None
+
+    # procexit drops the buffers of the thread
+    lines = [build_syscall_line(2000, 'open', thread_id=8),
+             build_syscall_line(2001, 'read', thread_id=8),
+             build_syscall_line(2002, 'procexit', thread_id=8)]
+    list(ids.detect_stream(lines))
+    assert 8 not in ngram._ngram_buffer
+    assert 8 not in stream_sum._window_buffer
+
+    # a thread id reused after procexit does not continue the graph path of the ended thread
+    data_loader = InMemoryDataLoader(single_thread_recordings('training', TRAINING + VALIDATION),
+                                     single_thread_recordings('validation', TRAINING),
+                                     [])
+    scg = SystemCallGraph(SyscallName())
+    ids = IDS(data_loader, MaxScoreThreshold(scg), False)
+    names = ['open', 'read', 'close', 'procexit', 'open', 'read', 'close']
+    lines = [build_syscall_line(3000 + i, name, thread_id=8) for i, name in enumerate(names)]
+    alarms = list(ids.detect_stream(lines))
+    # only the unknown transition to procexit is anomalous
+    assert [(alarm.first_line_id, alarm.last_line_id) for alarm in alarms] == [(4, 4)]
+    assert scg._last_added_nodes[8] == 'close'
+
+
+def test_detect_stream_eviction():
+    ids, ngram, stream_sum = build_ids()
+    second = 10 ** 9
+    lines = [build_syscall_line(thread_id * second, 'open', thread_id=thread_id) for thread_id in range(1, 6)]
+    list(ids.detect_stream(lines, max_threads=3))
+    assert sorted(ngram._ngram_buffer) == [3, 4, 5]
+
+    ids, ngram, stream_sum = build_ids()
+    list(ids.detect_stream(lines, thread_timeout=2, eviction_interval=5))
+    assert sorted(ngram._ngram_buffer) == [3, 4, 5]
+
+
+def test_detect_stream_flyweight():
+    names = ['open', 'read', 'close', 'execve', 'clone', 'socket', 'execve', 'open', 'read', 'close', 'open', 'read']
+    lines = [build_syscall_line(1000 + i, name, thread_id=7) for i, name in enumerate(names)]
+    lines.insert(5, 'incomplete line')
+    ids, _, _ = build_ids()
+    expected = [vars(alarm) for alarm in ids.detect_stream(lines)]
+    ids, _, _ = build_ids()
+    assert [vars(alarm) for alarm in ids.detect_stream(lines, flyweight=True)] == expected
+
+
+def test_detect_stream_open_alarm():
+    # the attack does not end, its alarm is yielded in parts while the stream is read
+    second = 10 ** 9
+
+    def lines():
+        names = itertools.chain(['open', 'read', 'close'], itertools.cycle(['execve', 'clone', 'socket']))
+        for i, name in enumerate(names):
+            yield build_syscall_line(i * second, name, thread_id=7)
+
+    ids, _, _ = build_ids()
+    alarms = itertools.islice(ids.detect_stream(lines(), max_alarm_lines=4), 3)
+    assert [(alarm.first_line_id, alarm.last_line_id) for alarm in alarms] == [(5, 8), (9, 12), (13, 16)]
+
+    ids, _, _ = build_ids()
+    alarms = itertools.islice(ids.detect_stream(lines(), max_alarm_lines=None, max_alarm_duration=2.5), 3)
+    assert [(alarm.first_timestamp // second, alarm.last_timestamp // second) for alarm in alarms] == \
+           [(4, 7), (8, 11), (12, 15)]
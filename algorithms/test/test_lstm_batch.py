@@ -0,0 +1,35 @@
+import os
+from shutil import rmtree
+
+import numpy as np
+
+from algorithms.data_preprocessor import DataPreprocessor
+from algorithms.decision_engines.lstm import LSTM
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.test.helper import TEST, in_memory_data_loader, recordings_from_names
+
+
+def test_lstm_batch():
+    model_dir = '/tmp/lidds_lstm_test/'
+    ngram = Ngram([IntEmbedding(SyscallName())], True, 3)
+    lstm = LSTM(ngram,
+                distinct_syscalls=6,
+                input_dim=2,
+                epochs=2,
+                hidden_layers=1,
+                hidden_dim=8,
+                model_path=os.path.join(model_dir, 'lstm.model'),
+                force_train=True)
+    DataPreprocessor(in_memory_data_loader([]), MaxScoreThreshold(lstm))
+
+    for recording in recordings_from_names('test', TEST):
+        batch_scores = lstm.get_results_batch(recording.columns())
+        scores = [lstm.get_result(syscall) for syscall in recording.syscalls()]
+        scores = np.array([np.nan if score is None else score for score in scores])
+        assert np.allclose(batch_scores, scores, equal_nan=True, atol=1e-5)
+        lstm.new_recording()
+        ngram.new_recording()
+    rmtree(model_dir)
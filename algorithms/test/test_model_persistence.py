@@ -0,0 +1,71 @@
+import os
+from shutil import rmtree
+
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.ids import IDS
+from algorithms.model_persistence import data_set_hash
+from algorithms.test.helper import TRAINING, in_memory_data_loader, recordings_from_names
+from dataloader.syscall_filter import SyscallFilter
+
+
+def build_ids(model_path: str, ngram_length: int = 2, prefix: str = 'training'):
+    data_loader = in_memory_data_loader([], recordings_from_names(prefix, TRAINING))
+    int_embedding = IntEmbedding(SyscallName())
+    stide = Stide(Ngram([int_embedding], True, ngram_length))
+    decider = MaxScoreThreshold(StreamSum(stide, False, 3, False))
+    ids = IDS(data_loader, decider, False, model_path=model_path)
+    return ids, data_loader, int_embedding, stide, decider
+
+
+def test_model_persistence():
+    base_path = '/tmp/lidds_model_test'
+    model_path = os.path.join(base_path, 'model.pickle')
+    if os.path.isdir(base_path):
+        rmtree(base_path)
+
+    # first run trains and saves the model
+    _, data_loader, int_embedding, stide, decider = build_ids(model_path)
+    assert os.path.isfile(model_path)
+    assert data_loader.passes['training'] > 1
+
+    # same config and data: the model is loaded, data is only read for the data hash
+    _, data_loader, loaded_int_embedding, loaded_stide, loaded_decider = build_ids(model_path)
+    assert data_loader.passes == {'training': 1, 'validation': 1, 'test': 0}
+    assert loaded_int_embedding._syscall_dict == int_embedding._syscall_dict
+    assert loaded_stide._normal_database == stide._normal_database
+    assert loaded_decider._threshold == decider._threshold
+    assert loaded_stide._input is not stide._input
+
+    # other config or other data: retrain
+    _, data_loader, _, other_stide, _ = build_ids(model_path, ngram_length=3)
+    assert data_loader.passes['training'] > 1
+    assert other_stide._normal_database != stide._normal_database
+    _, data_loader, _, _, _ = build_ids(model_path, prefix='other_training')
+    assert data_loader.passes['training'] > 1
+
+    # explicit save and load
+    ids, _, _, stide, _ = build_ids(None)
+    ids.save(os.path.join(base_path, 'explicit.pickle'))
+    stide._normal_database = set()
+    assert ids.load(os.path.join(base_path, 'explicit.pickle'))
+    assert len(stide._normal_database) > 0
+
+    rmtree(base_path)
+
+
+def test_data_set_hash_syscall_filter():
+    data_loader = in_memory_data_loader([])
+    unfiltered = data_set_hash(data_loader)
+    data_loader._syscall_filter = SyscallFilter(names=['open', 'read'])
+    filtered = data_set_hash(data_loader)
+    assert filtered != unfiltered
+    # equal conditions give the same hash regardless of their order
+    data_loader._syscall_filter = SyscallFilter(names=('read', 'open'))
+    assert data_set_hash(data_loader) == filtered
+    data_loader._syscall_filter = SyscallFilter(names=['open', 'read'], end_ns=1005)
+    assert data_set_hash(data_loader) != filtered
@@ -0,0 +1,29 @@
+import json
+
+from algorithms.ids import IDS
+from algorithms.test.helper import TEST, TRAINING, in_memory_data_loader, stide_decider
+
+
+def test_profiler(tmp_path):
+    data_loader = in_memory_data_loader()
+    ids = IDS(data_loader, stide_decider(), False, profile=True)
+    unprofiled_ids = IDS(data_loader, stide_decider(), False)
+    assert ids.detect().get_results() == unprofiled_ids.detect().get_results()
+
+    path = str(tmp_path / 'profile.json')
+    ids.print_profile(path)
+    with open(path) as report_file:
+        report = json.load(report_file)
+    results = {result['name']: result for result in report['building_blocks']}
+
+    num_test_syscalls = sum(len(names) for names in TEST)
+    stide_results = results['Stide']['methods']
+    assert stide_results['train_on']['calls'] == sum(len(names) for names in TRAINING)
+    assert stide_results['fit']['calls'] == 1
+    assert stide_results['get_result']['calls'] >= num_test_syscalls
+    # syscall name is calculated for int embedding training and ngram, the second call is buffered
+    assert results['SyscallName']['methods']['get_result']['cache_hits'] > 0
+    for result in results.values():
+        for stats in result['methods'].values():
+            assert 0 <= stats['self_time'] <= stats['cumulative_time'] + 1e-9
+    assert 'train_on' in report['dot']
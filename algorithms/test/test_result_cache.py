@@ -0,0 +1,94 @@
+import pickle
+
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.util.result_cache import CacheBudget, ResultCache, MISSING
+
+
+def test_result_cache():
+    cache = ResultCache('test', max_entries=2)
+    assert cache.get('a') is MISSING
+    cache.put('a', 1)
+    cache.put('b', None)
+    assert cache.get('b') is None
+    # a is used more recently than b
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is MISSING
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+    statistics = cache.statistics()
+    assert statistics['hits'] == 3
+    assert statistics['misses'] == 2
+    assert statistics['evictions'] == 1
+
+    assert cache.get_or_calculate('d', lambda key: key * 2) == 'dd'
+    assert cache.get_or_calculate('d', lambda key: None) == 'dd'
+
+    # the entries are not pickled, only the configuration
+    restored = pickle.loads(pickle.dumps(cache))
+    assert len(restored) == 0
+    restored.put('a', 1)
+    restored.put('b', 2)
+    restored.put('c', 3)
+    assert len(restored) == 2
+
+
+def test_result_cache_bytes():
+    cache = ResultCache('bytes', max_bytes=1000)
+    for i in range(100):
+        cache.put((i, i + 1), float(i))
+    assert 0 < cache.bytes <= 1000
+    assert cache.get((99, 100)) == 99.0
+    assert cache.get((0, 1)) is MISSING
+
+    budget = CacheBudget()
+    try:
+        budget.configure(max_bytes=budget.used_bytes + 500)
+        other = ResultCache('other')
+        for i in range(100):
+            other.put(i, i)
+        assert not budget.exceeded()
+        assert other.evictions > 0
+        assert any(statistics['name'] == 'other' for statistics in budget.statistics())
+    finally:
+        budget.configure()
+
+
+def test_result_cache_budget():
+    budget = CacheBudget()
+    try:
+        budget.configure(max_bytes=budget.used_bytes + 2000)
+        big = ResultCache('big')
+        for i in range(100):
+            big.put(i, float(i))
+        assert budget.exceeded() is False and big.evictions > 0
+        # the least recently used entries of the big cache make room for the entries of the later cache
+        oldest = next(iter(big._entries))
+        big.get(oldest)
+        later = ResultCache('later')
+        for i in range(10):
+            later.put(-i, float(i))
+            assert later.get(-i) == float(i)
+        assert len(later) == 10 and later.evictions == 0
+        assert big.get(oldest) is not MISSING
+        assert not budget.exceeded()
+
+        # an entry larger than the budget is kept until the next entry arrives
+        huge = ResultCache('huge')
+        huge.put('huge', 'x' * 5000)
+        assert huge.get('huge') is not MISSING and len(big) == 0 and len(later) == 0
+    finally:
+        budget.configure()
+
+
+def test_building_block_cache():
+    name = SyscallName()
+    cache = name.create_cache(max_entries=10)
+    cache.put('open', 1)
+    assert cache.get('open') == 1
+    statistics = name.cache_statistics()
+    assert len(statistics) == 0
+    name._cache = cache
+    assert name.cache_statistics()[0]['name'] == 'SyscallName'
+    assert name.cache_statistics()[0]['hits'] == 1
@@ -0,0 +1,31 @@
+from functools import reduce
+
+from algorithms.ids import IDS
+from algorithms.performance_measurement import Performance
+from algorithms.score_archive import ScoreArchive
+from algorithms.test.helper import TEST, exploit_recording, in_memory_data_loader, recordings_from_names, \
+    stide_decider
+
+
+def test_score_archive(tmp_path):
+    exploit_names = ['open', 'poll', 'mmap', 'read', 'close', 'execve', 'clone', 'socket', 'open']
+    test = recordings_from_names('test', TEST) + [exploit_recording(exploit_names, exploit_index=5)]
+    decider = stide_decider(window_length=3)
+    ids = IDS(in_memory_data_loader(test), decider, False)
+
+    path = str(tmp_path / 'scores.npz')
+    score_archive = ids.score_test_data(path)
+    assert len(score_archive.scores) == sum(len(names) for names in TEST) + len(exploit_names)
+    assert list(score_archive.exploit_offsets) == [-1, -1, -1, 5]
+    batch_archive = ids.score_test_data(batch=True)
+    assert list(batch_archive.exploit_offsets) == list(score_archive.exploit_offsets)
+
+    thresholds = score_archive.thresholds()
+    performances = ScoreArchive.load(path).evaluate(thresholds)
+    batch_performances = batch_archive.evaluate(thresholds)
+    assert len(performances) == len(thresholds)
+    for threshold, performance, batch_performance in zip(thresholds, performances, batch_performances):
+        decider._threshold = threshold
+        expected = reduce(Performance.add, [ids.detect_on_single_recording(recording) for recording in test])
+        assert performance.get_results() == expected.get_results()
+        assert batch_performance.get_results() == expected.get_results()
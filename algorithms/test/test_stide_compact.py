@@ -0,0 +1,43 @@
+import numpy as np
+
+from algorithms.data_preprocessor import DataPreprocessor
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.test.helper import TEST, in_memory_data_loader, recordings_from_names
+
+
+def train_stide(compact: bool, ngram_features: list = None) -> Stide:
+    if ngram_features is None:
+        ngram_features = [IntEmbedding(SyscallName())]
+    stide = Stide(Ngram(ngram_features, True, 3), compact=compact)
+    DataPreprocessor(in_memory_data_loader([]), MaxScoreThreshold(stide))
+    return stide
+
+
+def test_stide_compact():
+    stide = train_stide(False)
+    compact_stide = train_stide(True)
+    assert compact_stide._keys is not None
+    assert len(compact_stide._keys) == len(stide._normal_database)
+
+    for recording in recordings_from_names('test', TEST):
+        columns = recording.columns()
+        assert np.array_equal(compact_stide.get_results_batch(columns), stide.get_results_batch(columns), equal_nan=True)
+        for syscall in recording.syscalls():
+            assert compact_stide.get_result(syscall) == stide.get_result(syscall)
+        stide._input.new_recording()
+        compact_stide._input.new_recording()
+
+    # values larger than all trained values can not be packed and are unknown
+    first, second, third = next(iter(stide._normal_database))
+    assert compact_stide._is_known((first, second, third))
+    assert not compact_stide._is_known((first, second, third + (1 << compact_stide._bits)))
+    assert not compact_stide._is_known((first, second))
+
+    # ngrams of strings are kept in the set
+    string_stide = train_stide(True, [SyscallName()])
+    assert string_stide._keys is None
+    assert len(string_stide._normal_database) > 0
@@ -0,0 +1,46 @@
+from algorithms.decision_engines.stide import Stide
+from algorithms.features.impl.dgram import Dgram
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.ids import IDS
+from algorithms.sweep import Sweep
+from algorithms.test.helper import TEST, InMemoryDataLoader, exploit_recording, in_memory_data_loader, \
+    recordings_from_names, stide_decider
+
+
+def data_loader() -> InMemoryDataLoader:
+    return in_memory_data_loader(recordings_from_names('test', TEST) + [exploit_recording()])
+
+
+def test_sweep():
+    grid = [(ngram_length, window_length) for ngram_length in [2, 3] for window_length in [2, 3]]
+    sweep = Sweep(data_loader(), {grid_point: stide_decider(*grid_point) for grid_point in grid}, create_alarms=True)
+
+    # syscall name and int embedding are shared by all configs, ngram and stide by two configs each
+    distinct_bbs = {bb for generation in sweep._data_preprocessor.get_building_block_manager().building_block_generations
+                    for bb in generation}
+    assert len(distinct_bbs) == 1 + 2 + 2 * 2 + 2 * 4
+
+    performances = sweep.detect()
+    batch_performances = sweep.detect(batch=True)
+    for grid_point in grid:
+        ids = IDS(data_loader(), stide_decider(*grid_point), False, create_alarms=True)
+        expected = ids.detect().get_results()
+        assert performances[grid_point].get_results() == expected
+        assert batch_performances[grid_point].get_results() == expected
+
+
+def dgram_config(min_length: int) -> MaxScoreThreshold:
+    dgram = Dgram([IntEmbedding(SyscallName())], True, min_length)
+    return MaxScoreThreshold(Stide(Ngram([IntEmbedding(dgram)], True, 2)))
+
+
+def test_sweep_cached_ids():
+    # the dgrams are not merged, but their int embedding input is, the dgrams cached the id of their input
+    sweep = Sweep(data_loader(), {min_length: dgram_config(min_length) for min_length in [2, 3]})
+    performances = sweep.detect()
+    for min_length in [2, 3]:
+        expected = IDS(data_loader(), dgram_config(min_length), False).detect().get_results()
+        assert performances[min_length].get_results() == expected
@@ -0,0 +1,29 @@
+"""
+helpers for the batch evaluation of building blocks (see BuildingBlock.get_results_batch)
+"""
+import numpy as np
+
+from dataloader.syscall_columns import SyscallColumns
+
+
+def to_float_array(values: np.ndarray) -> np.ndarray:
+    """
+    converts batch results to a float array, None becomes nan
+    """
+    if values.dtype != object:
+        return values.astype(np.float64)
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def thread_groups(columns: SyscallColumns, thread_aware: bool) -> list:
+    """
+    splits the rows of the columns by thread id
+
+    returns: list of index arrays (one per thread, in order of appearance within the thread)
+             or one index array over all rows if not thread aware
+    """
+    if not thread_aware:
+        return [np.arange(len(columns))]
+    order = np.argsort(columns.thread_ids, kind='stable')
+    boundaries = np.flatnonzero(np.diff(columns.thread_ids[order])) + 1
+    return np.split(order, boundaries)
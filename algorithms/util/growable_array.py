@@ -0,0 +1,133 @@
+"""
+growable numpy buffer used to collect the training data of the decision engines
+"""
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # not available on windows
+    resource = None
+
+
+class GrowableArray:
+    """
+    collects rows of a fixed width in a preallocated numpy array
+    the capacity is doubled if the array is full, so appending is amortised O(1)
+    and no python object is kept per row
+
+    the width is taken from the first appended row if it is not given
+    scalar rows (width 0) give a 1d array
+
+    with distinct=True duplicate rows are removed (the first appearance is kept) whenever the array is full
+    and by array(), the capacity is only doubled if the distinct rows fill more than half of it
+    """
+
+    def __init__(self, dtype=np.float32, width: int = None, initial_capacity: int = 1024, distinct: bool = False):
+        self._dtype = dtype
+        self._width = width
+        self._initial_capacity = initial_capacity
+        self._distinct = distinct
+        self._data = None
+        self._length = 0
+
+    def _allocate(self, capacity: int):
+        shape = (capacity,) if self._width == 0 else (capacity, self._width)
+        data = np.empty(shape, dtype=self._dtype)
+        if self._data is not None:
+            data[:self._length] = self._data[:self._length]
+        self._data = data
+
+    def _deduplicate(self):
+        """
+        keeps the first appearance of each row, in the order of appending
+        """
+        if self._length < 2:
+            return
+        rows = self._data[:self._length]
+        _, first_indices = np.unique(rows, axis=0, return_index=True)
+        if len(first_indices) < self._length:
+            self._data[:len(first_indices)] = rows[np.sort(first_indices)]
+            self._length = len(first_indices)
+
+    def _ensure_capacity(self, needed: int):
+        """
+        makes room for needed rows in total
+        """
+        if needed <= len(self._data):
+            return
+        if self._distinct:
+            length = self._length
+            self._deduplicate()
+            needed -= length - self._length
+            # the capacity is kept if the distinct rows leave enough room
+            if 2 * needed <= len(self._data):
+                return
+        self._allocate(max(2 * len(self._data), needed))
+
+    def append(self, row):
+        """
+        appends one row, raises ValueError if its width does not match the width of the array
+        """
+        if self._data is None:
+            if self._width is None:
+                self._width = int(np.size(row)) if np.ndim(row) > 0 else 0
+            self._allocate(self._initial_capacity)
+        else:
+            self._ensure_capacity(self._length + 1)
+        self._data[self._length] = row
+        self._length += 1
+
+    def extend(self, rows):
+        """
+        appends all given rows at once
+        """
+        rows = np.asarray(rows, dtype=self._dtype)
+        if len(rows) == 0:
+            return
+        if self._data is None:
+            if self._width is None:
+                self._width = 0 if rows.ndim == 1 else int(np.prod(rows.shape[1:]))
+            self._allocate(max(self._initial_capacity, len(rows)))
+        else:
+            self._ensure_capacity(self._length + len(rows))
+        self._data[self._length:self._length + len(rows)] = rows.reshape((len(rows),) + self._data.shape[1:])
+        self._length += len(rows)
+
+    def __len__(self):
+        return self._length
+
+    def array(self) -> np.ndarray:
+        """
+        view on the appended rows (no copy), only the distinct rows with distinct=True
+        """
+        if self._distinct and self._data is not None:
+            self._deduplicate()
+        if self._data is None:
+            shape = (0,) if not self._width else (0, self._width)
+            return np.empty(shape, dtype=self._dtype)
+        return self._data[:self._length]
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._data is None else self._data.nbytes
+
+
+def print_peak_memory(name: str, peak_before: float):
+    """
+    prints by how much the peak resident memory of this process grew since peak_before (see peak_memory_mib),
+    e.g. during fit, 0 if fit stayed below an earlier peak of the process
+    """
+    peak_memory = peak_memory_mib()
+    if peak_memory is not None and peak_before is not None:
+        print(f"{name}.peak_memory_increase: {peak_memory - peak_before:.1f} MiB".rjust(27))
+
+
+def peak_memory_mib() -> float:
+    """
+    peak resident memory of this process in MiB, None if it can not be determined
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is given in KiB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
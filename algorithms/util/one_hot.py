@@ -0,0 +1,27 @@
+"""
+expansion of one hot indices (see OneHotEncoding with index_only=True) to one hot vectors
+
+the one hot vectors of the last dimension are concatenated, so the indices of an ngram
+give the same vector as the ngram over the dense one hot tuples
+"""
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+
+def one_hot_tensor(indices, num_classes: int) -> torch.Tensor:
+    """
+    expands indices of shape (..., n) to float32 one hot vectors of shape (..., n * num_classes)
+    the result stays on the device of indices (if indices is a tensor)
+    """
+    indices = torch.as_tensor(indices).long()
+    return F.one_hot(indices, num_classes).flatten(start_dim=-2).float()
+
+
+def one_hot_array(indices, num_classes: int) -> np.ndarray:
+    """
+    numpy counterpart of one_hot_tensor
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    expanded = np.eye(num_classes, dtype=np.float32)[indices]
+    return expanded.reshape(indices.shape[:-1] + (indices.shape[-1] * num_classes,))
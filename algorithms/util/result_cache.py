@@ -0,0 +1,208 @@
+"""
+bounded LRU caches for the results of building blocks (see BuildingBlock.create_cache)
+"""
+import sys
+import weakref
+from collections import OrderedDict
+
+from algorithms.util.Singleton import Singleton
+
+DEFAULT_MAX_ENTRIES = 100000
+
+# returned by ResultCache.get for keys that are not cached (None is a valid cached result)
+MISSING = object()
+
+
+def estimate_size(value) -> int:
+    """
+    estimated size of a cache key or result in bytes, includes the items of tuples and lists
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class CacheBudget(metaclass=Singleton):
+    """
+    global memory budget of all result caches of this process
+    if the estimated size of all caches exceeds max_bytes, the least recently used entries of all caches are evicted,
+    the new entry is always kept
+
+    Args:
+        max_bytes: None for no global budget
+        default_max_entries: max entries of caches created without their own limit
+    """
+
+    def __init__(self):
+        self.max_bytes = None
+        self.default_max_entries = DEFAULT_MAX_ENTRIES
+        self.used_bytes = 0
+        self._caches = weakref.WeakSet()
+        # counts the uses of all entries, the entry with the smallest count is the least recently used one
+        self._clock = 0
+
+    def configure(self, max_bytes: int = None, default_max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.default_max_entries = default_max_entries
+
+    def register(self, cache):
+        self._caches.add(cache)
+
+    def exceeded(self) -> bool:
+        return self.max_bytes is not None and self.used_bytes > self.max_bytes
+
+    def tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def evict_least_recently_used(self, receiving_cache) -> bool:
+        """
+        evicts the least recently used entry of all caches, the newest entry of receiving_cache is kept
+
+        Returns:
+            bool: False if there was no entry to evict
+        """
+        candidates = [cache for cache in list(self._caches)
+                      if len(cache) > 1 or (len(cache) == 1 and cache is not receiving_cache)]
+        if len(candidates) == 0:
+            return False
+        min(candidates, key=lambda cache: cache.oldest_use()).evict_oldest()
+        return True
+
+    def statistics(self) -> list:
+        """
+        statistics of all living caches
+        """
+        return [cache.statistics() for cache in self._caches]
+
+
+class ResultCache:
+    """
+    LRU cache of the results of one building block with hit and miss statistics
+    the least recently used entries are evicted if there are more than max_entries entries,
+    the estimated size exceeds max_bytes or the global CacheBudget is exceeded
+
+    the entries are not pickled (e.g. when a model is saved or sent to worker processes), only the configuration
+
+    Args:
+        name: name of the owning building block, used in the statistics
+        max_entries: None for the default of the CacheBudget
+        max_bytes: None for no size limit of this cache
+    """
+
+    def __init__(self, name: str, max_entries: int = None, max_bytes: int = None):
+        self.name = name
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._init_entries()
+
+    def _init_entries(self):
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._last_used = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._budget = CacheBudget()
+        self._budget.register(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        return {'name': self.name, '_max_entries': self._max_entries, '_max_bytes': self._max_bytes}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init_entries()
+
+    def get(self, key):
+        """
+        returns the cached result of key or MISSING
+        """
+        result = self._entries.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._last_used[key] = self._budget.tick()
+        return result
+
+    def put(self, key, result):
+        """
+        caches the result of key and evicts the least recently used entries if a limit is exceeded
+        """
+        if key in self._entries:
+            self._remove(key)
+        size = estimate_size(key) + estimate_size(result)
+        self._entries[key] = result
+        self._sizes[key] = size
+        self._last_used[key] = self._budget.tick()
+        self.bytes += size
+        self._budget.used_bytes += size
+
+        max_entries = self._max_entries if self._max_entries is not None else self._budget.default_max_entries
+        while len(self._entries) > 0 and (
+                (max_entries is not None and len(self._entries) > max_entries)
+                or (self._max_bytes is not None and self.bytes > self._max_bytes)):
+            self.evict_oldest()
+        while self._budget.exceeded() and self._budget.evict_least_recently_used(self):
+            pass
+
+    def get_or_calculate(self, key, calculate):
+        """
+        returns the cached result of key or caches and returns calculate(key)
+        """
+        result = self.get(key)
+        if result is MISSING:
+            result = calculate(key)
+            self.put(key, result)
+        return result
+
+    def oldest_use(self) -> int:
+        """
+        use count of the least recently used entry (see CacheBudget.tick)
+        """
+        return self._last_used[next(iter(self._entries))]
+
+    def evict_oldest(self):
+        self._remove(next(iter(self._entries)))
+        self.evictions += 1
+
+    def _remove(self, key):
+        del self._entries[key]
+        del self._last_used[key]
+        size = self._sizes.pop(key)
+        self.bytes -= size
+        self._budget.used_bytes -= size
+
+    def clear(self):
+        """
+        removes all entries, the statistics are kept
+        """
+        self._budget.used_bytes -= self.bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._last_used = {}
+        self.bytes = 0
+
+    def __del__(self):
+        # the entries of a freed cache no longer count against the budget
+        budget = getattr(self, '_budget', None)
+        if budget is not None:
+            budget.used_bytes -= self.bytes
+
+    def statistics(self) -> dict:
+        calls = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / calls if calls > 0 else 0.0,
+        }
@@ -0,0 +1,3 @@
+"""
+benchmarks of the IDS pipeline on synthetic LID-DS 2021 recordings
+"""
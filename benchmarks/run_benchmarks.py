@@ -0,0 +1,543 @@
+"""
+Benchmarks of the IDS pipeline on synthetic LID-DS 2021 recordings
+
+measures throughput (syscalls/s), latency per syscall and peak RSS of:
+    - parsing of the recordings (Recording2021.syscalls)
+    - filtering of the syscalls after and before parsing them (SyscallFilter)
+    - reading a time range of the recordings with and without the seek index
+    - data loader initialisation (metadata scan of all zips, serial and concurrent, and loading the metadata index)
+    - each feature of algorithms/features/impl (calculation on the test data after training)
+    - each decision engine (training and calculation)
+    - DataPreprocessor fit
+    - IDS.detect (without and with prefetching of the recordings) and IDS.detect_parallel
+each benchmark runs in its own process, so its peak RSS is not influenced by the others
+the results are written as json, --compare prints the change against the results of another commit
+
+example:
+    python -m benchmarks.run_benchmarks -o benchmark.json --syscalls 20000
+    python -m benchmarks.run_benchmarks -o new.json --compare benchmark.json
+    python -m benchmarks.run_benchmarks -o init.json -d <LID-DS 2021 scenario> --only loader_init
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import tempfile
+import zipfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from dataloader.direction import Direction
+from dataloader.compact_syscall import compact_syscalls
+from dataloader.scenario_index import ScenarioIndex
+from dataloader.syscall_filter import SyscallFilter
+from dataloader.data_loader_2021 import DataLoader2021
+
+from algorithms.ids import IDS
+from algorithms.data_preprocessor import DataPreprocessor
+from algorithms.util.growable_array import peak_memory_mib
+
+from algorithms.features.impl.aabb import AABB
+from algorithms.features.impl.and_decider import AndDecider
+from algorithms.features.impl.collect_syscall import CollectSyscall
+from algorithms.features.impl.concat import Concat
+from algorithms.features.impl.concat_strings import ConcatStrings
+from algorithms.features.impl.data_buffer import DataBuffer
+from algorithms.features.impl.dbscan import DBScan
+from algorithms.features.impl.dgram import Dgram
+from algorithms.features.impl.difference import Difference
+from algorithms.features.impl.entropy import Entropy
+from algorithms.features.impl.filedescriptor import FD_PARAMS, FDMode, FileDescriptor
+from algorithms.features.impl.flags import Flags
+from algorithms.features.impl.int_embedding import IntEmbedding
+from algorithms.features.impl.k_center import KCenter
+from algorithms.features.impl.max_score_threshold import MaxScoreThreshold
+from algorithms.features.impl.maximum import Maximum
+from algorithms.features.impl.min_max_scaling import MinMaxScaling
+from algorithms.features.impl.minimum import Minimum
+from algorithms.features.impl.mode import Mode
+from algorithms.features.impl.nearest_neighbour import NearestNeighbour
+from algorithms.features.impl.ngram import Ngram
+from algorithms.features.impl.ngram_minus_one import NgramMinusOne
+from algorithms.features.impl.one_hot_encoding import OneHotEncoding
+from algorithms.features.impl.one_minus_x import OneMinusX
+from algorithms.features.impl.or_decider import OrDecider
+from algorithms.features.impl.path_length import PathLength
+from algorithms.features.impl.position_in_file import PositionInFile
+from algorithms.features.impl.positional_encoding import PositionalEncoding
+from algorithms.features.impl.processID import ProcessID
+from algorithms.features.impl.process_name import ProcessName
+from algorithms.features.impl.repetition_remover import RepetitionRemover
+from algorithms.features.impl.return_value import ReturnValue
+from algorithms.features.impl.select import Select
+from algorithms.features.impl.stream_average import StreamAverage
+from algorithms.features.impl.stream_maximum import StreamMaximum
+from algorithms.features.impl.stream_minimum import StreamMinimum
+from algorithms.features.impl.stream_product import StreamProduct
+from algorithms.features.impl.stream_sum import StreamSum
+from algorithms.features.impl.stream_variance import StreamVariance
+from algorithms.features.impl.sum import Sum
+from algorithms.features.impl.syscall_name import SyscallName
+from algorithms.features.impl.syscall_start_end_times import StartEndTimes
+from algorithms.features.impl.syscalls_in_time_window import SyscallsInTimeWindow
+from algorithms.features.impl.thread_change_flag import ThreadChangeFlag
+from algorithms.features.impl.threadID import ThreadID
+from algorithms.features.impl.time_delta import TimeDelta
+from algorithms.features.impl.time_window_count import TimeWindowCount
+from algorithms.features.impl.time_window_distinct_count import TimeWindowDistinctCount
+from algorithms.features.impl.time_window_mean import TimeWindowMean
+from algorithms.features.impl.time_window_sum import TimeWindowSum
+from algorithms.features.impl.timestamp import Timestamp
+from algorithms.features.impl.unknown_flags import UnknownFlags
+from algorithms.features.impl.w2v_embedding import W2VEmbedding
+
+from algorithms.decision_engines.ae import AE
+from algorithms.decision_engines.lstm import LSTM
+from algorithms.decision_engines.mlp import MLP
+from algorithms.decision_engines.scg import SystemCallGraph
+from algorithms.decision_engines.som import Som
+from algorithms.decision_engines.stide import Stide
+
+from benchmarks.synthetic_scenario import create_scenario
+
+
+def _int_ngram(length: int = 3) -> Ngram:
+    return Ngram([IntEmbedding(SyscallName())], True, length)
+
+
+def _stide_decider() -> MaxScoreThreshold:
+    return MaxScoreThreshold(StreamSum(Stide(_int_ngram(5)), False, 100, False))
+
+
+# features of algorithms/features/impl, each created with a small typical input
+FEATURES = {
+    'AABB': lambda: AABB(_int_ngram()),
+    'AndDecider': lambda: AndDecider([MaxScoreThreshold(ReturnValue()), MaxScoreThreshold(TimeDelta(True))]),
+    'CollectSyscall': lambda: CollectSyscall([SyscallName(), ThreadID()]),
+    'Concat': lambda: Concat([_int_ngram(), ReturnValue()]),
+    'ConcatStrings': lambda: ConcatStrings(Concat([SyscallName(), ProcessName()])),
+    'DataBuffer': lambda: DataBuffer(),
+    'DBScan': lambda: DBScan(ReturnValue()),
+    'Dgram': lambda: Dgram([IntEmbedding(SyscallName())], True),
+    'Difference': lambda: Difference([ReturnValue(), TimeDelta(True)]),
+    'Entropy': lambda: Entropy(Ngram([SyscallName()], True, 5)),
+    'FileDescriptor': lambda: FileDescriptor(FDMode.ID),
+    'Flags': lambda: Flags(),
+    'IntEmbedding': lambda: IntEmbedding(SyscallName()),
+    'KCenter': lambda: KCenter(_int_ngram(), 8),
+    'MaxScoreThreshold': lambda: MaxScoreThreshold(ReturnValue()),
+    'Maximum': lambda: Maximum([ReturnValue(), TimeDelta(True)]),
+    'MinMaxScaling': lambda: MinMaxScaling(ReturnValue()),
+    'Minimum': lambda: Minimum([ReturnValue(), TimeDelta(True)]),
+    'Mode': lambda: Mode(),
+    'NearestNeighbour': lambda: NearestNeighbour(_int_ngram()),
+    'Ngram': lambda: _int_ngram(5),
+    'NgramMinusOne': lambda: NgramMinusOne(_int_ngram(5), 1),
+    'OneHotEncoding': lambda: OneHotEncoding(SyscallName()),
+    'OneHotEncoding index': lambda: OneHotEncoding(SyscallName(), index_only=True),
+    'OneMinusX': lambda: OneMinusX(ReturnValue()),
+    'OrDecider': lambda: OrDecider([MaxScoreThreshold(ReturnValue()), MaxScoreThreshold(TimeDelta(True))]),
+    'PathLength': lambda: PathLength(),
+    'PositionInFile': lambda: PositionInFile(),
+    'PositionalEncoding': lambda: PositionalEncoding(IntEmbedding(SyscallName()), 8),
+    'ProcessID': lambda: ProcessID(),
+    'ProcessName': lambda: ProcessName(),
+    'RepetitionRemover': lambda: RepetitionRemover(IntEmbedding(SyscallName()), True),
+    'ReturnValue': lambda: ReturnValue(),
+    'Select': lambda: Select(_int_ngram(5), 1, 4),
+    'StreamAverage': lambda: StreamAverage(ReturnValue(), True, 100),
+    'StreamMaximum': lambda: StreamMaximum(ReturnValue(), True, 100),
+    'StreamMinimum': lambda: StreamMinimum(ReturnValue(), True, 100),
+    'StreamProduct': lambda: StreamProduct(ReturnValue(), True, 100),
+    'StreamSum': lambda: StreamSum(ReturnValue(), True, 100),
+    'StreamVariance': lambda: StreamVariance(_int_ngram(5)),
+    'Sum': lambda: Sum([ReturnValue(), TimeDelta(True)]),
+    'SyscallName': lambda: SyscallName(),
+    'StartEndTimes': lambda: StartEndTimes(),
+    'SyscallsInTimeWindow': lambda: SyscallsInTimeWindow(1),
+    'ThreadChangeFlag': lambda: ThreadChangeFlag(_int_ngram()),
+    'ThreadID': lambda: ThreadID(),
+    'TimeDelta': lambda: TimeDelta(True),
+    'TimeWindowCount': lambda: TimeWindowCount(window_length_in_s=0.01),
+    'TimeWindowDistinctCount': lambda: TimeWindowDistinctCount(SyscallName(), 0.01),
+    'TimeWindowMean': lambda: TimeWindowMean(ReturnValue(), 0.01),
+    'TimeWindowSum': lambda: TimeWindowSum(ReturnValue(), 0.01),
+    'Timestamp': lambda: Timestamp(),
+    'UnknownFlags': lambda: UnknownFlags(),
+    'W2VEmbedding': lambda: W2VEmbedding(IntEmbedding(SyscallName()), 5, 3, 5),
+}
+
+
+def _lstm(model_dir: str) -> LSTM:
+    return LSTM(_int_ngram(4),
+                distinct_syscalls=64,
+                input_dim=3,
+                epochs=1,
+                hidden_dim=16,
+                batch_size=256,
+                model_path=os.path.join(model_dir, 'benchmark_lstm.model'),
+                force_train=True)
+
+
+def _ae_index() -> AE:
+    ohe = OneHotEncoding(SyscallName(), index_only=True)
+    return AE(Ngram([ohe], True, 3), max_training_time=10, early_stopping_epochs=2, one_hot_encoding=ohe)
+
+
+# decision engines, created with small training budgets
+DECISION_ENGINES = {
+    'Stide': lambda model_dir: Stide(_int_ngram(5)),
+    'AE': lambda model_dir: AE(Ngram([OneHotEncoding(SyscallName())], True, 3), max_training_time=10,
+                               early_stopping_epochs=2),
+    'AE index': lambda model_dir: _ae_index(),
+    'LSTM': _lstm,
+    'Som': lambda model_dir: Som(_int_ngram(), epochs=2, size=8),
+    'SystemCallGraph': lambda model_dir: SystemCallGraph(_int_ngram(2)),
+    'MLP': lambda model_dir: MLP(_int_ngram(), OneHotEncoding(IntEmbedding(SyscallName())), 16, 1, 256),
+}
+
+
+def _measure(function, num_syscalls: int = None) -> dict:
+    """
+    runs function once and measures its time and the peak RSS of this process
+    """
+    rss_before = peak_memory_mib()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    if num_syscalls is None:
+        num_syscalls = result
+    peak_rss = peak_memory_mib()
+    measurement = {
+        'seconds': seconds,
+        'syscalls': num_syscalls,
+        'syscalls_per_second': num_syscalls / seconds if seconds > 0 else None,
+        'latency_us': seconds / num_syscalls * 10 ** 6 if num_syscalls else None,
+        'peak_rss_mib': peak_rss,
+        'peak_rss_increase_mib': None if peak_rss is None else peak_rss - rss_before,
+    }
+    return measurement
+
+
+def _parse_recordings(recordings: list) -> list:
+    return [list(recording.syscalls()) for recording in recordings]
+
+
+def _calculate(bb, recordings: list, preprocessor: DataPreprocessor) -> int:
+    """
+    calculates bb on all syscalls of the given parsed recordings
+    """
+    count = 0
+    for syscalls in recordings:
+        for syscall in syscalls:
+            bb.get_result(syscall)
+        count += len(syscalls)
+        preprocessor.new_recording()
+    return count
+
+
+def benchmark_parsing(scenario_path: str, options: dict) -> dict:
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    recordings = data_loader.training_data() + data_loader.validation_data() + data_loader.test_data()
+
+    def parse():
+        count = 0
+        for recording in recordings:
+            for syscall in recording.syscalls():
+                syscall.name()
+                count += 1
+        return count
+    return _measure(parse)
+
+
+def benchmark_loader_init(scenario_path: str, options: dict) -> dict:
+    """
+    initialisation of the metadata of all recordings:
+    scan of all zips by one thread and by the thread pool and loading of the written metadata index
+    the index is written to a temporary directory, the scenario is not changed
+    """
+    def measure(create_index) -> dict:
+        start = time.perf_counter()
+        index = create_index()
+        seconds = time.perf_counter() - start
+        return {
+            'seconds': seconds,
+            'recordings': len(index.entries),
+            'recordings_per_second': len(index.entries) / seconds if seconds > 0 else None,
+        }
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index_path = os.path.join(index_dir, 'metadata_index.json')
+        return {
+            'scan_serial': measure(lambda: ScenarioIndex(scenario_path, persistent=False, workers=1)),
+            'scan_concurrent': measure(lambda: ScenarioIndex(scenario_path, index_path, workers=options.get('workers'))),
+            'load_index': measure(lambda: ScenarioIndex(scenario_path, index_path)),
+        }
+
+
+def benchmark_params(scenario_path: str, options: dict) -> dict:
+    """
+    parsing of the params needed by ReturnValue and FileDescriptor (res, fd, in_fd, out_fd)
+    with the full params dict and with the selective param scan and extractor
+    parsing_only measures the parsing of the lines without params, which is included in both
+    """
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    recordings = []
+    for recording in data_loader.test_data():
+        with zipfile.ZipFile(recording.path, 'r') as zipped:
+            recordings.append((recording.path, zipped.read(recording.name + '.sc').decode('utf-8').splitlines()))
+
+    def parsing_only():
+        count = 0
+        for path, lines in recordings:
+            for _ in compact_syscalls(path, lines):
+                count += 1
+        return count
+
+    def full_dict():
+        count = 0
+        for path, lines in recordings:
+            for syscall in compact_syscalls(path, lines):
+                params = syscall.params()
+                params.get('res')
+                [params.get(name) for name in FD_PARAMS.param_names]
+                count += 1
+        return count
+
+    def selective():
+        count = 0
+        for path, lines in recordings:
+            for syscall in compact_syscalls(path, lines):
+                syscall.param('res')
+                FD_PARAMS.extract(syscall.params_string())
+                count += 1
+        return count
+    return {'parsing_only': _measure(parsing_only), 'dict': _measure(full_dict), 'selective': _measure(selective)}
+
+
+def benchmark_filter(scenario_path: str, options: dict) -> dict:
+    """
+    reading of the closing read and write syscalls of the test data:
+    filtered after parsing every line and filtered on the split lines before parsing (SyscallFilter)
+    the measured syscalls are all lines of the recordings in both cases
+    """
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    recordings = []
+    for recording in data_loader.test_data():
+        with zipfile.ZipFile(recording.path, 'r') as zipped:
+            recordings.append((recording.path, zipped.read(recording.name + '.sc').decode('utf-8').splitlines()))
+    num_lines = sum(len(lines) for _, lines in recordings)
+    syscall_filter = SyscallFilter(Direction.CLOSE, names={'read', 'write'})
+
+    def after_parsing():
+        return [syscall.line_id for path, lines in recordings
+                for syscall in compact_syscalls(path, lines) if syscall_filter.accepts(syscall)]
+
+    def before_parsing():
+        return [syscall.line_id for path, lines in recordings
+                for syscall in compact_syscalls(path, lines, syscall_filter=syscall_filter)]
+    return {'after_parsing': _measure(after_parsing, num_lines), 'before_parsing': _measure(before_parsing, num_lines)}
+
+
+def benchmark_seek(scenario_path: str, options: dict) -> dict:
+    """
+    reading of the last tenth (by time) of every test recording:
+    all syscalls parsed and checked, building the seek indices and reading the time range with the seek indices
+    the measured syscalls are all syscalls of the recordings
+    """
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    recordings = data_loader.test_data()
+    ranges = []
+    num_syscalls = 0
+    for recording in recordings:
+        timestamps = [syscall.timestamp_unix_in_ns() for syscall in recording.syscalls()]
+        ranges.append(timestamps[0] + (timestamps[-1] - timestamps[0]) * 9 // 10)
+        num_syscalls += len(timestamps)
+
+    def parse_all():
+        return [syscall.line_id for recording, start_ns in zip(recordings, ranges)
+                for syscall in recording.syscalls() if syscall.timestamp_unix_in_ns() >= start_ns]
+
+    def seek():
+        return [syscall.line_id for recording, start_ns in zip(recordings, ranges)
+                for syscall in recording.syscalls(start_ns)]
+    return {'parse_all': _measure(parse_all, num_syscalls),
+            'build_index': _measure(lambda: [recording.seek_index() for recording in recordings], num_syscalls),
+            'seek': _measure(seek, num_syscalls)}
+
+
+def benchmark_feature(scenario_path: str, options: dict) -> dict:
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    bb = FEATURES[options['name']]()
+    preprocessor = DataPreprocessor(data_loader, bb)
+    test_data = _parse_recordings(data_loader.test_data())
+    return _measure(lambda: _calculate(bb, test_data, preprocessor))
+
+
+def benchmark_decision_engine(scenario_path: str, options: dict) -> dict:
+    data_loader = DataLoader2021(scenario_path, Direction.CLOSE)
+    decision_engine = DECISION_ENGINES[options['name']](options['model_dir'])
+    preprocessors = []
+    training_syscalls = sum(len(syscalls) for syscalls in _parse_recordings(data_loader.training_data()))
+    fit = _measure(lambda: preprocessors.append(DataPreprocessor(data_loader, decision_engine)), training_syscalls)
+    test_data = _parse_recordings(data_loader.test_data())
+    detection = _measure(lambda: _calculate(decision_engine, test_data, preprocessors[0]))
+    return {'fit': fit, 'detection': detection}
+
+
+def benchmark_data_preprocessor(scenario_path: str, options: dict) -> dict:
+    data_loader = DataLoader2021(scenario_path, Direction.CLOSE)
+    training_syscalls = sum(len(syscalls) for syscalls in _parse_recordings(data_loader.training_data()))
+    return _measure(lambda: DataPreprocessor(data_loader, _stide_decider()), training_syscalls)
+
+
+def benchmark_detection(scenario_path: str, options: dict) -> dict:
+    data_loader = DataLoader2021(scenario_path, Direction.CLOSE)
+    ids = IDS(data_loader, _stide_decider(), False, prefetch_depth=options.get('prefetch_depth', 0))
+    test_syscalls = sum(len(syscalls) for syscalls in _parse_recordings(data_loader.test_data()))
+    if options['parallel']:
+        return _measure(lambda: ids.detect_parallel(workers=options['workers']), test_syscalls)
+    return _measure(ids.detect, test_syscalls)
+
+
+def benchmark_list(workers: int) -> list:
+    """
+    all benchmarks as tuples of (name, function, options)
+    """
+    benchmarks = [('parsing', benchmark_parsing, {}),
+                  ('params', benchmark_params, {}),
+                  ('filter', benchmark_filter, {}),
+                  ('seek', benchmark_seek, {}),
+                  ('loader_init', benchmark_loader_init, {'workers': workers})]
+    for name in FEATURES:
+        benchmarks.append((f'feature/{name}', benchmark_feature, {'name': name}))
+    for name in DECISION_ENGINES:
+        benchmarks.append((f'decision_engine/{name}', benchmark_decision_engine, {'name': name}))
+    benchmarks.append(('data_preprocessor/fit', benchmark_data_preprocessor, {}))
+    benchmarks.append(('ids/detect', benchmark_detection, {'parallel': False}))
+    benchmarks.append(('ids/detect_prefetch', benchmark_detection, {'parallel': False, 'prefetch_depth': 2}))
+    benchmarks.append(('ids/detect_parallel', benchmark_detection, {'parallel': True, 'workers': workers}))
+    return benchmarks
+
+
+def _run_benchmark(args: tuple) -> dict:
+    function, scenario_path, options = args
+    return function(scenario_path, options)
+
+
+def run_isolated(function, scenario_path: str, options: dict) -> dict:
+    """
+    runs one benchmark in a new process, errors are returned as result
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = None
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            return executor.submit(_run_benchmark, (function, scenario_path, options)).result()
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+
+def _throughputs(results: dict, prefix: str = '') -> dict:
+    """
+    flattens the results to name -> syscalls per second
+    """
+    throughputs = {}
+    for name, result in results.items():
+        if 'syscalls_per_second' in result:
+            throughputs[prefix + name] = result['syscalls_per_second']
+        elif isinstance(result, dict) and 'error' not in result:
+            throughputs.update(_throughputs(result, f'{prefix}{name}/'))
+    return throughputs
+
+
+def compare(results: dict, baseline: dict):
+    """
+    prints the change of the throughput of each benchmark against the baseline
+    """
+    current = _throughputs(results['results'])
+    previous = _throughputs(baseline['results'])
+    print(f"{'benchmark':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, throughput in current.items():
+        if name in previous and previous[name] and throughput:
+            print(f"{name:<40} {previous[name]:>14.0f} {throughput:>14.0f} {throughput / previous[name] - 1:>+8.1%}")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks of the IDS pipeline on synthetic recordings')
+
+    parser.add_argument('-o', dest='output_path', action='store', type=str, required=True,
+                        help='json file the results are written to')
+    parser.add_argument('-d', dest='scenario_path', action='store', type=str, default=None,
+                        help='directory of the synthetic scenario, created if it does not exist (default: temporary)')
+    parser.add_argument('--compare', dest='baseline_path', action='store', type=str, default=None,
+                        help='json results of an earlier run to compare with')
+    parser.add_argument('--only', dest='only', action='store', type=str, default=None,
+                        help='only run benchmarks whose name contains this string')
+    parser.add_argument('--recordings', dest='recordings', action='store', type=int, default=4,
+                        help='number of training and of normal test recordings')
+    parser.add_argument('--syscalls', dest='syscalls', action='store', type=int, default=10000,
+                        help='number of syscalls per recording')
+    parser.add_argument('--threads', dest='threads', action='store', type=int, default=4,
+                        help='number of threads per recording')
+    parser.add_argument('--alphabet', dest='alphabet', action='store', type=int, default=16,
+                        help='number of distinct syscalls in normal behaviour')
+    parser.add_argument('--param-size', dest='param_size', action='store', type=int, default=16,
+                        help='length of the path parameter of each syscall')
+    parser.add_argument('--extra-params', dest='extra_params', action='store', type=int, default=0,
+                        help='number of additional data params of each syscall (param heavy scenarios)')
+    parser.add_argument('--workers', dest='workers', action='store', type=int, default=4,
+                        help='number of workers of detect_parallel and threads of the metadata scan')
+
+    args = parser.parse_args()
+
+    scenario = {
+        'num_training': args.recordings,
+        'num_validation': max(1, args.recordings // 2),
+        'num_test_normal': args.recordings,
+        'num_test_attack': max(1, args.recordings // 2),
+        'num_syscalls': args.syscalls,
+        'num_threads': args.threads,
+        'alphabet_size': args.alphabet,
+        'param_size': args.param_size,
+        'extra_params': args.extra_params,
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        scenario_path = args.scenario_path if args.scenario_path is not None else os.path.join(temp_dir, 'scenario')
+        if not os.path.isdir(scenario_path):
+            create_scenario(scenario_path, **scenario)
+        options_base = {'model_dir': os.path.join(temp_dir, 'models')}
+
+        results = {}
+        for name, function, options in benchmark_list(args.workers):
+            if args.only is not None and args.only not in name:
+                continue
+            print(f"benchmark: {name}", file=sys.stderr)
+            results[name] = run_isolated(function, scenario_path, {**options_base, **options})
+
+    report = {
+        'commit': _git_commit(),
+        'date': str(datetime.datetime.now()),
+        'python': sys.version,
+        'scenario': scenario,
+        'results': results,
+    }
+    with open(args.output_path, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    if args.baseline_path is not None:
+        with open(args.baseline_path, 'r') as baseline_file:
+            compare(report, json.load(baseline_file))
@@ -0,0 +1,159 @@
+"""
+generates synthetic scenarios in the LID-DS 2021 format for benchmarks
+
+each recording is a zip file containing the syscalls (.sc), the metadata (.json),
+a resource statistic (.res) and an empty pcap (.pcap)
+the threads of a normal recording repeat a fixed program of syscalls with small random deviations,
+after the exploit time of an attack recording syscalls outside of the alphabet appear
+"""
+import os
+import json
+import random
+import zipfile
+
+# syscalls used in the normal behaviour
+SYSCALL_ALPHABET = ['open', 'read', 'write', 'close', 'poll', 'mmap', 'munmap', 'fstat', 'lseek', 'recvfrom',
+                    'sendto', 'epoll_wait', 'futex', 'accept', 'getuid', 'brk', 'select', 'writev', 'stat',
+                    'getdents', 'fcntl', 'ioctl', 'nanosleep', 'sched_yield', 'access', 'openat', 'pread',
+                    'pwrite', 'rt_sigaction', 'rt_sigprocmask', 'madvise', 'clock_gettime']
+# syscalls only used by the exploit
+EXPLOIT_SYSCALLS = ['execve', 'clone', 'socket', 'connect', 'dup2', 'chmod', 'setuid', 'ptrace']
+
+START_TIMESTAMP = 1631209047000000000
+RESOURCE_HEADER = 'timestamp,cpu_usage,memory_usage,network_received,network_send,storage_read,storage_written'
+
+
+def _params(rng: random.Random, direction: str, param_size: int, extra_params: int = 0) -> str:
+    """
+    parameters of one syscall line, param_size is the length of the file path in the fd parameter
+    extra_params adds data-like parameters of param_size characters (e.g. the http headers of CVE-2017-7529)
+    """
+    if direction == '>':
+        path = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz/') for _ in range(param_size))
+        params = f"fd={rng.randint(3, 64)}(<f>/{path}) flags=1(O_RDONLY) mode=0 size={rng.randint(1, 65536)}"
+    else:
+        params = f"res={rng.choice([0, 0, 1, rng.randint(1, 4096), -11])}"
+    for i in range(extra_params):
+        data = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')
+                       for _ in range(param_size))
+        params += f" arg{i}={data}"
+    return params
+
+
+def generate_syscall_lines(num_syscalls: int,
+                           num_threads: int = 4,
+                           alphabet_size: int = 16,
+                           param_size: int = 16,
+                           exploit_start: int = None,
+                           seed: int = 0,
+                           extra_params: int = 0) -> list:
+    """
+    generates num_syscalls lines (enter and exit events) of one recording
+
+    Args:
+        num_threads: number of threads, each thread repeats its own program of syscalls
+        alphabet_size: number of distinct syscall names used in the normal behaviour
+        param_size: length of the file path parameter
+        exploit_start: index of the first line of the exploit, None for normal recordings
+        extra_params: number of additional data parameters of each line
+    """
+    rng = random.Random(seed)
+    alphabet = SYSCALL_ALPHABET[:max(1, min(alphabet_size, len(SYSCALL_ALPHABET)))]
+    # the programs are the same in all recordings, only the deviations depend on the seed
+    program_rng = random.Random(alphabet_size)
+    programs = [[program_rng.choice(alphabet) for _ in range(12)] for _ in range(num_threads)]
+    positions = [0] * num_threads
+    pending = [None] * num_threads
+    lines = []
+    timestamp = START_TIMESTAMP
+    while len(lines) < num_syscalls:
+        thread = rng.randrange(num_threads)
+        thread_id = 1000 + thread
+        if pending[thread] is not None:
+            # exit event of the last syscall of this thread
+            name = pending[thread]
+            direction = '<'
+            pending[thread] = None
+        else:
+            if exploit_start is not None and len(lines) >= exploit_start and rng.random() < 0.3:
+                name = rng.choice(EXPLOIT_SYSCALLS)
+            elif rng.random() < 0.02:
+                name = rng.choice(alphabet)
+            else:
+                program = programs[thread]
+                name = program[positions[thread] % len(program)]
+                positions[thread] += 1
+            direction = '>'
+            pending[thread] = name
+        timestamp += rng.randint(1000, 20000)
+        lines.append(f"{timestamp} 33 {thread_id} apache2 {thread_id} {name} {direction} "
+                     f"{_params(rng, direction, param_size, extra_params)}")
+    return lines
+
+
+def write_recording(path: str, name: str, lines: list, exploit_time: float = None):
+    """
+    writes one recording as LID-DS 2021 zip file, exploit_time in seconds
+    """
+    os.makedirs(path, exist_ok=True)
+    first_time = int(lines[0].split(' ', 1)[0]) * 10 ** -9 if len(lines) > 0 else START_TIMESTAMP * 10 ** -9
+    last_time = int(lines[-1].split(' ', 1)[0]) * 10 ** -9 if len(lines) > 0 else first_time
+    metadata = {
+        'container': [
+            {'ip': '192.168.0.2', 'name': 'victim', 'role': 'victim'},
+            {'ip': '192.168.0.3', 'name': 'normal', 'role': 'normal'},
+        ],
+        'exploit': exploit_time is not None,
+        'exploit_name': 'synthetic' if exploit_time is not None else '',
+        'image': 'synthetic',
+        'recording_time': int(last_time - first_time) + 1,
+        'time': {
+            'container_ready': {'absolute': first_time, 'source': 'T0'},
+            'warmup_end': {'absolute': first_time, 'source': 'T0'},
+            'exploit': [] if exploit_time is None else [{'absolute': exploit_time,
+                                                        'name': 'synthetic',
+                                                        'source': 'EXPLOIT'}],
+        },
+    }
+    with zipfile.ZipFile(os.path.join(path, name + '.zip'), 'w', zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr(name + '.sc', '\n'.join(lines) + '\n')
+        zipped.writestr(name + '.json', json.dumps(metadata))
+        zipped.writestr(name + '.res', RESOURCE_HEADER + f'\n{int(first_time)},1.0,1000,0,0,0,0\n')
+        zipped.writestr(name + '.pcap', b'')
+
+
+def create_scenario(scenario_path: str,
+                    num_training: int = 4,
+                    num_validation: int = 2,
+                    num_test_normal: int = 4,
+                    num_test_attack: int = 2,
+                    num_syscalls: int = 10000,
+                    num_threads: int = 4,
+                    alphabet_size: int = 16,
+                    param_size: int = 16,
+                    seed: int = 0,
+                    extra_params: int = 0) -> str:
+    """
+    creates a synthetic LID-DS 2021 scenario (training, validation, test/normal, test/normal_and_attack)
+    the exploit of each attack recording starts in the middle of the recording
+
+    returns: the scenario path
+    """
+    data_sets = [('training', num_training, False),
+                 ('validation', num_validation, False),
+                 (os.path.join('test', 'normal'), num_test_normal, False),
+                 (os.path.join('test', 'normal_and_attack'), num_test_attack, True)]
+    recording_seed = seed
+    for data_set, num_recordings, attack in data_sets:
+        for i in range(num_recordings):
+            recording_seed += 1
+            exploit_start = num_syscalls // 2 if attack else None
+            lines = generate_syscall_lines(num_syscalls, num_threads, alphabet_size, param_size,
+                                           exploit_start=exploit_start, seed=recording_seed,
+                                           extra_params=extra_params)
+            exploit_time = None
+            if attack:
+                exploit_time = int(lines[exploit_start].split(' ', 1)[0]) * 10 ** -9
+            name = f"{os.path.basename(data_set)}_{i}"
+            write_recording(os.path.join(scenario_path, data_set), name, lines, exploit_time)
+    return scenario_path
@@ -0,0 +1,37 @@
+from dataloader.dataloader_factory import dataloader_factory
+from dataloader.direction import Direction
+
+from benchmarks.run_benchmarks import benchmark_parsing
+from benchmarks.synthetic_scenario import create_scenario
+
+
+def test_synthetic_scenario(tmp_path):
+    scenario_path = create_scenario(str(tmp_path / 'scenario'),
+                                    num_training=2,
+                                    num_validation=1,
+                                    num_test_normal=1,
+                                    num_test_attack=1,
+                                    num_syscalls=200)
+    data_loader = dataloader_factory(scenario_path, direction=Direction.OPEN)
+
+    assert len(data_loader.training_data()) == 2
+    assert len(data_loader.validation_data()) == 1
+    test_data = data_loader.test_data()
+    assert len(test_data) == 2
+
+    exploits = [recording for recording in test_data if recording.metadata()['exploit']]
+    assert len(exploits) == 1
+    assert exploits[0].metadata()['time']['exploit'][0]['absolute'] > 0
+
+    # 200 lines of enter and exit events, only the enter events are used with Direction.OPEN
+    for recording in data_loader.training_data():
+        syscalls = list(recording.syscalls())
+        assert 90 < len(syscalls) < 110
+        assert all(syscall.direction() == Direction.OPEN for syscall in syscalls)
+
+
+def test_benchmark_parsing(tmp_path):
+    scenario_path = create_scenario(str(tmp_path / 'scenario'), 1, 1, 1, 1, num_syscalls=200)
+    result = benchmark_parsing(scenario_path, {})
+    assert result['syscalls'] == 4 * 200
+    assert result['syscalls_per_second'] > 0
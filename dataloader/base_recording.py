@@ -1,4 +1,5 @@
 from dataloader.syscall import Syscall
+from dataloader.syscall_columns import SyscallColumns
 from typing import Generator
 
 class BaseRecording:
@@ -15,6 +16,12 @@ class BaseRecording:
         """
         raise NotImplementedError()
 
+    def columns(self) -> SyscallColumns:
+        """
+            all syscalls of the recording as columns for batch evaluation
+        """
+        return SyscallColumns.from_syscalls(list(self.syscalls()))
+
     def packets(self):
         """
             only for 2021
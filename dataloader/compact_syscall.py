@@ -0,0 +1,217 @@
+"""
+memory bounded representation of LID-DS 2021 system calls
+
+memory per syscall and parsing speed (parsing and name(), thread_id(), timestamp_unix_in_ns() of
+LID-DS 2021 lines of about 110 characters, CPython 3.11, 64 bit):
+
+    type                            memory per syscall    time per syscall
+    Syscall2021                     ~1030 bytes           ~3.2 us
+    CompactSyscall2021              ~ 370 bytes           ~2.9 us
+    CompactSyscall2021 flyweight    constant              ~2.5 us
+
+the measurement can be repeated with python -m dataloader.compact_syscall
+"""
+import base64
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Generator, Iterable, Tuple
+
+from dataloader.direction import Direction
+from dataloader.param_extractor import scan_param
+from dataloader.syscall import Syscall
+
+# interned syscall names and process names, equal names of all syscalls share one string object
+_NAME_TABLE = {}
+
+_DIRECTIONS = {'>': Direction.OPEN, '<': Direction.CLOSE}
+
+
+def intern_name(name: str) -> str:
+    """
+    returns the shared string object of the given syscall or process name
+    """
+    interned = _NAME_TABLE.get(name)
+    if interned is None:
+        interned = _NAME_TABLE[name] = sys.intern(name)
+    return interned
+
+
+class CompactSyscall2021(Syscall):
+    """
+    represents one system call of an LID-DS 2021 recording with a fixed memory layout (__slots__)
+
+    the fixed fields are parsed eagerly into ints, syscall and process names are interned,
+    only the unparsed parameter string is kept and parsed on demand
+    same interface and results as Syscall2021
+
+    an instance can be refilled with the next line (see compact_syscalls with flyweight=True),
+    use copy() to keep a syscall beyond the next line in that case
+    """
+    __slots__ = ['_timestamp_unix', '_user_id', '_process_id', '_process_name', '_thread_id', '_name',
+                 '_direction', '_params_string', '_params']
+
+    def __init__(self, recording_path: str, syscall_line: str, line_id: int = -1):
+        self.recording_path = recording_path
+        self.refill(syscall_line, line_id)
+
+    def refill(self, syscall_line: str, line_id: int = -1):
+        """
+        parses the given line into this instance, replaces all attributes of the previous line
+        """
+        self.fill(syscall_line.split(' ', 7), line_id)
+
+    def fill(self, parts: list, line_id: int = -1):
+        """
+        same as refill with the already split line (split(' ', 7)), e.g. after it was checked by a SyscallFilter
+        """
+        self.line_id = line_id
+        self._timestamp_unix = int(parts[0])
+        self._user_id = int(parts[1])
+        self._process_id = int(parts[2])
+        self._process_name = intern_name(parts[3])
+        self._thread_id = int(parts[4])
+        self._name = intern_name(parts[5])
+        self._direction = _DIRECTIONS.get(parts[6])
+        self._params_string = parts[7] if len(parts) > 7 else ''
+        self._params = None
+
+    def copy(self):
+        """
+        independent copy of this syscall
+        """
+        syscall = CompactSyscall2021.__new__(CompactSyscall2021)
+        syscall.recording_path = self.recording_path
+        syscall.line_id = self.line_id
+        syscall._timestamp_unix = self._timestamp_unix
+        syscall._user_id = self._user_id
+        syscall._process_id = self._process_id
+        syscall._process_name = self._process_name
+        syscall._thread_id = self._thread_id
+        syscall._name = self._name
+        syscall._direction = self._direction
+        syscall._params_string = self._params_string
+        syscall._params = self._params
+        return syscall
+
+    def timestamp_unix_in_ns(self) -> int:
+        return self._timestamp_unix
+
+    def timestamp_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self._timestamp_unix * 10 ** -9)
+
+    def user_id(self) -> int:
+        return self._user_id
+
+    def process_id(self) -> int:
+        return self._process_id
+
+    def process_name(self) -> str:
+        return self._process_name
+
+    def thread_id(self) -> int:
+        return self._thread_id
+
+    def name(self) -> str:
+        return self._name
+
+    def direction(self) -> Direction:
+        return self._direction
+
+    def params_string(self) -> str:
+        return self._params_string
+
+    def params(self) -> dict:
+        """
+        parses the parameter string into a dict the same way Syscall2021 does
+        """
+        if self._params is None:
+            self._params = {}
+            if len(self._params_string) > 0:
+                for param in self._params_string.split(' '):
+                    split = param.split('=', 1)
+                    if len(split) == 2:
+                        self._params[split[0]] = split[1]
+        return self._params
+
+    def param(self, param_name: str, b64decode: bool = False) -> Tuple[bytes, str]:
+        """
+        scans the parameter string for the requested parameter, the dict is only used if it was built already
+        """
+        if self._params is None:
+            param_value = scan_param(self._params_string, param_name)
+        else:
+            param_value = self._params.get(param_name)
+        if param_value is not None and b64decode:
+            return base64.b64decode(param_value)
+        return param_value
+
+
+def compact_syscalls(recording_path: str,
+                     lines: Iterable[str],
+                     flyweight: bool = False,
+                     syscall_filter=None,
+                     first_line_id: int = 1) -> Generator[CompactSyscall2021, None, None]:
+    """
+    parses the given lines (line ids start at first_line_id, 1 unless the lines start in the middle of a recording)
+
+    Args:
+        flyweight: yields the same instance refilled with each line,
+                   only usable if no consumer keeps a syscall after the next one was yielded
+                   (building blocks detect the refilled instance by its line id)
+        syscall_filter: SyscallFilter checked on the split line, rejected lines are never parsed
+                        (the line ids of the remaining syscalls stay the line numbers in the recording)
+    """
+    syscall = None
+    for line_id, line in enumerate(lines, start=first_line_id):
+        parts = line.split(' ', 7)
+        if syscall_filter is not None and not syscall_filter.accepts_2021(parts):
+            continue
+        if not flyweight or syscall is None:
+            syscall = CompactSyscall2021.__new__(CompactSyscall2021)
+            syscall.recording_path = recording_path
+        syscall.fill(parts, line_id)
+        yield syscall
+
+
+def _compare(num_lines: int = 100000):
+    """
+    prints memory per syscall and parsing time of Syscall2021 and CompactSyscall2021
+    """
+    from dataloader.syscall_2021 import Syscall2021
+    lines = [f"{1631209047000000000 + i * 1000} 33 {1000 + i % 7} apache2 {1000 + i % 7} "
+             f"{['open', 'read', 'write', 'close'][i % 4]} > fd=13(<f>/var/www/html/index.html) "
+             f"flags=1(O_RDONLY) mode=0 size=4096" for i in range(num_lines)]
+
+    def parse(factory):
+        for syscall in factory():
+            syscall.name()
+            syscall.thread_id()
+            syscall.timestamp_unix_in_ns()
+
+    candidates = [
+        ('Syscall2021', lambda: (Syscall2021('', line, line_id) for line_id, line in enumerate(lines, start=1))),
+        ('CompactSyscall2021', lambda: compact_syscalls('', lines)),
+        ('CompactSyscall2021 flyweight', lambda: compact_syscalls('', lines, flyweight=True)),
+    ]
+    for name, factory in candidates:
+        tracemalloc.start()
+        kept = [syscall for syscall in factory()] if 'flyweight' not in name else None
+        if kept is not None:
+            for syscall in kept:
+                syscall.name()
+                syscall.thread_id()
+                syscall.timestamp_unix_in_ns()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        start = time.perf_counter()
+        parse(factory)
+        elapsed = time.perf_counter() - start
+        per_syscall = f"{memory / num_lines:.0f} bytes" if 'flyweight' not in name else 'constant'
+        print(f"{name:<30} {per_syscall:>12} per syscall {elapsed / num_lines * 10 ** 6:>6.2f} us per syscall")
+
+
+if __name__ == '__main__':
+    _compare()
@@ -6,6 +6,7 @@ from tqdm import tqdm
 
 from dataloader.direction import Direction
 from dataloader.recording_2019 import Recording2019
+from dataloader.syscall_filter import SyscallFilter
 from dataloader.base_data_loader import BaseDataLoader
 
 TRAINING_SIZE = 200
@@ -19,9 +20,12 @@ class DataLoader2019(BaseDataLoader):
 
     Args:
           scenario_path (str): path to LID-DS 2019 scenario
+          cache_path (str): optional directory for the columnar recording cache
+          syscall_filter (SyscallFilter): optional filter of the syscalls of all recordings
 
     """
-    def __init__(self, scenario_path: str, direction: Direction = Direction.OPEN):
+    def __init__(self, scenario_path: str, direction: Direction = Direction.OPEN, cache_path: str = None,
+                 syscall_filter: SyscallFilter = None):
         super().__init__(scenario_path)
         self.scenario_path = scenario_path
         self._runs_path = os.path.join(scenario_path, 'runs.csv')
@@ -29,6 +33,8 @@ class DataLoader2019(BaseDataLoader):
         self._exploit_recordings = None
         self._distinct_syscalls = None
         self._direction = direction
+        self._cache_path = cache_path
+        self._syscall_filter = syscall_filter
 
         self.extract_recordings()
 
@@ -74,7 +80,8 @@ class DataLoader2019(BaseDataLoader):
             exploit_recordings = []
 
             for recording_line in recording_reader:
-                recording = Recording2019(recording_line, self.scenario_path, self._direction)
+                recording = Recording2019(recording_line, self.scenario_path, self._direction, self._cache_path,
+                                          self._syscall_filter)
                 if not recording.metadata()['exploit']:
                     normal_recordings.append(recording)
                 else:
@@ -1,8 +1,6 @@
 import os
-import glob
 import json
 import errno
-import zipfile
 import nest_asyncio
 from tqdm import tqdm
 
@@ -10,11 +8,9 @@ from enum import Enum
 
 from dataloader.direction import Direction
 from dataloader.recording_2021 import Recording2021
+from dataloader.syscall_filter import SyscallFilter
 from dataloader.base_data_loader import BaseDataLoader
-
-TRAINING = 'training'
-VALIDATION = 'validation'
-TEST = 'test'
+from dataloader.scenario_index import ScenarioIndex, TRAINING, VALIDATION, TEST
 
 
 class RecordingType(Enum):
@@ -81,6 +77,12 @@ class DataLoader2021(BaseDataLoader):
 
         Args:
         scenario_path (str): path of scenario folder
+        cache_path (str): optional directory for the columnar recording cache
+        flyweight (bool): the recordings reuse one syscall object while parsing (see Recording2021)
+        metadata_index (bool): load the metadata from the sidecar index of the scenario (see ScenarioIndex),
+                               otherwise all zips are scanned on construction
+                               the recordings answer metadata() from memory in both cases
+        syscall_filter (SyscallFilter): optional filter of the syscalls of all recordings (see Recording2021)
 
         Attributes:
         scenario_path (str): stored Arg
@@ -88,19 +90,27 @@ class DataLoader2021(BaseDataLoader):
 
     """
 
-    def __init__(self, scenario_path, direction: Direction = Direction.BOTH):
+    def __init__(self, scenario_path, direction: Direction = Direction.BOTH, cache_path: str = None,
+                 flyweight: bool = False, metadata_index: bool = True, syscall_filter: SyscallFilter = None):
         """
 
             Save path of scenario and create metadata_list.
 
             Parameter:
             scenario_path (str): path of assosiated folder
+            cache_path (str): if set every recording is parsed once and read from this cache afterwards
+            metadata_index (bool): if set the metadata is collected once and loaded from the index afterwards
+            syscall_filter (SyscallFilter): the recordings skip the rejected syscalls before parsing them
 
         """
         super().__init__(scenario_path)
         if os.path.isdir(scenario_path):
             self.scenario_path = scenario_path
             self._direction = direction
+            self._cache_path = cache_path
+            self._flyweight = flyweight
+            self._syscall_filter = syscall_filter
+            self.index = ScenarioIndex(scenario_path, persistent=metadata_index)
             self._metadata_list = self.collect_metadata()
             self._distinct_syscalls = None
         else:
@@ -195,11 +205,21 @@ class DataLoader2021(BaseDataLoader):
                 if self._metadata_list[category][file]['recording_type'] == recording_type:
                     recordings.append(Recording2021(name=file,
                                                 path=self._metadata_list[category][file]['path'],
-                                                direction=self._direction))
+                                                direction=self._direction,
+                                                cache_path=self._cache_path,
+                                                flyweight=self._flyweight,
+                                                metadata=self._metadata_list[category][file]['metadata'],
+                                                check=False,
+                                                syscall_filter=self._syscall_filter))
             else:
                 recordings.append(Recording2021(name=file,
                                             path=self._metadata_list[category][file]['path'],
-                                            direction=self._direction))
+                                            direction=self._direction,
+                                            cache_path=self._cache_path,
+                                            flyweight=self._flyweight,
+                                            metadata=self._metadata_list[category][file]['metadata'],
+                                            check=False,
+                                            syscall_filter=self._syscall_filter))
         return recordings
 
     def collect_metadata(self) -> dict:
@@ -208,7 +228,8 @@ class DataLoader2021(BaseDataLoader):
             Create dictionary which contains following information about recording:
                 first key: Category of recording : training, validataion, test
                 second key: Name of recording
-                value : {recording type: str, path: str}
+                value : {recording type: str, path: str, metadata: dict}
+            taken from the metadata index, which validates the recordings while scanning them
 
             Returns:
             dict: metadata_dict containing type of recording for every recorded file
@@ -219,40 +240,12 @@ class DataLoader2021(BaseDataLoader):
             'validation': {},
             'test': {}
         }
-        training_files = glob.glob(self.scenario_path + f'/{TRAINING}/*.zip')
-        val_files = glob.glob(self.scenario_path + f'/{VALIDATION}/*.zip')
-        test_files = glob.glob(self.scenario_path + f'/{TEST}/*/*.zip')
-        # create list of all files
-        all_files = training_files + val_files + test_files
-        for file in all_files:
-            try:
-                with zipfile.ZipFile(file, 'r') as zip_ref:
-                    # remove zip extension and create json file name
-                    json_file_name = get_file_name(file) + '.json'
-                    with zip_ref.open(json_file_name) as unzipped:
-                        unzipped_byte_json = unzipped.read()
-                        unzipped_json = json.loads(unzipped_byte_json.decode('utf8'))
-                        recording_type = get_type_of_recording(unzipped_json)
-                        temp_dict = {
-                            'recording_type': recording_type,
-                            'path': file
-                        }
-                        if TRAINING in os.path.dirname(file):
-                            metadata_dict[TRAINING][get_file_name(file)] = temp_dict
-                        elif VALIDATION in os.path.dirname(file):
-                            metadata_dict[VALIDATION][get_file_name(file)] = temp_dict
-                        elif TEST in os.path.dirname(file):
-                            metadata_dict[TEST][get_file_name(file)] = temp_dict
-                        else:
-                            raise TypeError()
-            except zipfile.BadZipFile:
-                name = file
-                if not os.path.isfile('missing_files.txt'):
-                    with open('missing_files.txt', 'w+') as file:
-                        file.write(f'Bad zipfile in recording: {name}. \n')
-                else:
-                    with open('missing_files.txt', 'a') as file:
-                        file.write(f'Bad zipfile in recording: {name}. \n')
+        for relative_path, entry in self.index.entries.items():
+            metadata_dict[entry['category']][entry['name']] = {
+                'recording_type': RecordingType[entry['recording_type']],
+                'path': self.index.path(relative_path),
+                'metadata': entry['metadata']
+            }
         return metadata_dict
 
     def distinct_syscalls_training_data(self) -> int:
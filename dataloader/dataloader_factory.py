@@ -2,16 +2,24 @@ from os import listdir, path
 
 from dataloader.direction import Direction
 from dataloader.base_data_loader import BaseDataLoader
+from dataloader.syscall_filter import filter_from_kwargs
 from dataloader.data_loader_2019 import DataLoader2019
 from dataloader.data_loader_2021 import DataLoader2021
 from dataloader.dataloader_adfa_ld import DataLoaderADFALD
 from dataloader.dataloader_real_world import DataLoaderRealWorld
 
 
-def dataloader_factory(scenario_path: str, direction: Direction = Direction.OPEN, **kwargs) -> BaseDataLoader:
+def dataloader_factory(scenario_path: str,
+                       direction: Direction = Direction.OPEN,
+                       cache_path: str = None,
+                       **kwargs) -> BaseDataLoader:
     """
     creates DataLoader 2019 or 2021 by detecting the dataset specific file structure
+    cache_path enables the columnar recording cache for LID-DS 2019, LID-DS 2021 and real world data
+    a SyscallFilter for LID-DS 2019 and 2021 is given as syscall_filter or by its conditions
+    (names, excluded_names, process_names, thread_ids, start_ns, end_ns), the rejected lines are never parsed
     """
+    syscall_filter = filter_from_kwargs(kwargs)
     file_list = listdir(scenario_path)
     file_list.sort()
 
@@ -30,7 +38,7 @@ def dataloader_factory(scenario_path: str, direction: Direction = Direction.OPEN
     # if base_file_extension == '.txt' or base_file_extension == '.csv':
     if "runs.csv" in file_list:
         print('LID-DS 2019 detected, initializing Dataloader')
-        return DataLoader2019(scenario_path, direction)
+        return DataLoader2019(scenario_path, direction, cache_path=cache_path, syscall_filter=syscall_filter)
     elif base_file_extension == '':
         try:
             normal_path = path.join(scenario_path, 'test', 'normal')
@@ -40,10 +48,12 @@ def dataloader_factory(scenario_path: str, direction: Direction = Direction.OPEN
                 _, sub_file_extension = path.splitext(example_file)
                 if sub_file_extension == '.zip':
                     print('LID-DS 2021 detected, initializing Dataloader')
-                    return DataLoader2021(scenario_path, direction)
+                    return DataLoader2021(scenario_path, direction, cache_path=cache_path,
+                                          syscall_filter=syscall_filter)
                 else:
                     raise_value_error()
             elif path.isdir(adfa_path):
+                reject_syscall_filter(syscall_filter, 'ADFA-LD')
                 if kwargs:
                     return DataLoaderADFALD(scenario_path,
                                             kwargs['attack'],
@@ -57,14 +67,29 @@ def dataloader_factory(scenario_path: str, direction: Direction = Direction.OPEN
                 _, sub_file_extension = path.splitext(example_file)
                 if sub_file_extension == '.zip' or sub_file_extension == '.scap':
                     print('Real world data detected, initializing Dataloader')
-                    return DataLoaderRealWorld(scenario_path, direction)
+                    reject_syscall_filter(syscall_filter, 'real world data')
+                    return DataLoaderRealWorld(scenario_path, direction, cache_path=cache_path)
                 else:
                     raise_value_error()
+        except UnsupportedFilterError:
+            raise
         except Exception:
             raise_value_error()
     else:
         raise_value_error()
 
 
+class UnsupportedFilterError(ValueError):
+    pass
+
+
+def reject_syscall_filter(syscall_filter, dataset: str):
+    """
+    the data loaders of ADFA-LD and real world data read their recordings without SyscallFilter
+    """
+    if syscall_filter is not None:
+        raise UnsupportedFilterError(f'syscall filters are only supported for LID-DS 2019 and 2021, not for {dataset}')
+
+
 def raise_value_error():
     raise ValueError('invalid dataset structure, please use LID-DS 2019, LID-DS 2021  or real world dataset scenarios')
@@ -89,6 +89,7 @@ class DataLoaderRealWorld(BaseDataLoader):
 
         Args:
         scenario_path (str): path of scenario folder
+        cache_path (str): optional directory for the columnar recording cache
 
         Attributes:
         scenario_path (str): stored Arg
@@ -98,13 +99,15 @@ class DataLoaderRealWorld(BaseDataLoader):
 
     def __init__(self,
                  scenario_path: str,
-                 direction: Direction = Direction.BOTH):
+                 direction: Direction = Direction.BOTH,
+                 cache_path: str = None):
         """
 
             Save path of scenario and create metadata_list.
 
             Parameter:
             scenario_path (str): path of assosiated folder
+            cache_path (str): if set every recording is parsed once and read from this cache afterwards
 
         """
         super().__init__(scenario_path)
@@ -112,6 +115,7 @@ class DataLoaderRealWorld(BaseDataLoader):
         if os.path.isdir(scenario_path):
             self.scenario_path = scenario_path
             self._direction = direction
+            self._cache_path = cache_path
             self._metadata_dict = self.collect_metadata()
             self._distinct_syscalls = None
         else:
@@ -188,7 +192,8 @@ class DataLoaderRealWorld(BaseDataLoader):
             # check filter
             recordings.append(RecordingRealWorld(name=file,
                                                  path=self._metadata_dict[category][file]['sc_path'],
-                                                 direction=self._direction))
+                                                 direction=self._direction,
+                                                 cache_path=self._cache_path))
         return recordings
 
     def collect_metadata(self) -> dict:
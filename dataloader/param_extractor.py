@@ -0,0 +1,63 @@
+"""
+extraction of single parameters from the unparsed parameter string of a syscall
+without splitting all parameters into a dict
+
+both give the same values as Syscall2021.params(): parameters are separated by single spaces,
+name and value are separated by the first '=' and a later parameter with the same name wins
+"""
+
+
+def _scan(params_string: str, key: str):
+    """
+    value of the parameter starting with key ('name=') or None
+    """
+    position = params_string.rfind(key)
+    # the key has to start a parameter (e.g. fd= is not part of in_fd=)
+    while position > 0 and params_string[position - 1] != ' ':
+        position = params_string.rfind(key, 0, position)
+    if position < 0:
+        return None
+    start = position + len(key)
+    end = params_string.find(' ', start)
+    if end < 0:
+        return params_string[start:]
+    return params_string[start:end]
+
+
+def scan_param(params_string: str, param_name: str):
+    """
+    scans the parameter string for one named parameter
+
+    Returns:
+        str: the value of the parameter or None if it is not present
+    """
+    return _scan(params_string, param_name + '=')
+
+
+class ParamExtractor:
+    """
+    extracts a fixed set of parameters, the search keys are built once
+    each parameter is found with a substring search, which is faster than a regular expression
+    or splitting all parameters for the usual parameter strings of a few hundred characters
+
+    Args:
+        param_names: names of the extracted parameters
+    """
+
+    def __init__(self, param_names: list):
+        self.param_names = list(param_names)
+        self._keys = [(name, name + '=') for name in self.param_names]
+
+    def extract(self, params_string: str) -> dict:
+        """
+        Returns:
+            dict: name -> value of the present parameters of the set
+        """
+        params = {}
+        for name, key in self._keys:
+            # most syscalls have none of the parameters
+            if key in params_string:
+                value = _scan(params_string, key)
+                if value is not None:
+                    params[name] = value
+        return params
@@ -0,0 +1,162 @@
+"""
+read-ahead of recordings: the next recordings are decompressed and parsed in the background
+while the building blocks run on the current one
+
+example:
+    for recording in prefetch(data_loader.test_data(), depth=2):
+        for syscall in recording.syscalls():
+            ...
+"""
+import os
+import zipfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Generator, List
+
+from dataloader.base_recording import BaseRecording
+from dataloader.syscall import Syscall
+from dataloader.syscall_columns import SyscallColumns
+
+
+class PrefetchedRecording(BaseRecording):
+    """
+    recording with already parsed syscalls, everything else is answered by the wrapped recording
+
+    Args:
+        recording: the wrapped recording
+        syscalls: all syscalls of the recording
+        raw_size: size of the raw syscall text, used for the memory ceiling of prefetch
+    """
+
+    def __init__(self, recording: BaseRecording, syscalls: List[Syscall], raw_size: int = 0):
+        super().__init__()
+        self.recording = recording
+        self.raw_size = raw_size
+        self._syscalls = syscalls
+
+    def __getattr__(self, name):
+        # name, path and the other attributes of the wrapped recording
+        if name == 'recording':
+            raise AttributeError(name)
+        return getattr(self.recording, name)
+
+    def syscalls(self, start_ns: int = None, end_ns: int = None) -> Generator[Syscall, None, None]:
+        """
+        the buffered syscalls, with start_ns and/or end_ns only those with start_ns <= timestamp < end_ns
+        (same arguments as Recording2021.syscalls)
+        """
+        if start_ns is None and end_ns is None:
+            yield from self._syscalls
+            return
+        for syscall in self._syscalls:
+            timestamp = syscall.timestamp_unix_in_ns()
+            if (start_ns is None or timestamp >= start_ns) and (end_ns is None or timestamp < end_ns):
+                yield syscall
+
+    def columns(self) -> SyscallColumns:
+        return SyscallColumns.from_syscalls(self._syscalls)
+
+    def packets(self):
+        return self.recording.packets()
+
+    def resource_stats(self) -> list:
+        return self.recording.resource_stats()
+
+    def metadata(self) -> dict:
+        return self.recording.metadata()
+
+    def check_recording(self) -> bool:
+        return self.recording.check_recording()
+
+
+def raw_size(recording: BaseRecording) -> int:
+    """
+    size of the uncompressed syscall text of the recording in bytes (0 if unknown)
+    the parsed syscalls take about three times as much memory
+    """
+    path = getattr(recording, 'path', None)
+    if path is None or not os.path.isfile(path):
+        return 0
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, 'r') as zipped:
+            infos = zipped.infolist()
+        sc_infos = [info for info in infos if info.filename.endswith('.sc')]
+        return sum(info.file_size for info in (sc_infos if len(sc_infos) > 0 else infos))
+    return os.path.getsize(path)
+
+
+def load_recording(recording: BaseRecording, size: int = 0) -> PrefetchedRecording:
+    """
+    decompresses and parses all syscalls of the recording
+    syscalls of a flyweight recording are copied, since the recording refills one object
+    """
+    if getattr(recording, '_flyweight', False):
+        syscalls = [syscall.copy() for syscall in recording.syscalls()]
+    else:
+        syscalls = list(recording.syscalls())
+    return PrefetchedRecording(recording, syscalls, size)
+
+
+def prefetch(recordings: list,
+             depth: int = 2,
+             max_bytes: int = None,
+             workers: int = 1,
+             processes: bool = False) -> Generator[BaseRecording, None, None]:
+    """
+    yields the recordings in their order as PrefetchedRecordings,
+    up to depth following recordings are loaded in the background meanwhile
+
+    threads overlap the decompression (zlib releases the GIL) and the reading with the building blocks,
+    processes also parse in parallel but send the parsed syscalls back to this process
+
+    Args:
+        recordings: the recordings, e.g. data_loader.test_data()
+        depth: max number of recordings loaded ahead of the current one (queue depth), 0 disables prefetching
+        max_bytes: max raw size (see raw_size) of all recordings loaded ahead,
+                   the next recording is always loaded if the queue is empty
+        workers: number of threads or processes loading recordings
+        processes: load in processes instead of threads
+    """
+    if depth <= 0:
+        yield from recordings
+        return
+
+    if processes:
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    pending = deque()
+    queued_bytes = 0
+    remaining = iter(recordings)
+    next_recording = next(remaining, None)
+    next_size = None
+
+    def fill():
+        # starts loading the next recordings up to the depth and memory ceiling of the queue
+        nonlocal queued_bytes, next_recording, next_size
+        while next_recording is not None and len(pending) < depth:
+            if next_size is None:
+                next_size = raw_size(next_recording)
+            if max_bytes is not None and len(pending) > 0 and queued_bytes + next_size > max_bytes:
+                return
+            pending.append((executor.submit(load_recording, next_recording, next_size), next_size))
+            queued_bytes += next_size
+            next_recording = next(remaining, None)
+            next_size = None
+
+    try:
+        fill()
+        while len(pending) > 0:
+            future, size = pending.popleft()
+            recording = future.result()
+            queued_bytes -= size
+            # the following recordings are loaded while the caller works on this one
+            fill()
+            yield recording
+    finally:
+        for future, _ in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
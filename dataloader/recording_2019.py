@@ -8,6 +8,9 @@ from typing import Generator
 from distutils.util import strtobool
 from dataloader.direction import Direction
 from dataloader.base_recording import BaseRecording
+from dataloader.recording_cache import RecordingCache
+from dataloader.syscall_columns import SyscallColumns
+from dataloader.syscall_filter import SyscallFilter
 from dataloader.syscall_2019 import Syscall, Syscall2019
 
 
@@ -28,14 +31,26 @@ class Recording2019(BaseRecording):
     Args:
         recording_data_list (list): runs.csv line as list
         base_path (str): the base path of the LID-DS 2019 scenario
+        cache_path (str): directory of the columnar recording cache, caching is disabled if None
+        syscall_filter (SyscallFilter): only the syscalls accepted by the filter (and of the direction) are yielded,
+                                        the other lines are skipped before they are parsed, switch is always skipped
 
     """
-    def __init__(self, recording_data_list: list, base_path: str, direction: Direction):
+    def __init__(self, recording_data_list: list, base_path: str, direction: Direction, cache_path: str = None,
+                 syscall_filter: SyscallFilter = None):
         super().__init__()
         self.name = recording_data_list[RecordingDataParts.RECORDING_NAME]
         self.path = os.path.join(base_path, f'{self.name}.txt')
         self.recording_data_list = recording_data_list
         self._direction = direction
+        self._filter = (syscall_filter if syscall_filter is not None else SyscallFilter()) \
+            .with_direction(direction).excluding(['switch'])
+        # filtered by more than the direction and switch
+        self._filtered = syscall_filter is not None and not syscall_filter.only_direction()
+        self._cache = None
+        if cache_path is not None:
+            # LID-DS 2019 has no process ids
+            self._cache = RecordingCache(cache_path, self.path, has_process_id=False)
         self._metadata = self._collect_metadata()
         self.name = self._metadata['name']
 
@@ -44,19 +59,40 @@ class Recording2019(BaseRecording):
 
             Prepare stream of syscalls,
             yield single lines
+            if caching is enabled the recording is parsed once and read from the cache afterwards
 
             Returns:
             str: syscall text line
 
         """
+        if self._cache is not None:
+            for syscall_object in self._cache.syscalls_or_build(self._parse_syscalls, self._direction):
+                if self._filter.accepts(syscall_object):
+                    yield syscall_object
+            return
+        yield from self._parse_syscalls(self._filter)
+
+    def columns(self) -> SyscallColumns:
+        """
+            all syscalls of the recording as columns for batch evaluation
+            taken directly from the recording cache if it is built already
+        """
+        if self._cache is not None and self._cache.is_valid() and not self._filtered:
+            return self._cache.columns(self._direction, excluded_names=['switch'])
+        return SyscallColumns.from_syscalls(list(self.syscalls()))
+
+    def _parse_syscalls(self, syscall_filter: SyscallFilter = None) -> Generator[Syscall, None, None]:
+        """
+            parses every line of the recording accepted by the filter into a Syscall2019 object
+            the time range of the filter is checked on the objects, the other conditions on the split line
+        """
         with open(self.path, 'r') as recording_file:
             for line_id, syscall in enumerate(recording_file, start=1):
+                if syscall_filter is not None and not syscall_filter.accepts_2019(syscall.rstrip().split(' ', 8)):
+                    continue
                 syscall_object = Syscall2019(recording_path=self.path, syscall_line=syscall, line_id=line_id)
-                if self._direction != Direction.BOTH:
-                    if syscall_object.direction() == self._direction and syscall_object.name() != 'switch':
-                        yield syscall_object
-                elif syscall_object.name() != 'switch':
-                    yield Syscall2019(self.path, syscall, line_id=line_id)
+                if syscall_filter is None or syscall_filter.accepts_time(syscall_object):
+                    yield syscall_object
 
     def _collect_metadata(self):
         """
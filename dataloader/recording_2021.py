@@ -1,14 +1,19 @@
 import os
 import csv
-import json
 import pcapkit
 import zipfile
+import itertools
 from dataloader.base_recording import BaseRecording
 
 from dataloader.direction import Direction
 from dataloader.syscall import Syscall
+from dataloader.recording_cache import RecordingCache
+from dataloader.syscall_columns import SyscallColumns
 from dataloader.resource_statistic import ResourceStatistic
-from dataloader.syscall_2021 import Syscall2021
+from dataloader.compact_syscall import compact_syscalls
+from dataloader.syscall_filter import SyscallFilter
+from dataloader.seek_index import SeekIndex, SEEK_INDEX_SUFFIX
+from dataloader.scenario_index import read_metadata
 
 
 class Recording2021(BaseRecording):
@@ -24,10 +29,18 @@ class Recording2021(BaseRecording):
         Args:
         path (str): path of recording
         name (str): name of file without extension
+        cache_path (str): directory of the columnar recording cache, caching is disabled if None
+        flyweight (bool): syscalls() refills one syscall object with each line instead of creating a new one,
+                          only usable if no building block keeps syscall objects
+        metadata (dict): the already parsed metadata (e.g. from the ScenarioIndex), read from the zip if None
+        check (bool): check the members of the zip, not needed if the data loader validated the recording already
+        syscall_filter (SyscallFilter): only the syscalls accepted by the filter (and of the direction) are yielded,
+                                        the other lines are skipped before they are parsed
 
     """
 
-    def __init__(self, path: str, name: str, direction: Direction):
+    def __init__(self, path: str, name: str, direction: Direction, cache_path: str = None, flyweight: bool = False,
+                 metadata: dict = None, check: bool = True, syscall_filter: SyscallFilter = None):
         """
 
             Save name and path of recording.
@@ -35,37 +48,100 @@ class Recording2021(BaseRecording):
             Parameter:
             path (str): path of associated files
             name (str): name without path and extension
+            cache_path (str): directory of the columnar recording cache
+            flyweight (bool): reuse one syscall object while parsing
+            metadata (dict): parsed metadata of the recording
+            check (bool): run check_recording
+            syscall_filter (SyscallFilter): filter of the syscalls
 
         """
         self.path = path
         self.name = name
         self._direction = direction
-        self.check_recording()
-
-    def syscalls(self) -> str:
+        self._filter = (syscall_filter if syscall_filter is not None else SyscallFilter()).with_direction(direction)
+        self._flyweight = flyweight
+        self._metadata = metadata
+        self._cache = None
+        self._seek_index = None
+        if cache_path is not None:
+            self._cache = RecordingCache(cache_path, path)
+        if check:
+            self.check_recording()
+
+    def syscalls(self, start_ns: int = None, end_ns: int = None) -> str:
         """
 
             Prepare stream of syscalls,
             yield single lines
+            if caching is enabled the recording is parsed once and read from the cache afterwards
+
+            Parameter:
+            start_ns (int): only syscalls with a unix timestamp in ns >= start_ns
+            end_ns (int): only syscalls with a unix timestamp in ns < end_ns
+                          a time range (also the one of the syscall filter) is read from the cache if it is built,
+                          otherwise the recording is read from the first block of the range (see seek_index)
 
             Returns:
             str: syscall text line
 
         """
+        syscall_filter = self._filter.within(start_ns, end_ns)
         try:
-            with zipfile.ZipFile(self.path, 'r') as zipped:
-                with zipped.open(self.name + '.sc') as unzipped:
-                    for line_id, syscall in enumerate(unzipped, start=1):
-                        syscall_object = Syscall2021(self.path, syscall.decode('utf-8').rstrip(), line_id=line_id)
-                        if self._direction != Direction.BOTH:
-                            if syscall_object.direction() == self._direction:
-                                yield syscall_object
-                        else:
-                            yield syscall_object
+            if self._cache is not None and (not syscall_filter.has_time_range() or self._cache.is_valid()):
+                # the cache holds all syscalls of the recording, the filter is applied to the cached ones
+                if syscall_filter.has_time_range():
+                    cached = self._cache.syscalls(self._direction, syscall_filter.start_ns, syscall_filter.end_ns)
+                else:
+                    cached = self._cache.syscalls_or_build(self._parse_syscalls, self._direction)
+                if syscall_filter.only_direction():
+                    yield from cached
+                else:
+                    yield from (syscall for syscall in cached if syscall_filter.accepts(syscall))
+            else:
+                # a time range does not read the whole recording, so the cache is not built on the way
+                yield from self._parse_syscalls(self._flyweight, syscall_filter)
 
         except Exception:
             raise Exception(f'Error while working with file: {self.name} at {self.path}')
 
+    def columns(self) -> SyscallColumns:
+        """
+            all syscalls of the recording as columns for batch evaluation
+            taken directly from the recording cache if it is built already
+        """
+        if self._cache is not None and self._cache.is_valid() and self._filter.only_direction():
+            return self._cache.columns(self._direction)
+        if self._flyweight:
+            # the columns keep all syscall objects
+            return SyscallColumns.from_syscalls(list(self._parse_syscalls(syscall_filter=self._filter)))
+        return SyscallColumns.from_syscalls(list(self.syscalls()))
+
+    def seek_index(self) -> SeekIndex:
+        """
+            sparse block index of the syscall lines, built on the first use
+            stored next to the recording cache if caching is enabled, otherwise kept in memory
+        """
+        if self._seek_index is None:
+            index_path = self._cache.directory + SEEK_INDEX_SUFFIX if self._cache is not None else None
+            self._seek_index = SeekIndex.load_or_build(self.path, self.name + '.sc', index_path)
+        return self._seek_index
+
+    def _parse_syscalls(self, flyweight: bool = False, syscall_filter: SyscallFilter = None):
+        """
+            unzips the .sc file and parses every line accepted by the filter into a CompactSyscall2021 object
+            with a time range only the blocks of the seek index that can contain the range are read
+        """
+        offset, first_line_id, num_lines = 0, 1, None
+        if syscall_filter is not None and syscall_filter.has_time_range():
+            offset, first_line_id, num_lines = self.seek_index().lines_between(syscall_filter.start_ns,
+                                                                               syscall_filter.end_ns)
+        with zipfile.ZipFile(self.path, 'r') as zipped:
+            with zipped.open(self.name + '.sc') as unzipped:
+                if offset > 0:
+                    unzipped.seek(offset)
+                lines = (line.decode('utf-8').rstrip() for line in itertools.islice(unzipped, num_lines))
+                yield from compact_syscalls(self.path, lines, flyweight, syscall_filter, first_line_id)
+
     def packets(self):
         """
 
@@ -156,15 +232,16 @@ class Recording2021(BaseRecording):
                 }
             }
 
+            the json file is read once, or never if the metadata was given on construction
+
             Returns:
             dict: metadata dictionary
 
         """
-        with zipfile.ZipFile(self.path, 'r') as zipped:
-            with zipped.open(self.name + '.json') as unzipped:
-                unzipped_byte_json = unzipped.read()
-                unzipped_json = json.loads(unzipped_byte_json.decode('utf-8').replace("'", '"'))
-        return unzipped_json
+        if self._metadata is None:
+            with zipfile.ZipFile(self.path, 'r') as zipped:
+                self._metadata = read_metadata(zipped, self.name)
+        return self._metadata
 
     def check_recording(self) -> bool:
         """
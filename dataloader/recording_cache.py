@@ -0,0 +1,369 @@
+"""
+on-disk columnar cache for parsed recordings
+
+each recording is parsed once and stored as one numpy column file per syscall attribute,
+every later pass memory-maps these columns instead of decompressing and splitting the text lines again
+"""
+import os
+import json
+import base64
+import shutil
+import hashlib
+from datetime import datetime
+from typing import Callable, Generator, Iterable, Tuple
+
+import numpy as np
+
+from dataloader.direction import Direction
+from dataloader.param_extractor import scan_param
+from dataloader.syscall import Syscall
+from dataloader.syscall_columns import SyscallColumns
+
+CACHE_VERSION = 2
+META_FILE = 'meta.json'
+NO_VALUE = -1
+
+INT_COLUMNS = ['user_id', 'process_id', 'thread_id', 'line_id']
+
+
+class CachedSyscall(Syscall):
+    """
+    system call restored from the columns of a recording cache
+    all fixed attributes are already parsed, the parameters are decoded on demand
+    """
+
+    def __init__(self,
+                 recording_path: str,
+                 line_id: int,
+                 timestamp,
+                 user_id: int,
+                 process_id: int,
+                 process_name: str,
+                 thread_id: int,
+                 name: str,
+                 direction: Direction,
+                 params_blob=None,
+                 params_start: int = 0,
+                 params_end: int = 0):
+        super().__init__()
+        self.recording_path = recording_path
+        self.line_id = line_id
+        self._timestamp_unix = timestamp
+        self._user_id = user_id
+        self._process_id = process_id
+        self._process_name = process_name
+        self._thread_id = thread_id
+        self._name = name
+        self._direction = direction
+        self._params_blob = params_blob
+        self._params_start = params_start
+        self._params_end = params_end
+        self._params = None
+
+    def timestamp_unix_in_ns(self):
+        return self._timestamp_unix
+
+    def timestamp_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self._timestamp_unix * 10 ** -9)
+
+    def user_id(self) -> int:
+        return self._user_id
+
+    def process_id(self) -> int:
+        return self._process_id
+
+    def process_name(self) -> str:
+        return self._process_name
+
+    def thread_id(self) -> int:
+        return self._thread_id
+
+    def name(self) -> str:
+        return self._name
+
+    def direction(self) -> Direction:
+        return self._direction
+
+    def params_string(self) -> str:
+        """
+        Returns:
+            str: the unparsed parameter part of the recorded line
+        """
+        if self._params_blob is None or self._params_start == self._params_end:
+            return ''
+        return bytes(self._params_blob[self._params_start:self._params_end]).decode('utf-8')
+
+    def params(self) -> dict:
+        """
+        parses the cached parameter string into a dict the same way Syscall2021 does
+        """
+        if self._params is None:
+            self._params = {}
+            for param in self.params_string().split(' '):
+                split = param.split('=', 1)
+                if len(split) == 2:
+                    self._params[split[0]] = split[1]
+        return self._params
+
+    def param(self, param_name: str, b64decode: bool = False) -> Tuple[bytes, str]:
+        if self._params is None:
+            param_value = scan_param(self.params_string(), param_name)
+        else:
+            param_value = self._params.get(param_name)
+        if param_value is not None and b64decode:
+            return base64.b64decode(param_value)
+        return param_value
+
+
+class RecordingCacheWriter:
+    """
+    collects the columns of one recording while it is parsed
+    nothing is written if close() is never called (e.g. iteration was stopped early)
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._columns = {
+            'timestamp': [],
+            'user_id': [],
+            'process_id': [],
+            'thread_id': [],
+            'line_id': [],
+            'name_id': [],
+            'process_name_id': [],
+            'direction': [],
+            'params_offsets': [0],
+        }
+        self._params = []
+        self._params_size = 0
+        self._names = {}
+        self._process_names = {}
+
+    def append(self, syscall: Syscall):
+        columns = self._columns
+        columns['timestamp'].append(syscall.timestamp_unix_in_ns())
+        columns['user_id'].append(syscall.user_id())
+        if self._cache.has_process_id:
+            process_id = syscall.process_id()
+            columns['process_id'].append(NO_VALUE if process_id is None else process_id)
+        else:
+            columns['process_id'].append(NO_VALUE)
+        columns['thread_id'].append(syscall.thread_id())
+        columns['line_id'].append(syscall.line_id)
+        columns['name_id'].append(self._names.setdefault(syscall.name(), len(self._names)))
+        columns['process_name_id'].append(self._process_names.setdefault(syscall.process_name(),
+                                                                         len(self._process_names)))
+        direction = syscall.direction()
+        columns['direction'].append(NO_VALUE if direction is None else int(direction))
+        params = syscall.params_string().encode('utf-8')
+        self._params.append(params)
+        self._params_size += len(params)
+        columns['params_offsets'].append(self._params_size)
+
+    def close(self):
+        """
+        writes all collected columns and finally the meta file which marks the cache as valid
+        """
+        directory = self._cache.directory
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+        has_process_id = self._cache.has_process_id and NO_VALUE not in self._columns['process_id']
+        for column, values in self._columns.items():
+            if column in INT_COLUMNS or column in ('timestamp', 'params_offsets'):
+                # the float timestamps of LID-DS 2019 are whole nanoseconds as well
+                array = np.asarray(values, dtype=np.int64)
+            elif column in ('name_id', 'process_name_id'):
+                array = np.asarray(values, dtype=np.int32)
+            elif column == 'direction':
+                array = np.asarray(values, dtype=np.int8)
+            else:
+                array = np.asarray(values)
+            np.save(os.path.join(directory, column + '.npy'), array)
+        np.save(os.path.join(directory, 'params_blob.npy'),
+                np.frombuffer(b''.join(self._params), dtype=np.uint8))
+        meta = self._cache.source_signature()
+        meta.update({
+            'version': CACHE_VERSION,
+            'count': len(self._columns['timestamp']),
+            'has_process_id': has_process_id,
+            'syscall_names': list(self._names),
+            'process_names': list(self._process_names),
+        })
+        with open(os.path.join(directory, META_FILE), 'w') as meta_file:
+            json.dump(meta, meta_file)
+
+
+class RecordingCache:
+    """
+    columnar cache of one recording
+
+    Args:
+        cache_path (str): base directory of all recording caches
+        source_path (str): path of the recording file (zip or txt) the cache is built from
+        has_process_id (bool): the syscalls of the recording have a process id,
+                               process_id() is never called otherwise (e.g. LID-DS 2019)
+
+    the cache is invalidated if the modification time or the size of the source file changes
+    """
+
+    def __init__(self, cache_path: str, source_path: str, has_process_id: bool = True):
+        self.source_path = source_path
+        self.has_process_id = has_process_id
+        key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:20]
+        self.directory = os.path.join(cache_path, key)
+        self._meta = None
+
+    def source_signature(self) -> dict:
+        stat = os.stat(self.source_path)
+        return {
+            'source': os.path.abspath(self.source_path),
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+        }
+
+    def meta(self) -> dict:
+        """
+        Returns:
+            dict: content of the meta file or None if cache does not exist
+        """
+        if self._meta is None:
+            try:
+                with open(os.path.join(self.directory, META_FILE), 'r') as meta_file:
+                    self._meta = json.load(meta_file)
+            except (OSError, ValueError):
+                return None
+        return self._meta
+
+    def is_valid(self) -> bool:
+        meta = self.meta()
+        if meta is None or meta.get('version') != CACHE_VERSION:
+            return False
+        signature = self.source_signature()
+        if meta['mtime'] != signature['mtime'] or meta['size'] != signature['size']:
+            self._meta = None
+            return False
+        return True
+
+    def writer(self) -> RecordingCacheWriter:
+        self._meta = None
+        return RecordingCacheWriter(self)
+
+    def build(self, syscalls: Iterable[Syscall]):
+        """
+        parses all given syscalls and writes them to the cache
+        """
+        writer = self.writer()
+        for syscall in syscalls:
+            writer.append(syscall)
+        writer.close()
+
+    def syscalls_or_build(self,
+                          parse: Callable[[], Iterable[Syscall]],
+                          direction: Direction = Direction.BOTH) -> Generator[Syscall, None, None]:
+        """
+        yields the cached syscalls if the cache is valid
+        otherwise yields the freshly parsed syscalls and builds the cache on the way
+        the cache is only written if the recording was iterated completely
+
+        Parameter:
+            parse: callable returning all syscalls of the recording (unfiltered)
+            direction: only syscalls of this direction are yielded
+        """
+        if self.is_valid():
+            yield from self.syscalls(direction)
+            return
+        writer = self.writer()
+        for syscall in parse():
+            if writer is not None:
+                try:
+                    writer.append(syscall)
+                except (ValueError, TypeError):
+                    # malformed line, the recording can not be cached
+                    writer = None
+            if direction == Direction.BOTH or syscall.direction() == direction:
+                yield syscall
+        if writer is not None:
+            writer.close()
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        memory-maps a single column of the cache
+        """
+        return np.load(os.path.join(self.directory, name + '.npy'), mmap_mode='r')
+
+    def syscalls(self,
+                 direction: Direction = Direction.BOTH,
+                 start_ns: int = None,
+                 end_ns: int = None) -> Generator[CachedSyscall, None, None]:
+        """
+        yields all cached syscalls of the given direction
+        with start_ns and/or end_ns only the syscalls with start_ns <= timestamp < end_ns,
+        the other rows are skipped by the timestamp column
+        """
+        meta = self.meta()
+        if direction == Direction.BOTH and start_ns is None and end_ns is None:
+            yield from self._syscalls_at(np.arange(meta['count']))
+            return
+        keep = np.ones(meta['count'], dtype=bool)
+        if direction != Direction.BOTH:
+            keep &= self.column('direction') == int(direction)
+        if start_ns is not None:
+            keep &= self.column('timestamp') >= start_ns
+        if end_ns is not None:
+            keep &= self.column('timestamp') < end_ns
+        yield from self._syscalls_at(np.flatnonzero(keep))
+
+    def columns(self, direction: Direction = Direction.BOTH, excluded_names: list = None) -> SyscallColumns:
+        """
+        all cached syscalls of the given direction as columns
+        the syscall objects are only created if they are requested from the columns
+        """
+        meta = self.meta()
+        keep = np.ones(meta['count'], dtype=bool)
+        if direction != Direction.BOTH:
+            keep &= self.column('direction') == int(direction)
+        names = np.array(meta['syscall_names'], dtype=object)
+        name_ids = self.column('name_id')
+        if excluded_names:
+            excluded_ids = [i for i, name in enumerate(meta['syscall_names']) if name in excluded_names]
+            keep &= ~np.isin(name_ids, excluded_ids)
+        rows = np.flatnonzero(keep)
+        return SyscallColumns(np.asarray(self.column('timestamp')[rows]),
+                              np.asarray(self.column('thread_id')[rows]),
+                              names[name_ids[rows]],
+                              lambda: list(self._syscalls_at(rows)))
+
+    def _syscalls_at(self, rows: np.ndarray) -> Generator[CachedSyscall, None, None]:
+        meta = self.meta()
+        if len(rows) == 0:
+            return
+        names = meta['syscall_names']
+        process_names = meta['process_names']
+        has_process_id = meta['has_process_id']
+        timestamps = self.column('timestamp')[rows].tolist()
+        user_ids = self.column('user_id')[rows].tolist()
+        process_ids = self.column('process_id')[rows].tolist()
+        thread_ids = self.column('thread_id')[rows].tolist()
+        line_ids = self.column('line_id')[rows].tolist()
+        name_ids = self.column('name_id')[rows].tolist()
+        process_name_ids = self.column('process_name_id')[rows].tolist()
+        directions = self.column('direction')[rows].tolist()
+        offsets = self.column('params_offsets')
+        starts = offsets[rows].tolist()
+        ends = offsets[rows + 1].tolist()
+        params_blob = self.column('params_blob')
+        direction_values = {int(d): d for d in Direction}
+        for i in range(len(timestamps)):
+            yield CachedSyscall(recording_path=self.source_path,
+                                line_id=line_ids[i],
+                                timestamp=timestamps[i],
+                                user_id=user_ids[i],
+                                process_id=process_ids[i] if has_process_id else None,
+                                process_name=process_names[process_name_ids[i]],
+                                thread_id=thread_ids[i],
+                                name=names[name_ids[i]],
+                                direction=direction_values.get(directions[i]),
+                                params_blob=params_blob,
+                                params_start=starts[i],
+                                params_end=ends[i])
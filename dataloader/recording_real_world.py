@@ -6,6 +6,8 @@ from datetime import datetime
 
 from dataloader.direction import Direction
 from dataloader.syscall_2021 import Syscall2021
+from dataloader.recording_cache import RecordingCache
+from dataloader.syscall_columns import SyscallColumns
 from dataloader.base_recording import BaseRecording
 
 
@@ -17,44 +19,68 @@ class RecordingRealWorld(BaseRecording):
         Args:
         path (str): path of recording
         name (str): name of file without extension
+        cache_path (str): directory of the columnar recording cache, caching is disabled if None
     """
 
-    def __init__(self, name: str, path: str, direction: Direction):
+    def __init__(self, name: str, path: str, direction: Direction, cache_path: str = None):
         """
             Save name and path of recording.
             Parameter:
             path (str): path of associated sc files
             name (str): name without path and extension
+            cache_path (str): directory of the columnar recording cache
         """
         self.name = name
         self.path = path
         self._direction = direction
+        self._cache = None
+        if cache_path is not None:
+            self._cache = RecordingCache(cache_path, path)
         self.check_recording()
 
     def syscalls(self) -> str:
         """
             Prepare stream of syscalls,
             yield single lines
+            if caching is enabled the recording is parsed once and read from the cache afterwards
             Returns:
             str: syscall text line
         """
         try:
-            with ZipFile(self.path, 'r') as zipped:
-                with zipped.open(self.name + '.sc') as unzipped:
-                    for line_id, syscall in enumerate(unzipped, start=1):
-                        syscall = syscall.decode('UTF-8')
-                        syscall_object = Syscall2021(self.path,
-                                                     syscall.rstrip(),
-                                                     line_id=line_id)
-                        if self._direction != Direction.BOTH:
-                            if syscall_object.direction() == self._direction:
-                                yield syscall_object
-                        else:
+            if self._cache is not None:
+                yield from self._cache.syscalls_or_build(self._parse_syscalls, self._direction)
+            else:
+                for syscall_object in self._parse_syscalls():
+                    if self._direction != Direction.BOTH:
+                        if syscall_object.direction() == self._direction:
                             yield syscall_object
+                    else:
+                        yield syscall_object
         except Exception:
             raise Exception(
                 f'Error while working with file: {self.name} at {self.path}')
 
+    def columns(self) -> SyscallColumns:
+        """
+            all syscalls of the recording as columns for batch evaluation
+            taken directly from the recording cache if it is built already
+        """
+        if self._cache is not None and self._cache.is_valid():
+            return self._cache.columns(self._direction)
+        return SyscallColumns.from_syscalls(list(self.syscalls()))
+
+    def _parse_syscalls(self):
+        """
+            unzips the .sc file and parses every line into a Syscall2021 object
+        """
+        with ZipFile(self.path, 'r') as zipped:
+            with zipped.open(self.name + '.sc') as unzipped:
+                for line_id, syscall in enumerate(unzipped, start=1):
+                    syscall = syscall.decode('UTF-8')
+                    yield Syscall2021(self.path,
+                                      syscall.rstrip(),
+                                      line_id=line_id)
+
     def metadata(self) -> dict:
         """
             Calculate recording time with delta between first and last syscall in sc file.
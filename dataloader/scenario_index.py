@@ -0,0 +1,276 @@
+"""
+persistent metadata index of an LID-DS 2021 scenario
+
+the metadata of all recordings (type, exploit times, warmup end, sizes and the parsed .json) is collected
+once and stored as sidecar file in the training folder of the scenario (next to distinct_syscalls.json),
+later runs load the index instead of opening every zip
+zips that were added, changed (mtime or size) or removed since the last run are refreshed incrementally
+
+the zips are scanned concurrently by a thread pool, each scan only reads the central directory and the small
+.json member (zipfile releases the GIL while reading and inflating), the completeness of the members is
+validated in the same pass and all problems are reported at once in missing_files.txt
+"""
+import os
+import glob
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+INDEX_VERSION = 2
+INDEX_FILE = 'metadata_index.json'
+
+TRAINING = 'training'
+VALIDATION = 'validation'
+TEST = 'test'
+
+# members of a complete recording
+MEMBER_EXTENSIONS = ['.res', '.sc', '.pcap', '.json']
+
+# glob patterns of the recordings of each category relative to the scenario folder
+CATEGORY_PATTERNS = {
+    TRAINING: os.path.join(TRAINING, '*.zip'),
+    VALIDATION: os.path.join(VALIDATION, '*.zip'),
+    TEST: os.path.join(TEST, '*', '*.zip'),
+}
+
+
+def read_metadata(zipped: zipfile.ZipFile, name: str) -> dict:
+    """
+    parses the .json member of an opened recording zip
+    """
+    with zipped.open(name + '.json') as unzipped:
+        unzipped_byte_json = unzipped.read()
+    return json.loads(unzipped_byte_json.decode('utf-8').replace("'", '"'))
+
+
+def scan_recording(path: str, category: str) -> dict:
+    """
+    reads the zip central directory and the .json member of one recording
+
+    Returns:
+        dict: the index entry of the recording
+
+    Raises:
+        zipfile.BadZipFile: if the zip can not be read
+        KeyError: if the .json member is missing
+    """
+    # imported here, the data loader imports this module
+    from dataloader.data_loader_2021 import get_type_of_recording
+    name = os.path.splitext(os.path.basename(path))[0]
+    stat = os.stat(path)
+    with zipfile.ZipFile(path, 'r') as zipped:
+        members = {info.filename: info for info in zipped.infolist()}
+        metadata = read_metadata(zipped, name)
+    missing_members = [name + extension for extension in MEMBER_EXTENSIONS if name + extension not in members]
+    sc_info = members.get(name + '.sc')
+    times = metadata.get('time', {})
+    warmup_end = times.get('warmup_end')
+    return {
+        'name': name,
+        'category': category,
+        'recording_type': get_type_of_recording(metadata).name,
+        'exploit_times': [exploit['absolute'] for exploit in times.get('exploit', [])],
+        'warmup_end': warmup_end['absolute'] if isinstance(warmup_end, dict) else None,
+        'syscall_count': None,
+        'zip_size': stat.st_size,
+        'sc_size': sc_info.file_size if sc_info is not None else None,
+        'sc_compressed_size': sc_info.compress_size if sc_info is not None else None,
+        'mtime_ns': stat.st_mtime_ns,
+        'missing_members': missing_members,
+        'metadata': metadata,
+    }
+
+
+def count_lines(path: str, name: str) -> int:
+    """
+    number of syscall lines in the .sc member of a recording without parsing them
+    """
+    count = 0
+    last_byte = b'\n'
+    with zipfile.ZipFile(path, 'r') as zipped:
+        with zipped.open(name + '.sc') as unzipped:
+            for chunk in iter(lambda: unzipped.read(1 << 20), b''):
+                count += chunk.count(b'\n')
+                last_byte = chunk[-1:]
+    # last line without line break
+    if last_byte != b'\n':
+        count += 1
+    return count
+
+
+def _incomplete(path: str, missing_members: list) -> str:
+    """
+    line of missing_files.txt for a recording with missing members, same format as Recording2021.check_recording
+    """
+    missing = ''.join(f'Missing {os.path.splitext(member)[1]} file ' for member in missing_members)
+    return f'Recording Error: {missing}in recording: {path}. \n'
+
+
+def _scan(args: tuple):
+    """
+    scans one recording in a worker thread
+
+    Returns:
+        tuple: relative path, index entry or None and the problem of the recording or None
+    """
+    relative_path, path, category = args
+    try:
+        entry = scan_recording(path, category)
+    except zipfile.BadZipFile:
+        return relative_path, None, f'Bad zipfile in recording: {path}. \n'
+    except KeyError:
+        return relative_path, None, _incomplete(path, [os.path.basename(path)[:-len('.zip')] + '.json'])
+    if len(entry['missing_members']) > 0:
+        return relative_path, entry, _incomplete(path, entry['missing_members'])
+    return relative_path, entry, None
+
+
+def report_problems(problems: list):
+    """
+    appends the problems of all recordings to missing_files.txt at once like the other recording checks
+    """
+    if len(problems) > 0:
+        with open('missing_files.txt', 'a') as file:
+            file.writelines(problems)
+        print(f'{len(problems)} recordings are incomplete or broken')
+        print('Have a look in missing_files.txt file')
+
+
+class ScenarioIndex:
+    """
+    metadata of all recordings of an LID-DS 2021 scenario, loaded from (and kept up to date in) a sidecar file
+
+    the entries are keyed by the path of the zip relative to the scenario folder, see scan_recording for their fields
+    if the sidecar file can not be written (e.g. read-only dataset) the index is only kept in memory
+
+    Args:
+        scenario_path: path of the scenario folder
+        index_path: path of the sidecar file, defaults to training/metadata_index.json in the scenario folder
+        persistent: load and save the sidecar file, otherwise all zips are scanned on construction
+        workers: number of threads scanning the zips, None for the default of ThreadPoolExecutor
+    """
+
+    def __init__(self, scenario_path: str, index_path: str = None, persistent: bool = True, workers: int = None):
+        self.scenario_path = scenario_path
+        self.index_path = index_path if index_path is not None else os.path.join(scenario_path, TRAINING, INDEX_FILE)
+        self._persistent = persistent
+        self._workers = workers
+        self.entries = {}
+        self.refreshed = 0
+        if persistent:
+            self._load()
+        self.refresh()
+
+    def _load(self):
+        """
+        loads the sidecar file, an unreadable or outdated index is rebuilt
+        """
+        try:
+            with open(self.index_path, 'r') as index_file:
+                index = json.load(index_file)
+            if index.get('version') == INDEX_VERSION:
+                self.entries = index['recordings']
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    def save(self):
+        """
+        writes the sidecar file atomically
+        """
+        if not self._persistent:
+            return
+        temp_path = self.index_path + '.tmp'
+        try:
+            with open(temp_path, 'w') as index_file:
+                json.dump({'version': INDEX_VERSION, 'recordings': self.entries}, index_file)
+            os.replace(temp_path, self.index_path)
+        except OSError as error:
+            print(f'Could not write metadata index {self.index_path}: {error}')
+
+    def _list_recordings(self) -> dict:
+        """
+        relative path -> category of all zips of the scenario
+        """
+        recordings = {}
+        for category, pattern in CATEGORY_PATTERNS.items():
+            for path in glob.glob(os.path.join(self.scenario_path, pattern)):
+                recordings[os.path.relpath(path, self.scenario_path)] = category
+        return recordings
+
+    def _is_current(self, relative_path: str, category: str) -> bool:
+        entry = self.entries.get(relative_path)
+        if entry is None or entry['category'] != category:
+            return False
+        stat = os.stat(self.path(relative_path))
+        return entry['mtime_ns'] == stat.st_mtime_ns and entry['zip_size'] == stat.st_size
+
+    def refresh(self) -> int:
+        """
+        scans new and changed zips concurrently, drops removed ones and saves the index if anything changed
+        reports incomplete recordings of the whole index and broken zips to missing_files.txt
+
+        Returns:
+            int: number of scanned zips
+        """
+        recordings = self._list_recordings()
+        changed = False
+        for relative_path in list(self.entries.keys()):
+            if relative_path not in recordings:
+                del self.entries[relative_path]
+                changed = True
+
+        stale = [(relative_path, self.path(relative_path), category)
+                 for relative_path, category in sorted(recordings.items())
+                 if not self._is_current(relative_path, category)]
+        self.refreshed = 0
+        problems = {}
+        if len(stale) > 0:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                for relative_path, entry, problem in executor.map(_scan, stale):
+                    if problem is not None:
+                        problems[relative_path] = problem
+                    if entry is None:
+                        self.entries.pop(relative_path, None)
+                        continue
+                    self.entries[relative_path] = entry
+                    self.refreshed += 1
+            changed = True
+
+        # incomplete recordings that were indexed before are reported again
+        for relative_path, entry in self.entries.items():
+            if relative_path not in problems and len(entry['missing_members']) > 0:
+                problems[relative_path] = _incomplete(self.path(relative_path), entry['missing_members'])
+        report_problems([problems[relative_path] for relative_path in sorted(problems)])
+
+        if changed:
+            self.save()
+        return self.refreshed
+
+    def count_syscalls(self) -> int:
+        """
+        counts the syscall lines of all recordings without a count (decompresses the .sc members once)
+
+        Returns:
+            int: number of syscalls of the scenario
+        """
+        counted = 0
+        for relative_path, entry in self.entries.items():
+            if entry['syscall_count'] is None:
+                entry['syscall_count'] = count_lines(self.path(relative_path), entry['name'])
+                counted += 1
+        if counted > 0:
+            self.save()
+        return sum(entry['syscall_count'] for entry in self.entries.values())
+
+    def path(self, relative_path: str) -> str:
+        """
+        path of a recording given its key in the index
+        """
+        return os.path.join(self.scenario_path, relative_path)
+
+    def category(self, category: str) -> dict:
+        """
+        relative path -> entry of all recordings of the given category
+        """
+        return {relative_path: entry for relative_path, entry in self.entries.items()
+                if entry['category'] == category}
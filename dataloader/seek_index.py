@@ -0,0 +1,128 @@
+"""
+sparse block index of the syscall text of an LID-DS 2021 recording for reading a time range without parsing
+the lines before it
+
+the decompressed .sc member is divided into blocks of block_lines lines, the index keeps the byte offset and the
+smallest and largest timestamp of every block
+a time range is read by seeking the member to the first block that can contain a syscall of the range and stopping
+at the first block after which all syscalls are later than the range, the lines in between are checked one by one
+the timestamps do not have to be sorted: the running maximum of the blocks decides where to start,
+the running minimum of the following blocks where to stop
+
+the skipped lines are still decompressed by the zip member (deflate can not seek), but never decoded or parsed
+the index is built by one pass over the raw lines and can be stored as .npz file next to the recording cache
+"""
+import os
+import zipfile
+from typing import Tuple
+
+import numpy as np
+
+SEEK_INDEX_VERSION = 1
+SEEK_INDEX_SUFFIX = '.seek.npz'
+BLOCK_LINES = 4096
+
+
+class SeekIndex:
+    """
+    sparse index of the lines of one recording
+
+    Args:
+        offsets: byte offset of the first line of every block in the decompressed syscall text
+        minimums: smallest timestamp (ns) of every block
+        maximums: largest timestamp (ns) of every block
+        block_lines: number of lines of every block (except the last one)
+    """
+
+    def __init__(self, offsets: np.ndarray, minimums: np.ndarray, maximums: np.ndarray, block_lines: int = BLOCK_LINES):
+        self.offsets = offsets
+        self.minimums = minimums
+        self.maximums = maximums
+        self.block_lines = block_lines
+        # largest timestamp up to each block and smallest timestamp from each block on, both are sorted
+        self._maximum_before = np.maximum.accumulate(maximums) if len(maximums) > 0 else maximums
+        self._minimum_after = np.minimum.accumulate(minimums[::-1])[::-1] if len(minimums) > 0 else minimums
+
+    @staticmethod
+    def build(path: str, member: str, block_lines: int = BLOCK_LINES):
+        """
+        reads the timestamps of all lines of the given member of the zip, the lines are not parsed otherwise
+        """
+        offsets = []
+        minimums = []
+        maximums = []
+        offset = 0
+        with zipfile.ZipFile(path, 'r') as zipped:
+            with zipped.open(member) as unzipped:
+                for line_number, line in enumerate(unzipped):
+                    timestamp = int(line[:line.index(b' ')])
+                    if line_number % block_lines == 0:
+                        offsets.append(offset)
+                        minimums.append(timestamp)
+                        maximums.append(timestamp)
+                    elif timestamp < minimums[-1]:
+                        minimums[-1] = timestamp
+                    elif timestamp > maximums[-1]:
+                        maximums[-1] = timestamp
+                    offset += len(line)
+        return SeekIndex(np.asarray(offsets, dtype=np.int64),
+                         np.asarray(minimums, dtype=np.int64),
+                         np.asarray(maximums, dtype=np.int64),
+                         block_lines)
+
+    @staticmethod
+    def load_or_build(path: str, member: str, index_path: str = None, block_lines: int = BLOCK_LINES):
+        """
+        loads the index from index_path if it belongs to the current version of the recording,
+        otherwise builds it and writes it to index_path (if given)
+        """
+        stat = os.stat(path)
+        signature = [SEEK_INDEX_VERSION, stat.st_mtime_ns, stat.st_size, block_lines]
+        if index_path is not None:
+            try:
+                with np.load(index_path) as stored:
+                    if stored['signature'].tolist() == signature:
+                        return SeekIndex(stored['offsets'], stored['minimums'], stored['maximums'], block_lines)
+            except (OSError, ValueError, KeyError):
+                pass
+        index = SeekIndex.build(path, member, block_lines)
+        if index_path is not None:
+            index.save(index_path, signature)
+        return index
+
+    def save(self, index_path: str, signature: list):
+        """
+        writes the index atomically, an index that can not be written is only kept in memory
+        """
+        temp_path = index_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+            with open(temp_path, 'wb') as index_file:
+                np.savez(index_file,
+                         signature=np.asarray(signature, dtype=np.int64),
+                         offsets=self.offsets,
+                         minimums=self.minimums,
+                         maximums=self.maximums)
+            os.replace(temp_path, index_path)
+        except OSError as error:
+            print(f'Could not write seek index {index_path}: {error}')
+
+    def lines_between(self, start_ns: int = None, end_ns: int = None) -> Tuple[int, int, int]:
+        """
+        the lines that can contain syscalls with start_ns <= timestamp < end_ns
+
+        Returns:
+            tuple: byte offset and line id of the first line and the number of lines to read
+                   (None to read until the end of the recording)
+        """
+        first_block = 0
+        if start_ns is not None:
+            first_block = int(np.searchsorted(self._maximum_before, start_ns, side='left'))
+        num_lines = None
+        if end_ns is not None:
+            end_block = max(first_block, int(np.searchsorted(self._minimum_after, end_ns, side='left')))
+            if end_block < len(self.offsets):
+                num_lines = (end_block - first_block) * self.block_lines
+        if first_block >= len(self.offsets):
+            return 0, 1, 0
+        return int(self.offsets[first_block]), first_block * self.block_lines + 1, num_lines
@@ -8,6 +8,8 @@ class Syscall:
     """
     represents one system call
     """
+    # subclasses without __slots__ keep their attributes in __dict__ as before
+    __slots__ = ['recording_path', 'line_id']
 
     def __init__(self):
         self.recording_path = None
@@ -71,6 +73,13 @@ class Syscall:
         """
         raise NotImplemented
 
+    def params_string(self) -> str:
+        """
+        Returns:
+            str: the unparsed parameter part of the recorded line
+        """
+        raise NotImplemented
+
     def params(self) -> dict:
         """
         Returns:
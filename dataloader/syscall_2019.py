@@ -149,6 +149,14 @@ class Syscall2019(Syscall):
                 self._direction = Direction.CLOSE
         return self._direction
 
+    def params_string(self) -> str:
+        """
+        joins the unparsed parameter part of the recorded line
+        Returns:
+            str: all params as written in the recording
+        """
+        return ' '.join(self._line_list[SyscallSplitPart.PARAMS_BEGIN:])
+
     def params(self) -> dict:
         """
         extracts params from param list and saves its names and values as dict
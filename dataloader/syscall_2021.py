@@ -4,6 +4,7 @@ from enum import IntEnum
 from typing import Tuple
 
 from dataloader.direction import Direction
+from dataloader.param_extractor import scan_param
 from dataloader.syscall import Syscall
 
 
@@ -163,6 +164,17 @@ class Syscall2021(Syscall):
 
         return self._direction
 
+    def params_string(self) -> str:
+        """
+
+        joins the unparsed parameter part of the recorded line
+
+        Returns:
+            str: all params as written in the recording
+
+        """
+        return ' '.join(self._line_list[SyscallSplitPart.PARAMS_BEGIN:])
+
     def params(self) -> dict:
         """
 
@@ -186,19 +198,18 @@ class Syscall2021(Syscall):
     def param(self, param_name: str, b64decode: bool = False) -> Tuple[bytes, str]:
         """
 
-        runs the params() method and returns the requested
+        returns the requested parameter without parsing all params
+        (uses the params() dict if it was built already)
         decodes base64 strings if activated
 
         Returns:
             str or bytes: syscall parameter value
 
         """
-        params = self.params()
-        try:
-            param_value = params[param_name]
-            if b64decode:
-                return base64.b64decode(param_value)
-            else:
-                return param_value
-        except KeyError:
-            pass
+        if self._params is None:
+            param_value = scan_param(self.params_string(), param_name)
+        else:
+            param_value = self._params.get(param_name)
+        if param_value is not None and b64decode:
+            return base64.b64decode(param_value)
+        return param_value
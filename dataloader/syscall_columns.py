@@ -0,0 +1,64 @@
+"""
+all syscalls of one recording as numpy columns, used for the batch evaluation of building blocks
+"""
+from typing import Callable, List
+
+import numpy as np
+
+from dataloader.syscall import Syscall
+
+
+class SyscallColumns:
+    """
+    columns of the syscalls of one recording
+
+    Args:
+        timestamps: timestamp in ns of each syscall
+        thread_ids: thread id of each syscall
+        names: syscall name of each syscall (object array of str)
+        syscall_factory: callable returning the list of syscall objects (only called if they are needed)
+    """
+
+    def __init__(self,
+                 timestamps: np.ndarray,
+                 thread_ids: np.ndarray,
+                 names: np.ndarray,
+                 syscall_factory: Callable[[], List[Syscall]]):
+        self.timestamps = timestamps
+        self.thread_ids = thread_ids
+        self.names = names
+        self._syscall_factory = syscall_factory
+        self._syscalls = None
+        self._params = {}
+
+    @staticmethod
+    def from_syscalls(syscalls: List[Syscall]):
+        """
+        builds the columns from already parsed syscalls
+        """
+        return SyscallColumns(np.fromiter((syscall.timestamp_unix_in_ns() for syscall in syscalls),
+                                          dtype=np.int64, count=len(syscalls)),
+                              np.fromiter((syscall.thread_id() for syscall in syscalls),
+                                          dtype=np.int64, count=len(syscalls)),
+                              np.array([syscall.name() for syscall in syscalls], dtype=object),
+                              lambda: syscalls)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def syscalls(self) -> List[Syscall]:
+        """
+        the syscall objects of all rows
+        """
+        if self._syscalls is None:
+            self._syscalls = self._syscall_factory()
+        return self._syscalls
+
+    def param(self, param_name: str) -> np.ndarray:
+        """
+        value of the given parameter for each syscall (None if not present)
+        """
+        if param_name not in self._params:
+            self._params[param_name] = np.array([syscall.param(param_name) for syscall in self.syscalls()],
+                                                dtype=object)
+        return self._params[param_name]
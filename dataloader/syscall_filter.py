@@ -0,0 +1,190 @@
+"""
+filter of the syscalls of a recording that is evaluated while reading, before any syscall object is built
+
+the readers split each line once and compare the raw tokens (direction character, syscall name, process name,
+thread id and for LID-DS 2021 the timestamp) with the filter, only the remaining lines are parsed into objects
+syscalls read from the recording cache are filtered by their attributes instead (see accepts)
+
+example:
+    syscall_filter = SyscallFilter(names={'open', 'read', 'write'}, process_names={'apache2'})
+    data_loader = dataloader_factory(scenario_path, Direction.OPEN, syscall_filter=syscall_filter)
+"""
+from typing import Iterable
+
+from dataloader.direction import Direction
+from dataloader.syscall import Syscall
+
+# direction character of the recordings
+_DIRECTION_TOKENS = {Direction.OPEN: '>', Direction.CLOSE: '<'}
+
+# keyword arguments of dataloader_factory that are collected into a SyscallFilter
+FILTER_KWARGS = ['names', 'excluded_names', 'process_names', 'thread_ids', 'start_ns', 'end_ns']
+
+
+def _frozen(values: Iterable):
+    return frozenset(values) if values is not None else None
+
+
+class SyscallFilter:
+    """
+    accepts a syscall if it matches all given conditions, conditions that are None are not checked
+
+    Args:
+        direction: only syscalls of this direction, Direction.BOTH for all
+        names: only syscalls with one of these names
+        excluded_names: no syscalls with one of these names
+        process_names: only syscalls of these processes
+        thread_ids: only syscalls of these threads
+        start_ns: only syscalls with a unix timestamp in ns >= start_ns
+        end_ns: only syscalls with a unix timestamp in ns < end_ns
+    """
+
+    def __init__(self,
+                 direction: Direction = Direction.BOTH,
+                 names: Iterable[str] = None,
+                 excluded_names: Iterable[str] = None,
+                 process_names: Iterable[str] = None,
+                 thread_ids: Iterable[int] = None,
+                 start_ns: int = None,
+                 end_ns: int = None):
+        self.direction = direction
+        self.names = _frozen(names)
+        self.excluded_names = _frozen(excluded_names)
+        self.process_names = _frozen(process_names)
+        self.thread_ids = _frozen(thread_ids)
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        # the raw tokens are compared without converting them
+        self._direction_token = _DIRECTION_TOKENS.get(direction)
+        self._thread_tokens = _frozen(str(thread_id) for thread_id in thread_ids) if thread_ids is not None else None
+
+    def __repr__(self):
+        """
+        canonical representation of the conditions, equal filters have equal representations
+        """
+        def canonical(values):
+            return sorted(values) if values is not None else None
+        return (f'SyscallFilter(direction={self.direction.name}, names={canonical(self.names)}, '
+                f'excluded_names={canonical(self.excluded_names)}, process_names={canonical(self.process_names)}, '
+                f'thread_ids={canonical(self.thread_ids)}, start_ns={self.start_ns}, end_ns={self.end_ns})')
+
+    def with_direction(self, direction: Direction):
+        """
+        copy of this filter that also requires the given direction
+
+        Raises:
+            ValueError: if the filter requires the other direction already
+        """
+        if direction == Direction.BOTH or direction == self.direction:
+            return self
+        if self.direction != Direction.BOTH:
+            raise ValueError(f'syscall filter of direction {self.direction.name} can not be restricted to '
+                             f'{direction.name}')
+        return SyscallFilter(direction, self.names, self.excluded_names, self.process_names, self.thread_ids,
+                             self.start_ns, self.end_ns)
+
+    def excluding(self, names: Iterable[str]):
+        """
+        copy of this filter that also rejects the given syscall names
+        """
+        excluded_names = set(names) if self.excluded_names is None else self.excluded_names.union(names)
+        return SyscallFilter(self.direction, self.names, excluded_names, self.process_names, self.thread_ids,
+                             self.start_ns, self.end_ns)
+
+    def within(self, start_ns: int = None, end_ns: int = None):
+        """
+        copy of this filter that also requires start_ns <= timestamp < end_ns
+        """
+        if start_ns is None and end_ns is None:
+            return self
+        if self.start_ns is not None:
+            start_ns = self.start_ns if start_ns is None else max(start_ns, self.start_ns)
+        if self.end_ns is not None:
+            end_ns = self.end_ns if end_ns is None else min(end_ns, self.end_ns)
+        return SyscallFilter(self.direction, self.names, self.excluded_names, self.process_names, self.thread_ids,
+                             start_ns, end_ns)
+
+    def has_time_range(self) -> bool:
+        return self.start_ns is not None or self.end_ns is not None
+
+    def only_direction(self) -> bool:
+        """
+        True if the filter checks nothing but the direction
+        """
+        return (self.names is None and self.excluded_names is None and self.process_names is None
+                and self.thread_ids is None and not self.has_time_range())
+
+    def _accepts_tokens(self, direction: str, name: str, process_name: str, thread_id: str) -> bool:
+        if self._direction_token is not None and direction != self._direction_token:
+            return False
+        if self.names is not None and name not in self.names:
+            return False
+        if self.excluded_names is not None and name in self.excluded_names:
+            return False
+        if self.process_names is not None and process_name not in self.process_names:
+            return False
+        if self._thread_tokens is not None and thread_id not in self._thread_tokens:
+            return False
+        return True
+
+    def _accepts_time(self, timestamp: int) -> bool:
+        if self.start_ns is not None and timestamp < self.start_ns:
+            return False
+        if self.end_ns is not None and timestamp >= self.end_ns:
+            return False
+        return True
+
+    def accepts_2021(self, parts: list) -> bool:
+        """
+        checks the split LID-DS 2021 line: timestamp user_id process_id process_name thread_id name direction ...
+        the timestamp is only converted if a time range is set
+        """
+        if not self._accepts_tokens(parts[6], parts[5], parts[3], parts[4]):
+            return False
+        return not self.has_time_range() or self._accepts_time(int(parts[0]))
+
+    def accepts_2019(self, parts: list) -> bool:
+        """
+        checks the split LID-DS 2019 line: event_number time cpu user_id process_name thread_id direction name ...
+        the time range is not checked, the timestamps of LID-DS 2019 are only a time of day (see accepts_time)
+        """
+        return self._accepts_tokens(parts[6], parts[7], parts[4], parts[5])
+
+    def accepts_time(self, syscall: Syscall) -> bool:
+        """
+        checks only the time range of the syscall object
+        """
+        return not self.has_time_range() or self._accepts_time(syscall.timestamp_unix_in_ns())
+
+    def accepts(self, syscall: Syscall) -> bool:
+        """
+        checks an already built syscall object, e.g. read from the recording cache
+        """
+        if self.direction != Direction.BOTH and syscall.direction() != self.direction:
+            return False
+        name = syscall.name()
+        if self.names is not None and name not in self.names:
+            return False
+        if self.excluded_names is not None and name in self.excluded_names:
+            return False
+        if self.process_names is not None and syscall.process_name() not in self.process_names:
+            return False
+        if self.thread_ids is not None and syscall.thread_id() not in self.thread_ids:
+            return False
+        return self.accepts_time(syscall)
+
+
+def filter_from_kwargs(kwargs: dict) -> SyscallFilter:
+    """
+    removes syscall_filter and the FILTER_KWARGS from kwargs and combines them into one filter
+
+    Returns:
+        SyscallFilter: the filter or None if no filter was given
+    """
+    syscall_filter = kwargs.pop('syscall_filter', None)
+    conditions = {key: kwargs.pop(key) for key in FILTER_KWARGS if key in kwargs}
+    if len(conditions) > 0:
+        if syscall_filter is not None:
+            raise ValueError('either syscall_filter or its conditions can be given, not both')
+        syscall_filter = SyscallFilter(**conditions)
+    return syscall_filter
@@ -0,0 +1,54 @@
+from algorithms.features.impl.syscall_name import SyscallName
+from dataloader.compact_syscall import CompactSyscall2021, compact_syscalls
+from dataloader.syscall_2021 import Syscall2021
+
+SYSCALLS = [
+    "1631209047761484608 0 3686302 apache2 3686302 open < fd=9(<f>/proc/sys/kernel/ngroups_max) name=/proc/sys/kernel/ngroups_max flags=1(O_RDONLY) mode=0 dev=200024",
+    "1631209047762064269 0 3686303 apache2 3686303 open > name=/etc/group flags=4097(O_RDONLY|O_CLOEXEC) mode=0",
+    "1631209047762210355 33 3686302 apache2 3686302 getuid < uid=33(www-data)",
+    "1631209047762210356 33 3686302 apache2 3686304 poll >",
+    "1631209047762210357 33 3686302 mysqld 3686304 write > fd=3 data=aGVsbG8=",
+]
+
+
+def syscall_values(syscall):
+    return (syscall.line_id,
+            syscall.timestamp_unix_in_ns(),
+            syscall.timestamp_datetime(),
+            syscall.user_id(),
+            syscall.process_id(),
+            syscall.process_name(),
+            syscall.thread_id(),
+            syscall.name(),
+            syscall.direction(),
+            syscall.params_string(),
+            syscall.params(),
+            syscall.param('fd'),
+            syscall.param('missing'))
+
+
+def test_compact_syscall():
+    for line_id, line in enumerate(SYSCALLS, start=1):
+        compact = CompactSyscall2021('path', line, line_id)
+        assert syscall_values(compact) == syscall_values(Syscall2021('path', line, line_id))
+        assert not hasattr(compact, '__dict__')
+        assert syscall_values(compact.copy()) == syscall_values(compact)
+
+    assert CompactSyscall2021('path', SYSCALLS[4]).param('data', b64decode=True) == b'hello'
+    # interned names
+    first, second = list(compact_syscalls('path', SYSCALLS[:2]))
+    assert first.name() is second.name()
+    assert first.process_name() is second.process_name()
+
+
+def test_flyweight():
+    syscalls = list(compact_syscalls('path', SYSCALLS, flyweight=True))
+    assert all(syscall is syscalls[0] for syscall in syscalls)
+
+    # building blocks recalculate on the refilled syscall
+    syscall_name = SyscallName()
+    names = [syscall_name.get_result(syscall) for syscall in compact_syscalls('path', SYSCALLS, flyweight=True)]
+    assert names == ['open', 'open', 'getuid', 'poll', 'write']
+    values = [syscall_values(syscall) for syscall in compact_syscalls('path', SYSCALLS, flyweight=True)]
+    assert values == [syscall_values(Syscall2021('path', line, line_id))
+                      for line_id, line in enumerate(SYSCALLS, start=1)]
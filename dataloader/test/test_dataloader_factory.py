@@ -24,6 +24,9 @@ def test_dataloader_factory():
 
     dataloader_object_real_world = dataloader_factory(path_real_world)
     assert isinstance(dataloader_object_real_world, DataLoaderRealWorld)
+    # the real world data loader can not filter the syscalls
+    with pytest.raises(ValueError, match='syscall filters'):
+        dataloader_factory(path_real_world, names=['open'])
 
     with pytest.raises(ValueError):
         invalid_dataloader = dataloader_factory(invalid_path)
@@ -0,0 +1,33 @@
+from dataloader.param_extractor import ParamExtractor, scan_param
+from dataloader.syscall_2021 import Syscall2021
+
+PARAMS = [
+    "fd=9(<f>/proc/sys/kernel/ngroups_max) name=/proc/sys/kernel/ngroups_max flags=1(O_RDONLY) mode=0",
+    "in_fd=3(<f>/var/www/index.html) out_fd=5(<4t>172.17.0.1:45440->172.17.0.5:8080) offset=0 size=4096",
+    "res=0 data=aGVsbG8= fd=3 fd=4",
+    "res=-11(EAGAIN) data=a=b=c size",
+    "fd=",
+    "",
+]
+NAMES = ['fd', 'in_fd', 'out_fd', 'res', 'data', 'size', 'flags', 'mode', 'name', 'missing']
+
+
+def test_scan_param():
+    for params_string in PARAMS:
+        line = f"1631209047761484608 0 3686302 apache2 3686302 read < {params_string}".rstrip()
+        expected = Syscall2021('path', line).params()
+        for name in NAMES:
+            assert scan_param(params_string, name) == expected.get(name)
+        # param() of a syscall without parsed params scans the line
+        assert [Syscall2021('path', line).param(name) for name in NAMES] == [expected.get(name) for name in NAMES]
+
+
+def test_param_extractor():
+    extractor = ParamExtractor(['fd', 'in_fd', 'out_fd'])
+    for params_string in PARAMS:
+        line = f"1631209047761484608 0 3686302 apache2 3686302 read < {params_string}".rstrip()
+        expected = {name: value for name, value in Syscall2021('path', line).params().items()
+                    if name in extractor.param_names}
+        assert extractor.extract(params_string) == expected
+    assert extractor.extract(PARAMS[1]) == {'in_fd': '3(<f>/var/www/index.html)',
+                                            'out_fd': '5(<4t>172.17.0.1:45440->172.17.0.5:8080)'}
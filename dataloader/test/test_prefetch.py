@@ -0,0 +1,58 @@
+import time
+
+from dataloader.direction import Direction
+from dataloader.prefetch import PrefetchedRecording, prefetch, raw_size
+from dataloader.recording_2021 import Recording2021
+from dataloader.test.test_recording_cache import create_recording, syscall_values
+
+
+class SlowRecording(Recording2021):
+    """
+    recording whose parsing takes some time, records how many recordings are loaded at once
+    """
+    loading = 0
+    max_loading = 0
+
+    def syscalls(self):
+        SlowRecording.loading += 1
+        SlowRecording.max_loading = max(SlowRecording.max_loading, SlowRecording.loading)
+        time.sleep(0.01)
+        yield from super().syscalls()
+        SlowRecording.loading -= 1
+
+
+def test_prefetch(tmp_path):
+    paths = [create_recording(str(tmp_path), f'recording_{i}') for i in range(6)]
+    recordings = [Recording2021(path, f'recording_{i}', Direction.BOTH) for i, path in enumerate(paths)]
+    expected = [[syscall_values(syscall) for syscall in recording.syscalls()] for recording in recordings]
+    assert raw_size(recordings[0]) > 0
+
+    # same recordings in the same order
+    for depth, workers, processes in [(0, 1, False), (2, 1, False), (3, 2, False), (2, 2, True)]:
+        prefetched = list(prefetch(recordings, depth=depth, workers=workers, processes=processes))
+        assert [recording.name for recording in prefetched] == [f'recording_{i}' for i in range(6)]
+        assert [[syscall_values(syscall) for syscall in recording.syscalls()] for recording in prefetched] == expected
+        if depth > 0:
+            assert all(isinstance(recording, PrefetchedRecording) for recording in prefetched)
+            assert prefetched[0].metadata() == {'exploit': False, 'container': []}
+            assert prefetched[0].path == paths[0]
+            # same time range reads as the wrapped recording
+            for start_ns, end_ns in [(1631209047762064269, None), (None, 1631209047762210356),
+                                     (1631209047762064269, 1631209047762210357)]:
+                assert [syscall_values(syscall) for syscall in prefetched[0].syscalls(start_ns, end_ns)] == \
+                       [syscall_values(syscall) for syscall in recordings[0].syscalls(start_ns, end_ns)]
+
+    # the syscalls of a flyweight recording are copied
+    flyweight = [Recording2021(path, f'recording_{i}', Direction.BOTH, flyweight=True) for i, path in enumerate(paths)]
+    prefetched = list(prefetch(flyweight, depth=2))
+    assert [[syscall_values(syscall) for syscall in recording.syscalls()] for recording in prefetched] == expected
+
+    # the memory ceiling allows only one recording ahead
+    slow = [SlowRecording(path, f'recording_{i}', Direction.BOTH) for i, path in enumerate(paths)]
+    for recording in prefetch(slow, depth=4, max_bytes=raw_size(slow[0]), workers=4):
+        assert len(list(recording.syscalls())) == 5
+    assert SlowRecording.max_loading == 1
+    SlowRecording.max_loading = 0
+    for recording in prefetch(slow, depth=4, workers=4):
+        time.sleep(0.05)
+    assert SlowRecording.max_loading > 1
@@ -0,0 +1,102 @@
+import os
+import json
+import zipfile
+
+import numpy as np
+
+from shutil import rmtree
+
+from dataloader.direction import Direction
+from dataloader.recording_2019 import Recording2019
+from dataloader.recording_2021 import Recording2021
+from dataloader.recording_cache import RecordingCache
+
+SYSCALLS = [
+    "1631209047761484608 0 3686302 apache2 3686302 open < fd=9(<f>/proc/sys/kernel/ngroups_max) name=/proc/sys/kernel/ngroups_max flags=1(O_RDONLY) mode=0 dev=200024",
+    "1631209047762064269 0 3686303 apache2 3686303 open > name=/etc/group flags=4097(O_RDONLY|O_CLOEXEC) mode=0",
+    "1631209047762210355 33 3686302 apache2 3686302 getuid < uid=33(www-data)",
+    "1631209047762210356 33 3686302 apache2 3686304 poll >",
+    "1631209047762210357 33 3686302 mysqld 3686304 poll < res=1 fds=9:p1",
+]
+
+
+def create_recording(path: str, name: str):
+    os.makedirs(path, exist_ok=True)
+    zip_path = os.path.join(path, name + '.zip')
+    with zipfile.ZipFile(zip_path, 'w') as zipped:
+        zipped.writestr(name + '.sc', '\n'.join(SYSCALLS) + '\n')
+        zipped.writestr(name + '.json', json.dumps({'exploit': False, 'container': []}))
+        zipped.writestr(name + '.res', 'timestamp\n')
+        zipped.writestr(name + '.pcap', '')
+    return zip_path
+
+
+def syscall_values(syscall):
+    return (syscall.line_id,
+            syscall.timestamp_unix_in_ns(),
+            syscall.user_id(),
+            syscall.process_id(),
+            syscall.process_name(),
+            syscall.thread_id(),
+            syscall.name(),
+            syscall.direction(),
+            syscall.params())
+
+
+def test_recording_cache():
+    base_path = '/tmp/lidds_cache_test'
+    cache_path = os.path.join(base_path, 'cache')
+    zip_path = create_recording(os.path.join(base_path, 'training'), 'dummy_recording')
+
+    for direction in [Direction.BOTH, Direction.OPEN, Direction.CLOSE]:
+        plain = Recording2021(zip_path, 'dummy_recording', direction)
+        cached = Recording2021(zip_path, 'dummy_recording', direction, cache_path=cache_path)
+        expected = [syscall_values(syscall) for syscall in plain.syscalls()]
+        # first pass builds the cache, second pass reads it
+        assert [syscall_values(syscall) for syscall in cached.syscalls()] == expected
+        assert RecordingCache(cache_path, zip_path).is_valid()
+        assert [syscall_values(syscall) for syscall in cached.syscalls()] == expected
+        # batch columns are read directly from the cache
+        columns = cached.columns()
+        plain_columns = plain.columns()
+        assert columns.names.tolist() == plain_columns.names.tolist()
+        assert columns.thread_ids.tolist() == plain_columns.thread_ids.tolist()
+        assert columns.timestamps.tolist() == plain_columns.timestamps.tolist()
+        assert [syscall_values(syscall) for syscall in columns.syscalls()] == expected
+
+    assert Recording2021(zip_path, 'dummy_recording', Direction.BOTH, cache_path=cache_path) \
+        ._cache.meta()['count'] == len(SYSCALLS)
+
+    # incomplete iteration does not create a cache
+    rmtree(cache_path)
+    cached = Recording2021(zip_path, 'dummy_recording', Direction.BOTH, cache_path=cache_path)
+    next(cached.syscalls())
+    assert not RecordingCache(cache_path, zip_path).is_valid()
+
+    # changing the recording invalidates the cache
+    list(cached.syscalls())
+    assert RecordingCache(cache_path, zip_path).is_valid()
+    with zipfile.ZipFile(zip_path, 'a') as zipped:
+        zipped.writestr('additional_file', 'changed')
+    assert not RecordingCache(cache_path, zip_path).is_valid()
+
+    rmtree(base_path)
+
+
+def test_recording_cache_2019(tmp_path, capsys):
+    lines = [f"{i} 10:19:40.8235{i:02d}081 6 101 nginx 23804 {'<>'[i % 2]} epoll_wait res=1" for i in range(1, 7)]
+    with open(tmp_path / 'recording.txt', 'w') as recording_file:
+        recording_file.write('\n'.join(lines) + '\n')
+    runs_line = ['image', 'recording', 'False', '10', '40', '-1']
+    plain = Recording2019(runs_line, str(tmp_path), Direction.BOTH)
+    cached = Recording2019(runs_line, str(tmp_path), Direction.BOTH, str(tmp_path / 'cache'))
+    expected = [(syscall.line_id, syscall.timestamp_unix_in_ns(), syscall.name()) for syscall in plain.syscalls()]
+    capsys.readouterr()
+
+    # building the cache does not ask the syscalls for their (missing) process id
+    for _ in range(2):
+        assert [(syscall.line_id, syscall.timestamp_unix_in_ns(), syscall.name())
+                for syscall in cached.syscalls()] == expected
+    assert 'process ID' not in capsys.readouterr().out
+    assert cached._cache.column('timestamp').dtype == np.int64
+    assert all(syscall.process_id() is None for syscall in cached.syscalls())
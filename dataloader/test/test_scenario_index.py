@@ -0,0 +1,100 @@
+import os
+import json
+import zipfile
+
+from dataloader.data_loader_2021 import DataLoader2021, RecordingType
+from dataloader.direction import Direction
+from dataloader.scenario_index import ScenarioIndex, INDEX_FILE
+
+LINES = [
+    "1631209047761484608 0 3686302 apache2 3686302 open < fd=9(<f>/proc/sys/kernel/ngroups_max) flags=1(O_RDONLY)",
+    "1631209047762064269 0 3686303 apache2 3686303 open > name=/etc/group flags=4097(O_RDONLY|O_CLOEXEC) mode=0",
+    "1631209047762210355 33 3686302 apache2 3686302 getuid < uid=33(www-data)",
+]
+
+
+def create_recording(path: str, name: str, exploit: bool, num_lines: int = 3):
+    os.makedirs(path, exist_ok=True)
+    metadata = {
+        'exploit': exploit,
+        'container': [{'ip': '', 'name': 'victim', 'role': 'normal'}],
+        'recording_time': 1,
+        'time': {
+            'exploit': [{'absolute': 1631209047.762, 'name': 'exploit', 'source': 'T'}] if exploit else [],
+            'warmup_end': {'absolute': 1631209047.7, 'source': 'T'},
+        },
+    }
+    with zipfile.ZipFile(os.path.join(path, name + '.zip'), 'w') as zipped:
+        zipped.writestr(name + '.sc', '\n'.join(LINES[:num_lines]) + '\n')
+        zipped.writestr(name + '.json', json.dumps(metadata))
+        zipped.writestr(name + '.res', 'timestamp\n')
+        zipped.writestr(name + '.pcap', '')
+
+
+def test_scenario_index(tmp_path):
+    scenario_path = str(tmp_path)
+    create_recording(os.path.join(scenario_path, 'training'), 'train_1', False)
+    create_recording(os.path.join(scenario_path, 'validation'), 'val_1', False)
+    create_recording(os.path.join(scenario_path, 'test', 'normal'), 'test_1', False)
+    create_recording(os.path.join(scenario_path, 'test', 'normal_and_attack'), 'test_2', True)
+
+    index = ScenarioIndex(scenario_path)
+    assert index.refreshed == 4
+    assert os.path.isfile(os.path.join(scenario_path, 'training', INDEX_FILE))
+    entry = index.entries[os.path.join('test', 'normal_and_attack', 'test_2.zip')]
+    assert entry['category'] == 'test'
+    assert entry['recording_type'] == 'NORMAL_AND_ATTACK'
+    assert entry['exploit_times'] == [1631209047.762]
+    assert entry['warmup_end'] == 1631209047.7
+    assert index.count_syscalls() == 12
+
+    # loaded from the sidecar file, only the changed and new zips are scanned again
+    create_recording(os.path.join(scenario_path, 'training'), 'train_1', False, num_lines=2)
+    create_recording(os.path.join(scenario_path, 'training'), 'train_2', False)
+    os.remove(os.path.join(scenario_path, 'validation', 'val_1.zip'))
+    index = ScenarioIndex(scenario_path)
+    assert index.refreshed == 2
+    assert len(index.entries) == 4
+    assert index.entries[os.path.join('test', 'normal', 'test_1.zip')]['syscall_count'] == 3
+    assert index.entries[os.path.join('training', 'train_1.zip')]['syscall_count'] is None
+
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH)
+    assert data_loader.index.refreshed == 0
+    assert [recording.name for recording in data_loader.training_data()] == ['train_1', 'train_2']
+    assert len(data_loader.validation_data()) == 0
+    attacks = data_loader.test_data(RecordingType.NORMAL_AND_ATTACK)
+    assert [recording.name for recording in attacks] == ['test_2']
+    assert attacks[0].metadata()['time']['exploit'][0]['absolute'] == 1631209047.762
+    assert len(list(attacks[0].syscalls())) == 3
+
+    # same result without the index
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH, metadata_index=False)
+    attacks = data_loader.test_data(RecordingType.NORMAL_AND_ATTACK)
+    assert attacks[0].metadata()['exploit']
+
+
+def test_scenario_index_validation(tmp_path, monkeypatch):
+    scenario_path = str(tmp_path / 'scenario')
+    training_path = os.path.join(scenario_path, 'training')
+    for i in range(20):
+        create_recording(training_path, f'train_{i:02d}', False)
+    with zipfile.ZipFile(os.path.join(training_path, 'incomplete.zip'), 'w') as zipped:
+        zipped.writestr('incomplete.sc', LINES[0] + '\n')
+        zipped.writestr('incomplete.json', json.dumps({'exploit': False, 'container': []}))
+    with open(os.path.join(training_path, 'broken.zip'), 'w') as broken:
+        broken.write('no zip')
+
+    monkeypatch.chdir(tmp_path)
+    index = ScenarioIndex(scenario_path, persistent=False, workers=4)
+    assert index.refreshed == 21
+    assert not os.path.isfile(os.path.join(training_path, INDEX_FILE))
+    assert index.entries[os.path.join('training', 'incomplete.zip')]['missing_members'] == ['incomplete.res',
+                                                                                           'incomplete.pcap']
+    with open(tmp_path / 'missing_files.txt') as report:
+        lines = report.readlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('Bad zipfile in recording')
+    assert lines[1].startswith('Recording Error: Missing .res file Missing .pcap file')
+
+    data_loader = DataLoader2021(scenario_path, Direction.BOTH, metadata_index=False)
+    assert len(data_loader.training_data()) == 21
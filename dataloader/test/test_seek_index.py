@@ -0,0 +1,61 @@
+import os
+import json
+import zipfile
+
+from dataloader.direction import Direction
+from dataloader.recording_2021 import Recording2021
+from dataloader.recording_cache import RecordingCache
+from dataloader.seek_index import SeekIndex, SEEK_INDEX_SUFFIX
+from dataloader.syscall_filter import SyscallFilter
+from dataloader.test.test_recording_cache import syscall_values
+
+START = 1631209047000000000
+# the timestamps are not sorted, line 7 is earlier than lines 5 and 6
+TIMESTAMPS = [START + i * 1000 for i in range(20)]
+TIMESTAMPS[6] = START + 3500
+
+
+def create_recording(path: str, name: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    lines = [f"{timestamp} 33 1000 apache2 {1000 + i % 3} {['read', 'write'][i % 2]} {'<>'[i % 2]} fd=3"
+             for i, timestamp in enumerate(TIMESTAMPS)]
+    zip_path = os.path.join(path, name + '.zip')
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr(name + '.sc', '\n'.join(lines) + '\n')
+        zipped.writestr(name + '.json', json.dumps({'exploit': False, 'container': []}))
+        zipped.writestr(name + '.res', 'timestamp\n')
+        zipped.writestr(name + '.pcap', '')
+    return zip_path
+
+
+def test_seek_index(tmp_path):
+    zip_path = create_recording(str(tmp_path), 'recording')
+    index = SeekIndex.build(zip_path, 'recording.sc', block_lines=4)
+    assert len(index.offsets) == 5
+    assert index.minimums.tolist()[1] == START + 3500
+    # the earlier line 7 in the second block is found, the blocks before are skipped
+    offset, first_line_id, num_lines = index.lines_between(START + 3200, START + 3600)
+    assert offset == index.offsets[1] and first_line_id == 5 and num_lines == 4
+    offset, first_line_id, num_lines = index.lines_between(START + 9000, None)
+    assert offset == index.offsets[2] and first_line_id == 9 and num_lines is None
+    assert index.lines_between(START + 10 ** 9, None)[2] == 0
+
+    for cache_path in [None, str(tmp_path / 'cache')]:
+        recording = Recording2021(zip_path, 'recording', Direction.BOTH, cache_path=cache_path)
+        recording._seek_index = SeekIndex.build(zip_path, 'recording.sc', block_lines=4)
+        everything = [syscall_values(syscall) for syscall in recording.syscalls()]
+        for start_ns, end_ns in [(START + 3200, START + 3600), (START + 9000, None), (None, START + 2000),
+                                 (START + 10 ** 9, None)]:
+            expected = [values for values in everything
+                        if (start_ns is None or values[1] >= start_ns) and (end_ns is None or values[1] < end_ns)]
+            assert [syscall_values(syscall) for syscall in recording.syscalls(start_ns, end_ns)] == expected
+            # combined with the time range of the filter
+            filtered = Recording2021(zip_path, 'recording', Direction.OPEN, cache_path=cache_path,
+                                     syscall_filter=SyscallFilter(start_ns=START + 3000))
+            assert [syscall.line_id for syscall in filtered.syscalls(None, START + 8000)] == [4, 6, 8]
+    # a time range of a recording without built cache is read with the seek index, which is stored next to the cache
+    recording = Recording2021(zip_path, 'recording', Direction.BOTH, cache_path=str(tmp_path / 'new_cache'))
+    assert [syscall.line_id for syscall in recording.syscalls(START + 19000)] == [20]
+    cache = RecordingCache(str(tmp_path / 'new_cache'), zip_path)
+    assert not cache.is_valid()
+    assert os.path.isfile(cache.directory + SEEK_INDEX_SUFFIX)
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from dataloader.direction import Direction
+from dataloader.recording_2019 import Recording2019
+from dataloader.recording_2021 import Recording2021
+from dataloader.dataloader_factory import dataloader_factory
+from dataloader.syscall_filter import SyscallFilter
+from dataloader.test.test_recording_cache import create_recording, syscall_values
+from dataloader.test.test_scenario_index import create_recording as create_indexed_recording
+
+LINES_2019 = [
+    "1 10:19:40.823572081 6 101 nginx 23804 > epoll_wait maxevents=512",
+    "2 10:19:40.823580000 6 101 nginx 23804 < epoll_wait res=1",
+    "3 10:19:40.823590000 6 101 nginx 23804 > switch next=0 pgft_maj=0",
+    "4 10:19:40.823600000 6 101 mysqld 23805 > read fd=3",
+    "5 10:19:40.823610000 6 101 nginx 23806 < accept fd=4",
+]
+
+
+def test_syscall_filter_2021(tmp_path):
+    zip_path = create_recording(str(tmp_path / 'training'), 'recording')
+    syscall_filter = SyscallFilter(names={'open', 'poll'}, process_names={'apache2'})
+
+    plain = Recording2021(zip_path, 'recording', Direction.BOTH)
+    expected = [syscall_values(syscall) for syscall in plain.syscalls() if syscall_filter.accepts(syscall)]
+    # the line ids stay the line numbers of the recording
+    assert [values[0] for values in expected] == [1, 2, 4]
+
+    for kwargs in [{}, {'flyweight': True}, {'cache_path': str(tmp_path / 'cache')}]:
+        recording = Recording2021(zip_path, 'recording', Direction.BOTH, syscall_filter=syscall_filter, **kwargs)
+        for _ in range(2):
+            assert [syscall_values(syscall) for syscall in recording.syscalls()] == expected
+        assert recording.columns().names.tolist() == ['open', 'open', 'poll']
+
+    # combined with the direction of the recording, thread ids and a time range
+    recording = Recording2021(zip_path, 'recording', Direction.OPEN,
+                              syscall_filter=SyscallFilter(thread_ids=[3686304], end_ns=1631209047762210357))
+    assert [syscall.line_id for syscall in recording.syscalls()] == [4]
+    with pytest.raises(ValueError):
+        Recording2021(zip_path, 'recording', Direction.OPEN, syscall_filter=SyscallFilter(Direction.CLOSE))
+
+
+def test_syscall_filter_2019(tmp_path):
+    with open(tmp_path / 'recording.txt', 'w') as recording_file:
+        recording_file.write('\n'.join(LINES_2019) + '\n')
+    runs_line = ['image', 'recording', 'False', '10', '40', '-1']
+
+    recording = Recording2019(runs_line, str(tmp_path), Direction.BOTH)
+    assert [syscall.line_id for syscall in recording.syscalls()] == [1, 2, 4, 5]
+
+    for cache_path in [None, str(tmp_path / 'cache')]:
+        recording = Recording2019(runs_line, str(tmp_path), Direction.OPEN, cache_path,
+                                  SyscallFilter(excluded_names={'read'}, process_names={'nginx'}))
+        for _ in range(2):
+            assert [syscall.line_id for syscall in recording.syscalls()] == [1]
+
+
+def test_syscall_filter_factory(tmp_path):
+    scenario_path = str(tmp_path)
+    for category in [os.path.join('test', 'normal'), 'training', 'validation']:
+        create_indexed_recording(os.path.join(scenario_path, category), category.replace(os.sep, '_'), False)
+
+    data_loader = dataloader_factory(scenario_path, Direction.BOTH, names=['getuid', 'open'], thread_ids=[3686302])
+    recording = data_loader.training_data()[0]
+    assert [(syscall.line_id, syscall.name()) for syscall in recording.syscalls()] == [(1, 'open'), (3, 'getuid')]